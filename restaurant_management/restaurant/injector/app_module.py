@@ -3,12 +3,19 @@ from restaurant.repository.ingredient_repository import IngredientRepository
 from restaurant.services.ingredient_service import IngredientService
 from restaurant.repository.stock_repository import StockRepository
 from restaurant.services.stock_service import StockService 
+from restaurant.services.forecast_service import ForecastService
+from restaurant.repository.inventory_count_repository import InventoryCountRepository
+from restaurant.services.inventory_count_service import InventoryCountService
 from restaurant.repository.table_respository import TableRepository
-from restaurant.services.table_service import TableService 
+from restaurant.services.table_service import TableService
+from restaurant.services.table_analytics_service import TableAnalyticsService
 from restaurant.repository.menu_item_repository import MenuItemRepository
+from restaurant.repository.menu_extra_repository import MenuExtraRepository
 from restaurant.services.menu_service import MenuItemService 
 from restaurant.repository.reservation_repository import ReservationRepository
 from restaurant.services.reservation_service import ReservationService 
+from restaurant.repository.waitlist_repository import WaitlistRepository
+from restaurant.services.waitlist_service import WaitlistService
 from restaurant.repository.order_repository import OrderRepository
 from restaurant.services.order_service import OrderService 
 from restaurant.repository.payment_repository import PaymentRepository
@@ -23,19 +30,30 @@ class AppModule(Module):
         #Stock
         binder.bind(StockRepository, to=StockRepository, scope=singleton)
         binder.bind(StockService, to=StockService, scope=singleton)
+        binder.bind(ForecastService, to=ForecastService, scope=singleton)
+
+        #Inventory Count
+        binder.bind(InventoryCountRepository, to=InventoryCountRepository, scope=singleton)
+        binder.bind(InventoryCountService, to=InventoryCountService, scope=singleton)
 
         #Table
         binder.bind(TableRepository, to=TableRepository, scope=singleton)
         binder.bind(TableService, to=TableService, scope=singleton)
+        binder.bind(TableAnalyticsService, to=TableAnalyticsService, scope=singleton)
 
         #Menu Item
         binder.bind(MenuItemRepository, to=MenuItemRepository, scope=singleton)
+        binder.bind(MenuExtraRepository, to=MenuExtraRepository, scope=singleton)
         binder.bind(MenuItemService, to=MenuItemService, scope=singleton)
 
         # Reservation
         binder.bind(ReservationRepository, to=ReservationRepository, scope=singleton)
         binder.bind(ReservationService, to=ReservationService, scope=singleton)
 
+        # Waitlist
+        binder.bind(WaitlistRepository, to=WaitlistRepository, scope=singleton)
+        binder.bind(WaitlistService, to=WaitlistService, scope=singleton)
+
         # Order
         binder.bind(OrderRepository, to=OrderRepository, scope=singleton)
         binder.bind(OrderService, to=OrderService, scope=singleton)
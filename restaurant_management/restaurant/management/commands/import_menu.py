@@ -0,0 +1,40 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from restaurant.services.menu_service import MenuItemService
+from restaurant.serializers import MenuBulkUpsertSerializer
+from restaurant.mappers.menu_item_mappers import MenuItemMapper
+from restaurant.injector.app_module import AppModule
+from injector import Injector
+
+container = Injector([AppModule()])
+
+class Command(BaseCommand):
+    help = "Create or update menu items from a JSON file (a list of items, matched by id or name) with a single catalog version bump."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSON file with a list of {id?, name, price, category, description} items.")
+        parser.add_argument('--dry-run', action='store_true', help="Report the changes without writing them.")
+
+    def handle(self, *args, **options):
+        menu_service = container.get(MenuItemService)
+
+        try:
+            with open(options['path']) as menu_file:
+                items = json.load(menu_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        serializer = MenuBulkUpsertSerializer(data={'items': items})
+        if not serializer.is_valid():
+            raise CommandError(f"Validation failed: {serializer.errors}")
+
+        menu_items = [MenuItemMapper.map_serializer_to_domain(item_data) for item_data in serializer.validated_data['items']]
+        upsert_result = menu_service.upsert_menus(menu_items, dry_run=options['dry_run'])
+        if upsert_result.is_failure():
+            raise CommandError('\n'.join(upsert_result.get_error_msg()))
+
+        changes = upsert_result.get_data()
+        if options['dry_run']:
+            self.stdout.write(f"Dry run: {changes}")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Menu imported: {changes}"))
@@ -0,0 +1,25 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from restaurant.services.reservation_service import ReservationService
+from restaurant.injector.app_module import AppModule
+from injector import Injector
+
+container = Injector([AppModule()])
+
+class Command(BaseCommand):
+    help = "Repack future booked reservations over the tables, day by day, to free larger tables for larger parties."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help="Number of days to repack, starting today.")
+
+    def handle(self, *args, **options):
+        reservation_service = container.get(ReservationService)
+
+        today = timezone.localdate()
+        for offset in range(options['days']):
+            day = today + timedelta(days=offset)
+            moved = reservation_service.reoptimize_day(day)
+            self.stdout.write(f"{day}: {moved} reservations moved")
+
+        self.stdout.write(self.style.SUCCESS("Reservations repacked"))
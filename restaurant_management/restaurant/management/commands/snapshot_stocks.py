@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from restaurant.services.stock_service import StockService
+from restaurant.injector.app_module import AppModule
+from injector import Injector
+
+container = Injector([AppModule()])
+
+class Command(BaseCommand):
+    help = "Record the current on-hand quantity of every stock. Schedule it daily at close."
+
+    def handle(self, *args, **options):
+        stock_service = container.get(StockService)
+
+        snapshot_count = stock_service.take_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Snapshot taken for {snapshot_count} stocks"))
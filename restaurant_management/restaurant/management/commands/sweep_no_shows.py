@@ -0,0 +1,25 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from restaurant.services.domain.reservation import Reservation
+from restaurant.services.reservation_service import ReservationService
+from restaurant.injector.app_module import AppModule
+from injector import Injector
+
+container = Injector([AppModule()])
+
+class Command(BaseCommand):
+    help = "Mark booked reservations past their grace period as not attended. Schedule it every few minutes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes',
+            type=int,
+            default=int(Reservation.NO_SHOW_GRACE.total_seconds() // 60),
+            help="Minutes after the reservation time before a guest counts as a no-show."
+        )
+
+    def handle(self, *args, **options):
+        reservation_service = container.get(ReservationService)
+
+        updated = reservation_service.sweep_no_shows(timedelta(minutes=options['grace_minutes']))
+        self.stdout.write(self.style.SUCCESS(f"{updated} reservations marked as not attended"))
@@ -0,0 +1,53 @@
+from restaurant.services.domain.inventory_count import InventoryCount, InventoryCountLine
+from restaurant.repository.models.models import InventoryCountModel, InventoryCountLineModel
+
+
+class InventoryCountMappers:
+    @staticmethod
+    def modelToDomain(model: InventoryCountModel, lines=None) -> InventoryCount:
+        return InventoryCount(
+            id=model.id,
+            employee_name=model.employee_name,
+            status=model.status,
+            lines=lines,
+            created_at=model.created_at,
+            posted_at=model.posted_at
+        )
+
+
+    @staticmethod
+    def domainToModel(domain: InventoryCount) -> InventoryCountModel:
+        return InventoryCountModel(
+            id=domain.id,
+            employee_name=domain.employee_name,
+            status=domain.status,
+            created_at=domain.created_at,
+            posted_at=domain.posted_at
+        )
+
+
+class InventoryCountLineMappers:
+    @staticmethod
+    def modelToDomain(model: InventoryCountLineModel) -> InventoryCountLine:
+        return InventoryCountLine(
+            id=model.id,
+            stock_id=model.stock_id,
+            counted_quantity=model.counted_quantity,
+            expected_quantity=model.expected_quantity,
+            variance=model.variance,
+            optimal_stock_quantity=getattr(model, 'optimal_stock_quantity', None),
+            counted_at=model.counted_at
+        )
+
+
+    @staticmethod
+    def domainToModel(domain: InventoryCountLine, count_id: int) -> InventoryCountLineModel:
+        return InventoryCountLineModel(
+            id=domain.id,
+            count_id=count_id,
+            stock_id=domain.stock_id,
+            counted_quantity=domain.counted_quantity,
+            expected_quantity=domain.expected_quantity,
+            variance=domain.variance,
+            counted_at=domain.counted_at
+        )
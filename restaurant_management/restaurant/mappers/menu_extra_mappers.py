@@ -0,0 +1,38 @@
+from decimal import Decimal
+from typing import Iterable, Optional
+from restaurant.services.domain.menu_extra import MenuExtra
+from restaurant.repository.models.models import MenuExtra as MenuExtraModel
+
+class MenuExtraMapper:
+    @staticmethod
+    def to_domain(model: MenuExtraModel, menu_item_ids: Iterable[int] = ()) -> MenuExtra:
+        return MenuExtra(
+            id=model.id,
+            name=model.name,
+            price=Decimal(model.price),
+            menu_item_ids=menu_item_ids,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+        )
+
+    @staticmethod
+    def to_model(domain: MenuExtra, model: Optional[MenuExtraModel] = None) -> MenuExtraModel:
+        if model is None:
+            model = MenuExtraModel()
+
+        model.id = domain.id
+        model.name = domain.name
+        model.price = domain.price
+        model.created_at = domain.created_at
+        model.updated_at = domain.updated_at
+
+        return model
+
+    @staticmethod
+    def map_serializer_to_domain(serializer) -> MenuExtra:
+        return MenuExtra(
+            id=None,
+            name=serializer.get('name'),
+            price=serializer.get('price'),
+            menu_item_ids=serializer.get('menu_item_ids', []),
+        )
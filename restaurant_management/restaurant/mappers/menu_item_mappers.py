@@ -22,20 +22,20 @@ class MenuItemMapper:
         if model is None:
             model = MenuItemModel()
     
-            model.id = domain.id
-            model.name = domain.name
-            model.price = domain.price
-            model.description = domain.description
-            model.category = domain.category
-            model.created_at = domain.created_at
-            model.updated_at = domain.updated_at
+        model.id = domain.id
+        model.name = domain.name
+        model.price = domain.price
+        model.description = domain.description
+        model.category = domain.category
+        model.created_at = domain.created_at
+        model.updated_at = domain.updated_at
 
         return model
 
      @staticmethod
      def map_serializer_to_domain(serializer) -> MenuItem:
           return MenuItem(
-          id=None,
+          id=serializer.get('id'),
           name=serializer.get('name'),
           price=serializer.get('price'),
           category=CategoryEnum(serializer.get('category')).value,
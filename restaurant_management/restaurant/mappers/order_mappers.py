@@ -3,6 +3,7 @@ from restaurant.services.domain.order import Order, OrderItem
 from restaurant.serializers import OrderSerializer
 from restaurant.mappers.table_mappers import TableMappers
 from restaurant.mappers.menu_item_mappers import MenuItemMapper
+from restaurant.mappers.menu_extra_mappers import MenuExtraMapper
 
 class OrderMappers:
     @staticmethod
@@ -43,6 +44,9 @@ class OrderItemMappers:
         order_item_model = OrderItemModel(
             id=order_item.id,
             menu_item=MenuItemMapper.to_model(order_item.menu_item),  
+            menu_extra_id=order_item.menu_extra.id if order_item.menu_extra else None,
+            unit_price=order_item.unit_price,
+            extra_price=order_item.extra_price,
             is_delivered=order_item.is_delivered,
             notes=order_item.notes,
             quantity=order_item.quantity,
@@ -56,6 +60,9 @@ class OrderItemMappers:
         return OrderItem(
             id=order_item_model.id,
             menu_item=MenuItemMapper.to_domain(order_item_model.menu_item),
+            menu_extra=MenuExtraMapper.to_domain(order_item_model.menu_extra) if order_item_model.menu_extra_id else None,
+            unit_price=order_item_model.unit_price,
+            extra_price=order_item_model.extra_price,
             quantity=order_item_model.quantity,
             notes=order_item_model.notes,
             is_delivered=order_item_model.is_delivered,
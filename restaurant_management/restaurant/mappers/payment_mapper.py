@@ -2,6 +2,7 @@ from restaurant.services.domain.payment import Payment, PaymentItem
 from restaurant.repository.models.models import PaymentItemModel, PaymentModel
 from restaurant.mappers.order_mappers import OrderMappers, OrderItemMappers
 from restaurant.mappers.menu_item_mappers import MenuItemMapper
+from restaurant.mappers.menu_extra_mappers import MenuExtraMapper
 
 class PaymentMapper:
     @staticmethod
@@ -58,7 +59,7 @@ class PaymentItemMapper:
             quantity=payment_item_model.quantity,
             total=float(payment_item_model.total),
             #extra_item_price=float(payment_item_model.extra_item_price),
-            menu_extra_item=payment_item_model.menu_item_extra
+            menu_extra_item=MenuExtraMapper.to_domain(payment_item_model.menu_item_extra) if payment_item_model.menu_item_extra_id else None
         )
 
     @staticmethod
@@ -69,6 +70,6 @@ class PaymentItemMapper:
             price=payment_item.price,
             quantity=payment_item.quantity,
             total=payment_item.total,
-            menu_item_extra=payment_item.menu_extra_item
+            menu_item_extra_id=payment_item.menu_extra_item.id if payment_item.menu_extra_item else None
         )
         return payment_item_model
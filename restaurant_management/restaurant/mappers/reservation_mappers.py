@@ -12,7 +12,7 @@ class ReservationMapper:
             email=model.email,
             phone_number=model.phone_number,
             customer_number=model.customer_number,
-            table=Table(number=model.table.number, capacity=model.table.capacity), 
+            table=Table(id=model.table.id, number=model.table.number, capacity=model.table.capacity), 
             reservation_date=model.reservation_date,
             status=model.status,
             created_at=model.created_at,
@@ -31,6 +31,9 @@ class ReservationMapper:
         model.email = domain.email
         model.phone_number = domain.phone_number
         model.customer_number = domain.customer_number
+        model.name_normalized = Reservation.normalize_name(domain.name)
+        model.email_normalized = Reservation.normalize_email(domain.email)
+        model.phone_digits = Reservation.normalize_phone(domain.phone_number)
         model.created_at = domain.created_at or datetime.now()
         model.cancelled_at = domain.cancelled_at
 
@@ -1,5 +1,5 @@
-from restaurant.services.domain.stock import Stock, StockTransaction
-from restaurant.repository.models.models import StockModel, StockTransactionModel
+from restaurant.services.domain.stock import Stock, StockTransaction, StockLot, LowStockAlert
+from restaurant.repository.models.models import StockModel, StockTransactionModel, StockLotModel, LowStockAlertModel
 from restaurant.mappers.ingredient_mappers import IngredientMappers
 
 class StockMappers:
@@ -36,6 +36,7 @@ class StockTransactionMappers:
     @staticmethod
     def modelToDomain(model: StockTransactionModel) -> StockTransaction:
         return StockTransaction(
+            id=model.id,
             ingredient_quantity=model.ingredient_quantity,
             expires_at=model.expires_at,
             employee_name=model.employee_name,
@@ -67,3 +68,44 @@ class StockTransactionMappers:
             employee_name=serializer.get('employee_name'),
             expires_at=serializer.get("expires_at")
         )
+
+
+class StockLotMappers:
+    @staticmethod
+    def modelToDomain(model: StockLotModel, with_ingredient: bool = False) -> StockLot:
+        return StockLot(
+            id=model.id,
+            stock_id=model.stock_id,
+            transaction_id=model.transaction_id,
+            initial_quantity=model.initial_quantity,
+            remaining_quantity=model.remaining_quantity,
+            received_at=model.received_at,
+            expires_at=model.expires_at,
+            ingredient=IngredientMappers.modelToDomain(model.stock.ingredient) if with_ingredient else None
+        )
+
+
+    @staticmethod
+    def domainToModel(domain: StockLot) -> StockLotModel:
+        return StockLotModel(
+            id=domain.id,
+            stock_id=domain.stock_id,
+            transaction_id=domain.transaction_id,
+            initial_quantity=domain.initial_quantity,
+            remaining_quantity=domain.remaining_quantity,
+            received_at=domain.received_at,
+            expires_at=domain.expires_at
+        )
+
+
+class LowStockAlertMappers:
+    @staticmethod
+    def modelToDomain(model: LowStockAlertModel) -> LowStockAlert:
+        return LowStockAlert(
+            id=model.id,
+            stock_id=model.stock_id,
+            total_stock=model.total_stock,
+            optimal_stock_quantity=model.optimal_stock_quantity,
+            flagged_at=model.flagged_at,
+            ingredient=IngredientMappers.modelToDomain(model.stock.ingredient)
+        )
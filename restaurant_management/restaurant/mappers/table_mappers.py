@@ -17,6 +17,7 @@ class TableMappers:
             id=model.id,
             number=model.number,
             capacity=model.capacity,
-            is_available=model.is_available
+            is_available=model.is_available,
+            group_id=model.group_id
         )
 
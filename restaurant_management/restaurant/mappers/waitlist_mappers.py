@@ -0,0 +1,32 @@
+from restaurant.repository.models.models import WaitlistEntryModel
+from restaurant.services.domain.waitlist import WaitlistEntry
+from restaurant.mappers.table_mappers import TableMappers
+
+class WaitlistMappers:
+    @staticmethod
+    def to_domain(model: WaitlistEntryModel) -> WaitlistEntry:
+        return WaitlistEntry(
+            id=model.id,
+            name=model.name,
+            phone_number=model.phone_number,
+            party_size=model.party_size,
+            status=model.status,
+            table=TableMappers.to_domain(model.table) if model.table_id else None,
+            arrived_at=model.arrived_at,
+            seated_at=model.seated_at,
+        )
+
+    @staticmethod
+    def to_model(domain: WaitlistEntry, model=None) -> WaitlistEntryModel:
+        if model is None:
+            model = WaitlistEntryModel()
+
+        model.name = domain.name
+        model.phone_number = domain.phone_number or ''
+        model.party_size = domain.party_size
+        model.status = domain.status
+        model.table_id = domain.table.id if domain.table else None
+        model.arrived_at = domain.arrived_at
+        model.seated_at = domain.seated_at
+
+        return model
@@ -0,0 +1,80 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_lots(apps, schema_editor):
+    """
+    Replay the existing ledger once so stocks that predate lot tracking start
+    with FIFO lots, then trim the oldest lots until they match total_stock.
+    """
+    StockModel = apps.get_model('restaurant', 'StockModel')
+    StockTransactionModel = apps.get_model('restaurant', 'StockTransactionModel')
+    StockLotModel = apps.get_model('restaurant', 'StockLotModel')
+
+    lots_by_stock = {}
+    transactions = StockTransactionModel.objects.order_by('stock_id', 'date', 'id').iterator()
+    for transaction in transactions:
+        stock_lots = lots_by_stock.setdefault(transaction.stock_id, [])
+
+        if transaction.transaction_type == 'IN':
+            stock_lots.append(StockLotModel(
+                stock_id=transaction.stock_id,
+                transaction_id=transaction.id,
+                initial_quantity=transaction.ingredient_quantity,
+                remaining_quantity=transaction.ingredient_quantity,
+                received_at=transaction.date,
+                expires_at=transaction.expires_at,
+            ))
+        else:
+            _consume(stock_lots, transaction.ingredient_quantity)
+
+    totals = dict(StockModel.objects.values_list('id', 'total_stock'))
+    for stock_id, stock_lots in lots_by_stock.items():
+        remaining = sum(lot.remaining_quantity for lot in stock_lots)
+        _consume(stock_lots, remaining - max(totals.get(stock_id, 0), 0))
+
+    StockLotModel.objects.bulk_create(
+        [lot for stock_lots in lots_by_stock.values() for lot in stock_lots],
+        batch_size=1000,
+    )
+
+
+def _consume(lots, quantity):
+    for lot in lots:
+        if quantity <= 0:
+            return
+        taken = min(lot.remaining_quantity, quantity)
+        lot.remaining_quantity -= taken
+        quantity -= taken
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0008_alter_menuitemmodel_category'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockLotModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('initial_quantity', models.IntegerField()),
+                ('remaining_quantity', models.IntegerField()),
+                ('received_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField(null=True)),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lots', to='restaurant.stockmodel')),
+                ('transaction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='lot', to='restaurant.stocktransactionmodel')),
+            ],
+            options={
+                'verbose_name': 'Stock Lot',
+                'verbose_name_plural': 'Stock Lots',
+                'db_table': 'stock_lots',
+                'indexes': [models.Index(condition=models.Q(('remaining_quantity__gt', 0)), fields=['stock', 'received_at'], name='stock_lots_fifo_idx'), models.Index(condition=models.Q(('remaining_quantity__gt', 0)), fields=['expires_at'], name='stock_lots_expiry_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_lots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0009_stocklotmodel'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderitemmodel',
+            name='notes',
+            field=models.CharField(max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:33
+
+import django.db.models.deletion
+from decimal import Decimal
+import django.utils.timezone
+from django.db import migrations, models
+
+
+LOW_STOCK_RATIO = Decimal('0.25')
+
+
+def seed_low_stock_alerts(apps, schema_editor):
+    StockModel = apps.get_model('restaurant', 'StockModel')
+    LowStockAlertModel = apps.get_model('restaurant', 'LowStockAlertModel')
+
+    now = django.utils.timezone.now()
+    LowStockAlertModel.objects.bulk_create([
+        LowStockAlertModel(
+            stock_id=stock_id,
+            total_stock=total_stock,
+            optimal_stock_quantity=optimal_stock_quantity,
+            flagged_at=now,
+            updated_at=now,
+        )
+        for stock_id, total_stock, optimal_stock_quantity
+        in StockModel.objects.values_list('id', 'total_stock', 'optimal_stock_quantity').iterator()
+        if total_stock < optimal_stock_quantity * LOW_STOCK_RATIO
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0010_alter_orderitemmodel_notes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LowStockAlertModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_stock', models.IntegerField()),
+                ('optimal_stock_quantity', models.IntegerField()),
+                ('flagged_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='low_stock_alert', to='restaurant.stockmodel')),
+            ],
+            options={
+                'verbose_name': 'Low Stock Alert',
+                'verbose_name_plural': 'Low Stock Alerts',
+                'db_table': 'low_stock_alerts',
+            },
+        ),
+        migrations.RunPython(seed_low_stock_alerts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0011_lowstockalertmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshotModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_stock', models.IntegerField()),
+                ('taken_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='restaurant.stockmodel')),
+            ],
+            options={
+                'verbose_name': 'Stock Snapshot',
+                'verbose_name_plural': 'Stock Snapshots',
+                'db_table': 'stock_snapshots',
+                'unique_together': {('stock', 'taken_at')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0012_stocksnapshotmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryCountModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('employee_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('POSTED', 'Posted')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('posted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Inventory Count',
+                'verbose_name_plural': 'Inventory Counts',
+                'db_table': 'inventory_counts',
+            },
+        ),
+        migrations.CreateModel(
+            name='InventoryCountLineModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('counted_quantity', models.IntegerField()),
+                ('expected_quantity', models.IntegerField(null=True)),
+                ('variance', models.IntegerField(null=True)),
+                ('counted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='count_lines', to='restaurant.stockmodel')),
+                ('count', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='restaurant.inventorycountmodel')),
+            ],
+            options={
+                'verbose_name': 'Inventory Count Line',
+                'verbose_name_plural': 'Inventory Count Lines',
+                'db_table': 'inventory_count_lines',
+                'unique_together': {('count', 'stock')},
+            },
+        ),
+    ]
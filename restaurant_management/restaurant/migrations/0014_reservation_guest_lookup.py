@@ -0,0 +1,75 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:41
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def backfill_lookup_columns(apps, schema_editor):
+    ReservationModel = apps.get_model('restaurant', 'ReservationModel')
+
+    batch = []
+    for reservation in ReservationModel.objects.only('id', 'name', 'email', 'phone_number').iterator(chunk_size=2000):
+        reservation.name_normalized = ' '.join((reservation.name or '').lower().split())
+        reservation.email_normalized = (reservation.email or '').strip().lower()
+        reservation.phone_digits = ''.join(char for char in (reservation.phone_number or '') if char.isdigit())
+        batch.append(reservation)
+
+        if len(batch) == 2000:
+            ReservationModel.objects.bulk_update(batch, ['name_normalized', 'email_normalized', 'phone_digits'])
+            batch = []
+
+    ReservationModel.objects.bulk_update(batch, ['name_normalized', 'email_normalized', 'phone_digits'])
+
+
+def create_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS reservations_name_trgm_idx ON reservations USING gin (name_normalized gin_trgm_ops)'
+    )
+
+
+def drop_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS reservations_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0013_inventorycountmodel_inventorycountlinemodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservationmodel',
+            name='email_normalized',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='reservationmodel',
+            name='name_normalized',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='reservationmodel',
+            name='phone_digits',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.RunPython(backfill_lookup_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reservationmodel',
+            index=models.Index(fields=['name_normalized'], name='reservations_name_norm_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='reservationmodel',
+            index=models.Index(fields=['email_normalized'], name='reservations_email_norm_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='reservationmodel',
+            index=models.Index(fields=['phone_digits'], name='reservations_phone_digits_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        TrigramExtension(),
+        migrations.RunPython(create_name_trigram_index, drop_name_trigram_index),
+    ]
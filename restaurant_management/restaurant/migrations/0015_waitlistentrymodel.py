@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0014_reservation_guest_lookup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntryModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('phone_number', models.CharField(blank=True, default='', max_length=255)),
+                ('party_size', models.IntegerField()),
+                ('status', models.CharField(choices=[('WAITING', 'Waiting'), ('SEATED', 'Seated'), ('CANCELLED', 'Cancelled')], default='WAITING', max_length=20)),
+                ('arrived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('seated_at', models.DateTimeField(blank=True, null=True)),
+                ('table', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='waitlist_entries', to='restaurant.tablemodel')),
+            ],
+            options={
+                'verbose_name': 'Waitlist Entry',
+                'verbose_name_plural': 'Waitlist Entries',
+                'db_table': 'waitlist_entries',
+                'indexes': [models.Index(fields=['status', '-party_size', 'arrived_at'], name='waitlist_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0016_menu_item_name_trigram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuextra',
+            name='menu_items',
+            field=models.ManyToManyField(blank=True, related_name='extras', to='restaurant.menuitemmodel'),
+        ),
+        migrations.AddField(
+            model_name='menuextra',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_prices(apps, schema_editor):
+    MenuItemModel = apps.get_model('restaurant', 'MenuItemModel')
+    MenuItemPriceModel = apps.get_model('restaurant', 'MenuItemPriceModel')
+    OrderItemModel = apps.get_model('restaurant', 'OrderItemModel')
+    MenuExtra = apps.get_model('restaurant', 'MenuExtra')
+
+    # Current prices are the only history there is: they start when the item was created
+    MenuItemPriceModel.objects.bulk_create(
+        [
+            MenuItemPriceModel(menu_item_id=item_id, price=price, effective_from=created_at)
+            for item_id, price, created_at in MenuItemModel.objects.values_list('id', 'price', 'created_at').iterator(chunk_size=2000)
+        ],
+        batch_size=2000
+    )
+
+    OrderItemModel.objects.update(
+        unit_price=Subquery(MenuItemModel.objects.filter(id=OuterRef('menu_item_id')).values('price')[:1])
+    )
+    OrderItemModel.objects.filter(menu_extra__isnull=False).update(
+        extra_price=Subquery(MenuExtra.objects.filter(id=OuterRef('menu_extra_id')).values('price')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0017_menu_extra_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitemmodel',
+            name='extra_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='orderitemmodel',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.CreateModel(
+            name='MenuItemPriceModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('effective_from', models.DateTimeField(default=django.utils.timezone.now)),
+                ('menu_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='restaurant.menuitemmodel')),
+            ],
+            options={
+                'verbose_name': 'Menu Item Price',
+                'verbose_name_plural': 'Menu Item Prices',
+                'db_table': 'menu_item_prices',
+                'indexes': [models.Index(fields=['menu_item', '-effective_from'], name='menu_item_price_effective_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0018_menu_price_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableGroupModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Table Group',
+                'verbose_name_plural': 'Table Groups',
+                'db_table': 'table_groups',
+            },
+        ),
+        migrations.AddField(
+            model_name='tablemodel',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tables', to='restaurant.tablegroupmodel'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_recorded_at(apps, schema_editor):
+    # Posting time was never stored; the transaction date is the closest record of it
+    StockTransactionModel = apps.get_model('restaurant', 'StockTransactionModel')
+    StockTransactionModel.objects.update(recorded_at=models.F('date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0019_table_groups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stocktransactionmodel',
+            name='recorded_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_recorded_at, migrations.RunPython.noop),
+    ]
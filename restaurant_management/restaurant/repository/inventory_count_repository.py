@@ -0,0 +1,97 @@
+from restaurant.repository.common_repository import CommonRepository
+from restaurant.services.domain.inventory_count import InventoryCount, InventoryCountLine
+from restaurant.mappers.inventory_count_mappers import InventoryCountMappers, InventoryCountLineMappers
+from restaurant.repository.models.models import InventoryCountModel, InventoryCountLineModel
+from django.db.models import F
+from typing import List, Optional
+
+
+class InventoryCountRepository(CommonRepository[InventoryCount]):
+     def __init__(self):
+          self.count = InventoryCountModel
+          self.line = InventoryCountLineModel
+
+
+     def get_all(self) -> List[InventoryCount]:
+          count_models = self.count.objects.all().order_by('-created_at')
+          return [InventoryCountMappers.modelToDomain(count_model) for count_model in count_models]
+
+
+     def get_by_id(self, id) -> Optional[InventoryCount]:
+          count_model = self.count.objects.filter(id=id).first()
+          if count_model is None:
+               return None
+
+          lines = [InventoryCountLineMappers.modelToDomain(line) for line in count_model.lines.order_by('stock_id')]
+          return InventoryCountMappers.modelToDomain(count_model, lines)
+
+
+     def get_by_id_for_update(self, id) -> Optional[InventoryCount]:
+          """
+          Locks the count and, through the lines, every stock it touches until the
+          surrounding transaction ends. Each line carries the stock's current total
+          as its expected quantity, all read in a single query.
+          """
+          count_model = self.count.objects.select_for_update().filter(id=id).first()
+          if count_model is None:
+               return None
+
+          line_models = (
+               self.line.objects
+               .select_for_update(of=('self', 'stock'))
+               .filter(count_id=id)
+               .annotate(
+                    current_stock=F('stock__total_stock'),
+                    optimal_stock_quantity=F('stock__optimal_stock_quantity')
+               )
+               .order_by('stock_id')
+          )
+
+          lines = []
+          for line_model in line_models:
+               line = InventoryCountLineMappers.modelToDomain(line_model)
+               line.compute_variance(line_model.current_stock)
+               lines.append(line)
+
+          return InventoryCountMappers.modelToDomain(count_model, lines)
+
+
+     def create(self, count: InventoryCount) -> InventoryCount:
+          count_model = InventoryCountMappers.domainToModel(count)
+          count_model.save()
+
+          return InventoryCountMappers.modelToDomain(count_model)
+
+
+     def update(self, count: InventoryCount) -> InventoryCount:
+          self.count.objects.filter(id=count.id).update(status=count.status, posted_at=count.posted_at)
+          return count
+
+
+     def save_lines(self, count_id: int, lines: List[InventoryCountLine]):
+          """Insert new lines and overwrite the counted quantity of stocks already counted in the session."""
+          existing_ids = dict(
+               self.line.objects
+               .filter(count_id=count_id, stock_id__in=[line.stock_id for line in lines])
+               .values_list('stock_id', 'id')
+          )
+
+          for line in lines:
+               line.id = existing_ids.get(line.stock_id)
+
+          line_models = [InventoryCountLineMappers.domainToModel(line, count_id) for line in lines]
+          self.line.objects.bulk_update(
+               [line_model for line_model in line_models if line_model.id],
+               ['counted_quantity', 'counted_at']
+          )
+          self.line.objects.bulk_create([line_model for line_model in line_models if not line_model.id])
+
+
+     def update_lines(self, count_id: int, lines: List[InventoryCountLine]):
+          line_models = [InventoryCountLineMappers.domainToModel(line, count_id) for line in lines]
+          self.line.objects.bulk_update(line_models, ['expected_quantity', 'variance'], batch_size=500)
+
+
+     def delete(self, id) -> bool:
+          deleted, _ = self.count.objects.filter(id=id).delete()
+          return deleted > 0
@@ -0,0 +1,54 @@
+from restaurant.services.domain.menu_extra import MenuExtra
+from restaurant.repository.models.models import MenuExtra as MenuExtraModel
+from restaurant.mappers.menu_extra_mappers import MenuExtraMapper
+from restaurant.repository.common_repository import CommonRepository
+from typing import Dict, List, Optional, Set
+from django.db import transaction
+
+class MenuExtraRepository(CommonRepository[MenuExtra]):
+    def __init__(self):
+        self.menu_extra = MenuExtraModel
+        self.allowed_items = MenuExtraModel.menu_items.through
+
+
+    def get_all(self) -> List[MenuExtra]:
+        """Every extra with its allowed menu items, in two queries whatever the catalog size."""
+        menu_item_ids: Dict[int, Set[int]] = {}
+        for extra_id, menu_item_id in self.allowed_items.objects.values_list('menuextra_id', 'menuitemmodel_id'):
+            menu_item_ids.setdefault(extra_id, set()).add(menu_item_id)
+
+        extras = self.menu_extra.objects.all().order_by('id')
+        return [MenuExtraMapper.to_domain(model, menu_item_ids.get(model.id, ())) for model in extras]
+
+
+    def get_by_id(self, extra_id: int) -> Optional[MenuExtra]:
+        model = self.menu_extra.objects.filter(id=extra_id).first()
+        if model:
+            menu_item_ids = self.allowed_items.objects.filter(menuextra_id=model.id).values_list('menuitemmodel_id', flat=True)
+            return MenuExtraMapper.to_domain(model, menu_item_ids)
+
+
+    def create(self, menu_extra: MenuExtra) -> MenuExtra:
+        with transaction.atomic():
+            model = MenuExtraMapper.to_model(menu_extra)
+            model.save()
+            model.menu_items.set(menu_extra.menu_item_ids)
+
+        return MenuExtraMapper.to_domain(model, menu_extra.menu_item_ids)
+
+
+    def update(self, menu_extra: MenuExtra) -> Optional[MenuExtra]:
+        model = self.menu_extra.objects.filter(id=menu_extra.id).first()
+        if model is None:
+            return None
+
+        with transaction.atomic():
+            MenuExtraMapper.to_model(menu_extra, model).save()
+            model.menu_items.set(menu_extra.menu_item_ids)
+
+        return MenuExtraMapper.to_domain(model, menu_extra.menu_item_ids)
+
+
+    def delete(self, extra_id: int) -> bool:
+        deleted, _ = self.menu_extra.objects.filter(id=extra_id).delete()
+        return deleted > 0
@@ -1,8 +1,17 @@
-from restaurant.services.domain.menu_item import MenuItem
-from restaurant.repository.models.models import MenuItemModel
+from restaurant.services.domain.menu_item import MenuItem, MenuItemPrice
+from restaurant.repository.models.models import MenuItemModel, MenuItemPriceModel
 from restaurant.mappers.menu_item_mappers import MenuItemMapper
 from restaurant.repository.common_repository import CommonRepository
+from restaurant.services.domain.menu_search import CATEGORY_RANK, MenuMatch, normalize_term
 from typing import List, Optional
+from django.contrib.postgres.search import TrigramWordSimilarity
+from decimal import Decimal
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Case, IntegerField, Q, Value, When
+import re
+
+UPSERT_FIELDS = ['name', 'price', 'description', 'category', 'updated_at']
 
 class MenuItemRepository(CommonRepository[MenuItem]):
      def __init__(self):
@@ -18,22 +27,100 @@ class MenuItemRepository(CommonRepository[MenuItem]):
         return menu
 
 
+     def get_by_category(self, category: str) -> List[MenuItem]:
+        menu_items = self.menu_item.objects.filter(category=category).order_by('id')
+        return [MenuItemMapper.to_domain(model) for model in menu_items]
+
+
+     def search(self, term: str, limit: int) -> List[MenuItem]:
+         """
+         PostgreSQL only: name prefix and word-prefix matches first, then pg_trgm
+         word similarity, served by the name trigram index; ties go by menu section.
+         """
+         query = normalize_term(term)
+         match = Case(
+             When(name__istartswith=query, then=Value(MenuMatch.NAME_PREFIX)),
+             When(name__iregex=r'\m' + re.escape(query), then=Value(MenuMatch.WORD_PREFIX)),
+             default=Value(MenuMatch.SIMILAR),
+             output_field=IntegerField(),
+         )
+         category_rank = Case(
+             *[When(category=category, then=Value(rank)) for category, rank in CATEGORY_RANK.items()],
+             default=Value(len(CATEGORY_RANK)),
+             output_field=IntegerField(),
+         )
+
+         menu_items = self.menu_item.objects.filter(
+             Q(name__icontains=query) | Q(name__trigram_word_similar=query)
+         ).annotate(
+             match=match, similarity=TrigramWordSimilarity(query, 'name'), category_rank=category_rank
+         ).order_by('match', '-similarity', 'category_rank', 'name')
+
+         return [MenuItemMapper.to_domain(model) for model in menu_items[:limit]]
+
+
      def get_by_id(self, item_id: int) -> Optional[MenuItem]:
         model = self.menu_item.objects.filter(id=item_id).first()
         if model:
            return MenuItemMapper.to_domain(model)
 
 
+     def get_price_history(self, item_id: int) -> List[MenuItemPrice]:
+         prices = MenuItemPriceModel.objects.filter(menu_item_id=item_id).order_by('-effective_from')
+         return [MenuItemPrice(price.menu_item_id, price.price, price.effective_from) for price in prices]
+
+
      def create(self, menu_item: MenuItem) -> MenuItem:
          new_item_model = MenuItemMapper.to_model(menu_item)
          
-         new_item_model.save()
+         with transaction.atomic():
+             new_item_model.save()
+             self._record_prices([new_item_model])
 
          return MenuItemMapper.to_domain(new_item_model)
 
 
      def update(self,  menu_item: MenuItem) -> Optional[MenuItem]:
-         pass
+         with transaction.atomic():
+             # Locked so a concurrent update can't read the same previous price and skip or repeat the history row
+             model = self.menu_item.objects.select_for_update().filter(id=menu_item.id).first()
+             if model is None:
+                 return None
+
+             previous_price = model.price
+             MenuItemMapper.to_model(menu_item, model).save(update_fields=UPSERT_FIELDS)
+             if Decimal(model.price) != previous_price:
+                 self._record_prices([model])
+
+         return MenuItemMapper.to_domain(model)
+
+
+     def bulk_upsert(self, created: List[MenuItem], updated: List[MenuItem]) -> List[MenuItem]:
+         """Insert and update a batch of items in one transaction; returns the created items with their ids."""
+         updated_models = [MenuItemMapper.to_model(item) for item in updated]
+
+         with transaction.atomic():
+             previous_prices = dict(
+                 self.menu_item.objects.select_for_update()
+                 .filter(id__in=[model.id for model in updated_models])
+                 .order_by('id')
+                 .values_list('id', 'price')
+             )
+             created_models = self.menu_item.objects.bulk_create([MenuItemMapper.to_model(item) for item in created])
+             self.menu_item.objects.bulk_update(updated_models, UPSERT_FIELDS, batch_size=500)
+
+             repriced = [model for model in updated_models if Decimal(model.price) != previous_prices.get(model.id)]
+             self._record_prices(created_models + repriced)
+
+         return [MenuItemMapper.to_domain(model) for model in created_models]
+
+
+     def _record_prices(self, models: List[MenuItemModel]):
+         effective_from = timezone.now()
+         MenuItemPriceModel.objects.bulk_create([
+             MenuItemPriceModel(menu_item_id=model.id, price=model.price, effective_from=effective_from)
+             for model in models
+         ])
 
 
      def delete(self, item_id: int) -> bool:
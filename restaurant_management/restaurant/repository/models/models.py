@@ -30,8 +30,28 @@ class MenuItemModel(models.Model):
         return self.name
         
 
+class MenuItemPriceModel(models.Model):
+    menu_item = models.ForeignKey(MenuItemModel, on_delete=models.CASCADE, related_name='price_history')
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    effective_from = models.DateTimeField(default=now)
+
+    class Meta:
+        db_table = 'menu_item_prices'
+        verbose_name = 'Menu Item Price'
+        verbose_name_plural = 'Menu Item Prices'
+        # Serves "price of an item at a given time" as a single index probe
+        indexes = [
+            models.Index(fields=['menu_item', '-effective_from'], name='menu_item_price_effective_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.menu_item_id} - {self.price} from {self.effective_from}'
+
+
 class MenuExtra(models.Model):
     name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    menu_items = models.ManyToManyField(MenuItemModel, related_name='extras', blank=True)
     created_at = models.DateTimeField(default=now)
     updated_at = models.DateTimeField(default=now)
 
@@ -44,10 +64,24 @@ class MenuExtra(models.Model):
         return self.name
 
 
+class TableGroupModel(models.Model):
+    created_at = models.DateTimeField(default=now)
+
+    class Meta:
+        db_table = 'table_groups'
+        verbose_name = 'Table Group'
+        verbose_name_plural = 'Table Groups'
+
+    def __str__(self):
+        return f'Table group {self.id}'
+
+
 class TableModel(models.Model):
     number = models.IntegerField()
     capacity = models.IntegerField()
     is_available = models.BooleanField(default=True)
+    # Tables pushed together for a large party; the group acts as one table until split
+    group = models.ForeignKey(TableGroupModel, on_delete=models.SET_NULL, null=True, blank=True, related_name='tables')
     created_at = models.DateTimeField(default=now)
     updated_at = models.DateTimeField(default=now)
 
@@ -87,8 +121,11 @@ class OrderItemModel(models.Model):
     order = models.ForeignKey(OrderModel, on_delete=models.CASCADE, related_name='order_items', default="")
     added_at = models.DateTimeField(default=now)
     menu_extra = models.ForeignKey(MenuExtra, on_delete=models.PROTECT, related_name='order_items', null=True)
+    # Prices in effect when the item was added, so later menu changes never reprice an open ticket
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    extra_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     quantity = models.IntegerField(default=1)
-    notes = models.CharField(null=True)
+    notes = models.CharField(max_length=255, null=True)
     is_delivered = models.BooleanField(default=False)
 
     class Meta:
@@ -145,6 +182,8 @@ class StockTransactionModel(models.Model):
     stock = models.ForeignKey(StockModel, on_delete=models.CASCADE, related_name='transactions')
     transaction_type = models.CharField(max_length=3, choices=TRANSACTION_TYPES)
     date = models.DateTimeField(default=timezone.now)
+    # Server time of posting; date is client supplied and may be backdated
+    recorded_at = models.DateTimeField(auto_now_add=True, db_index=True)
     expires_at = models.DateTimeField(null=True)
     employee_name = models.CharField(max_length=255, blank=True, null=True) 
 
@@ -157,6 +196,106 @@ class StockTransactionModel(models.Model):
         return f'{self.transaction_type} - {self.ingredient_quantity}'
 
 
+class StockSnapshotModel(models.Model):
+    stock = models.ForeignKey(StockModel, on_delete=models.CASCADE, related_name='snapshots')
+    total_stock = models.IntegerField()
+    taken_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'stock_snapshots'
+        verbose_name = 'Stock Snapshot'
+        verbose_name_plural = 'Stock Snapshots'
+        unique_together = ('stock', 'taken_at')
+
+    def __str__(self):
+        return f'Stock {self.stock_id} - {self.total_stock} at {self.taken_at}'
+
+
+class InventoryCountModel(models.Model):
+    STATUS_CHOICES = [
+        ('OPEN', 'Open'),
+        ('POSTED', 'Posted'),
+    ]
+
+    employee_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    created_at = models.DateTimeField(default=now)
+    posted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'inventory_counts'
+        verbose_name = 'Inventory Count'
+        verbose_name_plural = 'Inventory Counts'
+
+    def __str__(self):
+        return f'Count {self.id} - {self.status}'
+
+
+class InventoryCountLineModel(models.Model):
+    count = models.ForeignKey(InventoryCountModel, on_delete=models.CASCADE, related_name='lines')
+    stock = models.ForeignKey(StockModel, on_delete=models.CASCADE, related_name='count_lines')
+    counted_quantity = models.IntegerField()
+    expected_quantity = models.IntegerField(null=True)
+    variance = models.IntegerField(null=True)
+    counted_at = models.DateTimeField(default=now)
+
+    class Meta:
+        db_table = 'inventory_count_lines'
+        verbose_name = 'Inventory Count Line'
+        verbose_name_plural = 'Inventory Count Lines'
+        unique_together = ('count', 'stock')
+
+    def __str__(self):
+        return f'Count {self.count_id} - Stock {self.stock_id}: {self.counted_quantity}'
+
+
+class LowStockAlertModel(models.Model):
+    stock = models.OneToOneField(StockModel, on_delete=models.CASCADE, related_name='low_stock_alert')
+    total_stock = models.IntegerField()
+    optimal_stock_quantity = models.IntegerField()
+    flagged_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'low_stock_alerts'
+        verbose_name = 'Low Stock Alert'
+        verbose_name_plural = 'Low Stock Alerts'
+
+    def __str__(self):
+        return f'Stock {self.stock_id} - {self.total_stock}/{self.optimal_stock_quantity}'
+
+
+class StockLotModel(models.Model):
+    stock = models.ForeignKey(StockModel, on_delete=models.CASCADE, related_name='lots')
+    transaction = models.OneToOneField(StockTransactionModel, on_delete=models.CASCADE, related_name='lot')
+    initial_quantity = models.IntegerField()
+    remaining_quantity = models.IntegerField()
+    received_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = 'stock_lots'
+        verbose_name = 'Stock Lot'
+        verbose_name_plural = 'Stock Lots'
+        indexes = [
+            # Only open lots are ever consumed or checked for expiry, so both
+            # indexes skip depleted rows and stay small as the ledger grows.
+            models.Index(
+                fields=['stock', 'received_at'],
+                name='stock_lots_fifo_idx',
+                condition=models.Q(remaining_quantity__gt=0),
+            ),
+            models.Index(
+                fields=['expires_at'],
+                name='stock_lots_expiry_idx',
+                condition=models.Q(remaining_quantity__gt=0),
+            ),
+        ]
+
+    def __str__(self):
+        return f'Lot {self.id} - {self.remaining_quantity}/{self.initial_quantity}'
+
+
 class ReservationModel(models.Model):
     STATUS_CHOICES = [
         ('BOOKED', 'Booked'),
@@ -174,16 +313,54 @@ class ReservationModel(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
     created_at = models.DateTimeField(default=now)
     cancelled_at = models.DateTimeField(null=True, blank=True)
+    # Guest lookup columns, kept in sync by ReservationMapper.to_model
+    name_normalized = models.CharField(max_length=255, default='')
+    email_normalized = models.CharField(max_length=255, default='')
+    phone_digits = models.CharField(max_length=255, default='')
 
     class Meta:
         db_table = 'reservations'
         verbose_name = 'Reservation'
         verbose_name_plural = 'Reservations'
+        # varchar_pattern_ops lets PostgreSQL serve LIKE 'prefix%' from the btree; ignored elsewhere
+        indexes = [
+            models.Index(fields=['name_normalized'], name='reservations_name_norm_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['email_normalized'], name='reservations_email_norm_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['phone_digits'], name='reservations_phone_digits_idx', opclasses=['varchar_pattern_ops']),
+        ]
 
     def __str__(self):
         return f'{self.name} - {self.reservation_date}'
 
 
+class WaitlistEntryModel(models.Model):
+    STATUS_CHOICES = [
+        ('WAITING', 'Waiting'),
+        ('SEATED', 'Seated'),
+        ('CANCELLED', 'Cancelled'),
+    ]
+
+    name = models.CharField(max_length=255)
+    phone_number = models.CharField(max_length=255, blank=True, default='')
+    party_size = models.IntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='WAITING')
+    table = models.ForeignKey(TableModel, on_delete=models.SET_NULL, null=True, blank=True, related_name='waitlist_entries')
+    arrived_at = models.DateTimeField(default=now)
+    seated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'waitlist_entries'
+        verbose_name = 'Waitlist Entry'
+        verbose_name_plural = 'Waitlist Entries'
+        # Serves "largest waiting party that fits, first come first served" as a single index probe
+        indexes = [
+            models.Index(fields=['status', '-party_size', 'arrived_at'], name='waitlist_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.party_size}) - {self.status}'
+
+
 class PaymentModel(models.Model):
     PAYMENT_METHODS = [
         ('CASH', 'Cash'),
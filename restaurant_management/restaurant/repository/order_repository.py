@@ -1,7 +1,9 @@
 from restaurant.repository.models.models import OrderModel, OrderItemModel
 from restaurant.services.domain.order import Order
 from restaurant.repository.common_repository import CommonRepository
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from django.db.models import Avg, Case, DecimalField, DurationField, ExpressionWrapper, F, Value, When
 from restaurant.mappers.order_mappers import OrderMappers, OrderItemMappers
 
 
@@ -12,7 +14,13 @@ class OrderRepository(CommonRepository):
     
 
     def get_by_id(self, id: int) -> Optional[Order]:
-        order = self.order_model.objects.filter(id=id).first()
+        order = (
+            self.order_model.objects
+            .select_related('table')
+            .prefetch_related('order_items__menu_item', 'order_items__menu_extra')
+            .filter(id=id)
+            .first()
+        )
         return OrderMappers.to_domain(order) if order else None
 
 
@@ -22,6 +30,51 @@ class OrderRepository(CommonRepository):
         return [OrderMappers.to_domain(model) for model in models]
     
 
+    def get_turnover_by_capacity(self, since: datetime) -> Dict[int, timedelta]:
+        """Average seated time (order start to end) of completed orders per table capacity."""
+        rows = (
+            self.order_model.objects
+            .filter(status='COMPLETED', end_at__isnull=False, created_at__gte=since)
+            .values('table__capacity')
+            .annotate(turnover=Avg(ExpressionWrapper(F('end_at') - F('created_at'), output_field=DurationField())))
+        )
+        return {row['table__capacity']: row['turnover'] for row in rows if row['turnover'] is not None}
+
+
+    def get_open_order_starts(self) -> Dict[int, datetime]:
+        """Start time of the oldest in-progress order on each occupied table."""
+        starts = {}
+        open_orders = self.order_model.objects.filter(status='IN_PROGRESS').order_by('-created_at').values_list('table_id', 'created_at')
+        for table_id, created_at in open_orders:
+            starts[table_id] = created_at
+        return starts
+
+
+    def get_open_orders_by_table(self) -> Dict[int, Tuple[int, datetime]]:
+        """Id and start time of the oldest in-progress order on each occupied table."""
+        open_orders = {}
+        rows = self.order_model.objects.filter(status='IN_PROGRESS').order_by('-created_at').values_list('table_id', 'id', 'created_at')
+        for table_id, order_id, created_at in rows:
+            open_orders[table_id] = (order_id, created_at)
+        return open_orders
+
+
+    def get_completed_order_rows(self, start: datetime, end: datetime) -> List[Tuple[int, datetime, datetime, float]]:
+        """(table id, started, ended, paid total) of orders completed and started in [start, end); unpaid orders count 0."""
+        paid_total = Case(
+            When(payment__payment_status='COMPLETED', then=F('payment__total')),
+            default=Value(0),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+        rows = (
+            self.order_model.objects
+            .filter(status='COMPLETED', end_at__isnull=False, created_at__gte=start, created_at__lt=end)
+            .annotate(paid_total=paid_total)
+            .values_list('table_id', 'created_at', 'end_at', 'paid_total')
+        )
+        return [(table_id, created_at, end_at, float(paid_total)) for table_id, created_at, end_at, paid_total in rows]
+
+
     def create(self, order: Order) -> Order:
         order_model = OrderMappers.to_model(order)
         
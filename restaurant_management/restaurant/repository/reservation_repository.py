@@ -2,8 +2,20 @@ from restaurant.services.domain.reservation import Reservation
 from restaurant.repository.models.models import ReservationModel
 from restaurant.mappers.reservation_mappers import ReservationMapper
 from restaurant.repository.common_repository import CommonRepository
-from typing import List, Optional
-from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from contextlib import contextmanager
+from threading import Lock
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import TruncDate
+
+# First key of the two-key advisory lock, so table locks never collide with other advisory users
+TABLE_LOCK_NAMESPACE = 3901
+
+_local_table_locks: Dict[int, Lock] = {}
+_local_table_locks_guard = Lock()
 
 
 class ReservationRepository(CommonRepository):
@@ -20,17 +32,106 @@ class ReservationRepository(CommonRepository):
     
         reservation = self.reservation_model.objects.filter(
             table=table,
-            reservation_date__range=(start_time, end_time)
+            reservation_date__range=(start_time, end_time),
+            status__in=Reservation.BLOCKING_STATUSES
         ).first()
         
         return ReservationMapper.to_domain(reservation) if reservation else None
 
+    def get_reservation_times_by_tables(
+        self, table_ids: List[int], start: datetime, end: datetime, statuses=Reservation.BLOCKING_STATUSES
+    ) -> List[Tuple[int, datetime]]:
+        """(table_id, reservation_date) of every reservation holding one of the given tables within [start, end]."""
+        return list(
+            self.reservation_model.objects
+            .filter(table_id__in=table_ids, reservation_date__range=(start, end), status__in=statuses)
+            .values_list('table_id', 'reservation_date')
+        )
+
+    def get_reservation_times_by_range(self, start: datetime, end: datetime) -> List[Tuple[int, datetime]]:
+        return list(
+            self.reservation_model.objects
+            .filter(reservation_date__range=(start, end), status__in=Reservation.BLOCKING_STATUSES)
+            .values_list('table_id', 'reservation_date')
+        )
+
+    def get_booked_parties_by_tables(self, table_ids: List[int], since: datetime) -> List[Tuple[int, int]]:
+        """(table_id, customer_number) of every booking still expected at one of the given tables from since on."""
+        return list(
+            self.reservation_model.objects
+            .filter(table_id__in=table_ids, reservation_date__gte=since, status=Reservation.Status.BOOKED)
+            .values_list('table_id', 'customer_number')
+        )
+
+    @contextmanager
+    def try_lock_table(self, table_id: int) -> Iterator[bool]:
+        """
+        Hold an exclusive booking lock on the table for the duration of the block,
+        without waiting: yields False when another writer already holds it.
+        PostgreSQL uses an advisory lock scoped to a transaction opened here. Other
+        backends fall back to a process-local lock and run the block in autocommit,
+        so the insert is committed before the lock is released (SQLite cannot
+        upgrade concurrent read transactions to writes).
+        """
+        if connection.vendor == 'postgresql':
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_try_advisory_xact_lock(%s, %s)', [TABLE_LOCK_NAMESPACE, table_id])
+                    acquired = cursor.fetchone()[0]
+                yield acquired
+            return
+
+        with _local_table_locks_guard:
+            lock = _local_table_locks.setdefault(table_id, Lock())
+
+        if not lock.acquire(blocking=False):
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            lock.release()
+
     def get_by_email(self, email: str) -> List[Reservation]:
-        return self._filter_by_field("email", email)
+        return self._filter_by_field("email_normalized", Reservation.normalize_email(email))
 
 
     def get_by_phone_number(self, phone_number: str) -> List[Reservation]:
-        return self._filter_by_field("phone_number", phone_number)
+        return self._filter_by_field("phone_digits", Reservation.normalize_phone(phone_number))
+
+
+    def get_by_name(self, name: str) -> List[Reservation]:
+        return self._filter_by_field("name_normalized", Reservation.normalize_name(name))
+
+
+    def search_guests(self, term: str, limit: int) -> List[Reservation]:
+        """
+        Reservations whose guest name, email or phone starts with the term, served
+        by the prefix indexes. On PostgreSQL names are also matched by trigram
+        similarity so typos still find the guest, best matches first.
+        """
+        name = Reservation.normalize_name(term)
+        digits = Reservation.normalize_phone(term)
+
+        matches = Q(name_normalized__startswith=name) | Q(email_normalized__startswith=Reservation.normalize_email(term))
+        if digits:
+            matches |= Q(phone_digits__startswith=digits)
+
+        reservations = self.reservation_model.objects.select_related('table')
+        if connection.vendor == 'postgresql':
+            matches |= Q(name_normalized__trigram_similar=name)
+            reservations = reservations.filter(matches).annotate(
+                similarity=TrigramSimilarity('name_normalized', name)
+            ).order_by('-similarity', '-reservation_date')
+        else:
+            reservations = reservations.filter(matches).order_by('-reservation_date')
+
+        return [ReservationMapper.to_domain(r) for r in reservations[:limit]]
+
+
+    def get_by_table(self, table_number) -> List[Reservation]:
+        return self._filter_by_field("table__number", table_number)
 
 
     def get_reservations_by_date_range(self, start_date, end_date):
@@ -44,6 +145,54 @@ class ReservationRepository(CommonRepository):
         return ReservationMapper.to_domain(reservation_model)
 
 
+    def get_by_range_with_tables(self, start: datetime, end: datetime) -> List[Reservation]:
+        reservations = (
+            self.reservation_model.objects
+            .filter(reservation_date__range=(start, end))
+            .select_related('table')
+            .order_by('reservation_date', 'id')
+        )
+        return [ReservationMapper.to_domain(r) for r in reservations]
+
+
+    def get_overdue_booked_days(self, cutoff: datetime) -> List[date]:
+        """Local days holding a booked reservation that started before cutoff, one row per day."""
+        return list(
+            self.reservation_model.objects
+            .filter(status=Reservation.Status.BOOKED, reservation_date__lt=cutoff)
+            .annotate(day=TruncDate('reservation_date'))
+            .values_list('day', flat=True)
+            .distinct()
+        )
+
+
+    def mark_overdue_not_attended(self, cutoff: datetime) -> int:
+        """Single conditional UPDATE: rows attended or cancelled meanwhile no longer match and are left alone."""
+        return self.reservation_model.objects.filter(
+            status=Reservation.Status.BOOKED,
+            reservation_date__lt=cutoff
+        ).update(status=Reservation.Status.NOT_ATTENDED)
+
+
+    def update_tables(self, reservations: List[Reservation]):
+        self.reservation_model.objects.bulk_update(
+            [self.reservation_model(id=reservation.id, table_id=reservation.table.id) for reservation in reservations],
+            ['table'],
+            batch_size=500
+        )
+
+
+    def create_many(self, reservations: List[Reservation]) -> List[Reservation]:
+        models = self.reservation_model.objects.bulk_create(
+            [ReservationMapper.to_model(reservation) for reservation in reservations],
+            batch_size=500
+        )
+        for reservation, model in zip(reservations, models):
+            reservation.id = model.id
+
+        return reservations
+
+
     def update(self, reservation: Reservation) -> Reservation:
         pass
 
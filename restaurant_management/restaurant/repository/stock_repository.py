@@ -1,8 +1,14 @@
 from restaurant.repository.common_repository import CommonRepository
-from restaurant.services.domain.stock import Stock, StockTransaction
-from restaurant.mappers.stock_mappers import StockMappers, StockTransactionMappers
-from restaurant.repository.models.models import StockModel, StockTransactionModel
-from typing import List, Optional
+from restaurant.services.domain.stock import Stock, StockTransaction, StockLot, LowStockAlert, StockSnapshot
+from restaurant.mappers.stock_mappers import StockMappers, StockTransactionMappers, StockLotMappers, LowStockAlertMappers
+from restaurant.repository.models.models import StockModel, StockTransactionModel, StockLotModel, LowStockAlertModel, StockSnapshotModel
+from restaurant.mappers.ingredient_mappers import IngredientMappers
+from django.db.models import Case, F, Min, Sum, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time
+import numpy as np
 
 
 class StockRepository(CommonRepository[Stock]):
@@ -23,6 +29,17 @@ class StockRepository(CommonRepository[Stock]):
                return StockMappers.modelToDomain(stock_model)
                
 
+     def get_by_id_for_update(self, id) -> Optional[Stock]:
+          """The stock row-locked until the surrounding transaction ends, so its total can be adjusted without losing writes."""
+          stock_model = self.stock.objects.select_for_update(of=('self',)).select_related('ingredient').filter(id=id).first()
+          if stock_model is not None:
+               return StockMappers.modelToDomain(stock_model)
+
+
+     def get_existing_ids(self, ids: List[int]) -> set:
+          return set(self.stock.objects.filter(id__in=ids).values_list('id', flat=True))
+
+
      def get_by_ingredient(self, ingredient) -> Optional[Stock]:
           stock_model = self.stock.objects.filter(ingredient=ingredient.id).first()
           if stock_model:
@@ -49,6 +66,240 @@ class StockRepository(CommonRepository[Stock]):
           transaction_model = StockTransactionMappers.domainToModel(transaction)
           
           transaction_model.save()
+          transaction.id = transaction_model.id
+
+
+     def save_transactions(self, transactions: List[StockTransaction]):
+          transaction_models = [
+               StockTransactionModel(
+                    stock_id=transaction.stock.id,
+                    ingredient_quantity=transaction.ingredient_quantity,
+                    transaction_type=transaction.transaction_type,
+                    date=transaction.date,
+                    expires_at=transaction.expires_at,
+                    employee_name=transaction.employee_name
+               )
+               for transaction in transactions
+          ]
+          StockTransactionModel.objects.bulk_create(transaction_models, batch_size=500)
+
+          for transaction, transaction_model in zip(transactions, transaction_models):
+               transaction.id = transaction_model.id
+
+
+     def update_totals(self, stocks: List[Stock]):
+          stock_models = [
+               StockModel(id=stock.id, total_stock=stock.total_stock, updated_at=stock.updated_at)
+               for stock in stocks
+          ]
+          self.stock.objects.bulk_update(stock_models, ['total_stock', 'updated_at'], batch_size=500)
+
+
+     def create_lot(self, lot: StockLot) -> StockLot:
+          lot_model = StockLotMappers.domainToModel(lot)
+
+          lot_model.save()
+          lot.id = lot_model.id
+
+          return lot
+
+
+     def get_open_lots_for_update(self, stock_id) -> List[StockLot]:
+          """Open lots of a stock in FIFO order, row-locked until the surrounding transaction ends."""
+          lot_models = (
+               StockLotModel.objects
+               .select_for_update()
+               .filter(stock_id=stock_id, remaining_quantity__gt=0)
+               .order_by('received_at', 'id')
+          )
+
+          return [StockLotMappers.modelToDomain(lot_model) for lot_model in lot_models]
+
+
+     def create_lots(self, lots: List[StockLot]):
+          StockLotModel.objects.bulk_create([StockLotMappers.domainToModel(lot) for lot in lots], batch_size=500)
+
+
+     def get_open_lots_for_update_by_stock(self, stock_ids: List[int]) -> dict:
+          """Open lots of several stocks at once, grouped by stock id in FIFO order."""
+          lot_models = (
+               StockLotModel.objects
+               .select_for_update()
+               .filter(stock_id__in=stock_ids, remaining_quantity__gt=0)
+               .order_by('received_at', 'id')
+          )
+
+          lots_by_stock = {}
+          for lot_model in lot_models:
+               lots_by_stock.setdefault(lot_model.stock_id, []).append(StockLotMappers.modelToDomain(lot_model))
+
+          return lots_by_stock
+
+
+     def update_lots(self, lots: List[StockLot]):
+          lot_models = [StockLotMappers.domainToModel(lot) for lot in lots]
+          StockLotModel.objects.bulk_update(lot_models, ['remaining_quantity'], batch_size=500)
+
+
+     def deplete_lots(self, stock_id):
+          StockLotModel.objects.filter(stock_id=stock_id, remaining_quantity__gt=0).update(remaining_quantity=0)
+
+
+     def get_expiring_lots(self, until: datetime) -> List[StockLot]:
+          lot_models = (
+               StockLotModel.objects
+               .filter(remaining_quantity__gt=0, expires_at__lte=until)
+               .select_related('stock__ingredient')
+               .order_by('expires_at', 'id')
+          )
+
+          return [StockLotMappers.modelToDomain(lot_model, with_ingredient=True) for lot_model in lot_models]
+
+
+     def get_low_stock_alerts(self) -> List[LowStockAlert]:
+          alert_models = LowStockAlertModel.objects.select_related('stock__ingredient').order_by('flagged_at')
+          
+          return [LowStockAlertMappers.modelToDomain(alert_model) for alert_model in alert_models]
+
+
+     def sync_low_stock_alerts(self, stocks: List[Stock]) -> List[int]:
+          """
+          Bring the low stock projection in line with the given stocks.
+          Returns the ids of the stocks that were not flagged before.
+          """
+          low_stocks = {stock.id: stock for stock in stocks if stock.is_low_stock()}
+
+          LowStockAlertModel.objects.filter(
+               stock_id__in=[stock.id for stock in stocks]
+          ).exclude(stock_id__in=low_stocks.keys()).delete()
+
+          if not low_stocks:
+               return []
+
+          existing_alerts = LowStockAlertModel.objects.filter(stock_id__in=low_stocks.keys())
+          alerts_by_stock = {alert.stock_id: alert for alert in existing_alerts}
+
+          now = timezone.now()
+          alerts_to_update = []
+          alerts_to_create = []
+          for stock_id, stock in low_stocks.items():
+               alert = alerts_by_stock.get(stock_id)
+               if alert:
+                    alert.total_stock = stock.total_stock
+                    alert.optimal_stock_quantity = stock.optimal_stock_quantity
+                    alert.updated_at = now
+                    alerts_to_update.append(alert)
+               else:
+                    alerts_to_create.append(LowStockAlertModel(
+                         stock_id=stock_id,
+                         total_stock=stock.total_stock,
+                         optimal_stock_quantity=stock.optimal_stock_quantity,
+                         flagged_at=now,
+                         updated_at=now
+                    ))
+
+          LowStockAlertModel.objects.bulk_update(alerts_to_update, ['total_stock', 'optimal_stock_quantity', 'updated_at'])
+          LowStockAlertModel.objects.bulk_create(alerts_to_create)
+
+          return [alert.stock_id for alert in alerts_to_create]
+
+
+     def get_stock_levels(self) -> list:
+          """(id, total_stock, ingredient name, unit) for every stock, ordered by id."""
+          return list(
+               self.stock.objects
+               .order_by('id')
+               .values_list('id', 'total_stock', 'ingredient__name', 'ingredient__unit')
+          )
+
+
+     def get_daily_out_quantities(self, since: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+          """OUT quantities per stock and day since the given date, as (stock_ids, days, quantities) arrays."""
+          since_datetime = timezone.make_aware(datetime.combine(since, time.min))
+          rows = (
+               StockTransactionModel.objects
+               .filter(transaction_type='OUT', date__gte=since_datetime)
+               .annotate(day=TruncDate('date'))
+               .values('stock_id', 'day')
+               .annotate(quantity=Sum('ingredient_quantity'))
+               .values_list('stock_id', 'day', 'quantity')
+          )
+
+          stock_ids, days, quantities = zip(*rows) if rows else ((), (), ())
+          return (
+               np.array(stock_ids, dtype=np.int64),
+               np.array(days, dtype='datetime64[D]'),
+               np.array(quantities, dtype=np.float64)
+          )
+
+
+     def get_first_movement_dates(self) -> Dict[int, date]:
+          """Local date of the first ledger movement of every stock that has one."""
+          rows = (
+               StockTransactionModel.objects
+               .values('stock_id')
+               .annotate(first_date=Min('date'))
+               .values_list('stock_id', 'first_date')
+          )
+          return {stock_id: timezone.localtime(first_date).date() for stock_id, first_date in rows}
+
+
+     def create_snapshot(self, taken_at: datetime) -> int:
+          snapshot_models = [
+               StockSnapshotModel(stock_id=stock_id, total_stock=total_stock, taken_at=taken_at)
+               for stock_id, total_stock in self.stock.objects.values_list('id', 'total_stock').iterator()
+          ]
+          StockSnapshotModel.objects.bulk_create(snapshot_models, batch_size=1000)
+
+          return len(snapshot_models)
+
+
+     def get_snapshots_as_of(self, as_of: datetime) -> List[StockSnapshot]:
+          """
+          On-hand quantities at the given moment: the latest snapshot taken before it
+          plus the movements dated up to the moment that were posted after the snapshot,
+          so a backdated transaction posted later is still counted.
+          """
+          latest_taken_at = (
+               StockSnapshotModel.objects
+               .filter(taken_at__lte=as_of)
+               .order_by('-taken_at')
+               .values_list('taken_at', flat=True)
+               .first()
+          )
+
+          totals = {}
+          transactions = StockTransactionModel.objects.filter(date__lte=as_of)
+          if latest_taken_at is not None:
+               totals = dict(
+                    StockSnapshotModel.objects
+                    .filter(taken_at=latest_taken_at)
+                    .values_list('stock_id', 'total_stock')
+               )
+               transactions = transactions.filter(recorded_at__gt=latest_taken_at)
+
+          movements = (
+               transactions
+               .values('stock_id')
+               .annotate(movement=Sum(Case(
+                    When(transaction_type='IN', then=F('ingredient_quantity')),
+                    default=-F('ingredient_quantity')
+               )))
+               .values_list('stock_id', 'movement')
+          )
+          for stock_id, movement in movements:
+               totals[stock_id] = totals.get(stock_id, 0) + movement
+
+          stock_models = self.stock.objects.filter(created_at__lte=as_of).select_related('ingredient').order_by('id')
+          return [
+               StockSnapshot(
+                    stock_id=stock_model.id,
+                    total_stock=totals.get(stock_model.id, 0),
+                    as_of=as_of,
+                    ingredient=IngredientMappers.modelToDomain(stock_model.ingredient)
+               )
+               for stock_model in stock_models
+          ]
 
 
      def delete(self, id) -> bool:
@@ -1,8 +1,10 @@
-from restaurant.repository.models.models import TableModel 
+from restaurant.repository.models.models import TableModel, TableGroupModel
 from restaurant.services.domain.table import Table 
 from restaurant.repository.common_repository import CommonRepository
-from typing import List
+from typing import Dict, Iterable, List, Set
 from restaurant.mappers.table_mappers import TableMappers
+from django.db import transaction
+from django.db.models import Case, IntegerField, Q, Subquery, Value, When
 
 class TableRepository(CommonRepository[TableModel]):
     def __init__(self):
@@ -10,8 +12,8 @@ class TableRepository(CommonRepository[TableModel]):
 
 
     def get_all(self) -> List[Table]:
-        model = self.table.objects.all().order_by('number')
-        return TableMappers.to_domain(model)
+        models = self.table.objects.all().order_by('number')
+        return [TableMappers.to_domain(model) for model in models]
 
 
     def get_by_id(self, number):
@@ -20,18 +22,22 @@ class TableRepository(CommonRepository[TableModel]):
             return TableMappers.to_domain(model)
 
 
-    def set_as_available(self, number):
-        table = self.table.objects.filter(number=number).first()
-        if table:
-            table.is_available = True
-            table.save()
+    def get_existing_numbers(self, numbers: Iterable[int]) -> Set[int]:
+        return set(self.table.objects.filter(number__in=list(numbers)).values_list('number', flat=True))
+
+
+    def set_as_available(self, number) -> bool:
+        return self._same_seating(number).update(is_available=True) > 0
+
 
+    def set_as_unavailable(self, number) -> bool:
+        return self._same_seating(number).update(is_available=False) > 0
 
-    def set_as_unavailable(self, number):
-        table = self.table.objects.filter(number=number).first()
-        if table:
-            table.is_available = False
-            table.save()
+
+    def _same_seating(self, number):
+        """The table and, when it is merged, every table in its group; resolved inside the UPDATE itself."""
+        group = self.table.objects.filter(number=number, group__isnull=False).values('group_id')
+        return self.table.objects.filter(Q(number=number) | Q(group_id__in=Subquery(group)))
 
 
     def create(self, table: Table) -> Table:
@@ -44,6 +50,44 @@ class TableRepository(CommonRepository[TableModel]):
         return TableMappers.to_domain(model)
    
 
+    def create_many(self, tables: List[Table]) -> List[Table]:
+        models = self.table.objects.bulk_create([
+            TableModel(number=table.number, capacity=table.capacity, is_available=table.is_available)
+            for table in tables
+        ])
+        return [TableMappers.to_domain(model) for model in models]
+
+
+    def update_capacities(self, capacities: Dict[int, int]) -> int:
+        """New capacity per table number, as a single UPDATE."""
+        capacity = Case(
+            *[When(number=number, then=Value(new_capacity)) for number, new_capacity in capacities.items()],
+            output_field=IntegerField(),
+        )
+        return self.table.objects.filter(number__in=list(capacities)).update(capacity=capacity)
+
+
+    def delete_many(self, numbers: List[int]) -> int:
+        _, deleted = self.table.objects.filter(number__in=numbers).delete()
+        return deleted.get(self.table._meta.label, 0)
+
+
+    def create_group(self, numbers: List[int]) -> int:
+        with transaction.atomic():
+            group = TableGroupModel.objects.create()
+            self.table.objects.filter(number__in=numbers).update(group=group)
+        return group.id
+
+
+    def delete_group(self, group_id: int) -> List[int]:
+        """Split a group; returns the numbers of the tables it held."""
+        with transaction.atomic():
+            numbers = list(self.table.objects.filter(group_id=group_id).order_by('number').values_list('number', flat=True))
+            self.table.objects.filter(group_id=group_id).update(group=None)
+            TableGroupModel.objects.filter(id=group_id).delete()
+        return numbers
+
+
     def update(self, table: Table) -> Table:
         pass
 
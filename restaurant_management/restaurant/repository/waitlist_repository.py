@@ -0,0 +1,67 @@
+from restaurant.services.domain.waitlist import WaitlistEntry
+from restaurant.repository.models.models import WaitlistEntryModel
+from restaurant.mappers.waitlist_mappers import WaitlistMappers
+from restaurant.repository.common_repository import CommonRepository
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+
+class WaitlistRepository(CommonRepository):
+    def __init__(self):
+        self.waitlist_model = WaitlistEntryModel
+
+
+    def get_by_id(self, id: int) -> Optional[WaitlistEntry]:
+        model = self.waitlist_model.objects.select_related('table').filter(id=id).first()
+        return WaitlistMappers.to_domain(model) if model else None
+
+
+    def get_all(self) -> List[WaitlistEntry]:
+        models = self.waitlist_model.objects.select_related('table').order_by('-arrived_at')
+        return [WaitlistMappers.to_domain(model) for model in models]
+
+
+    def get_waiting(self) -> List[WaitlistEntry]:
+        models = self.waitlist_model.objects.filter(status=WaitlistEntry.Status.WAITING).order_by('arrived_at', 'id')
+        return [WaitlistMappers.to_domain(model) for model in models]
+
+
+    def get_seatings_since(self, since: datetime) -> List[Tuple[int, int, datetime]]:
+        """(table id, party size, seated at) of every party seated from the waitlist since the given time."""
+        return list(
+            self.waitlist_model.objects
+            .filter(status=WaitlistEntry.Status.SEATED, seated_at__gte=since, table__isnull=False)
+            .values_list('table_id', 'party_size', 'seated_at')
+        )
+
+
+    def get_best_fit(self, capacity: int) -> Optional[WaitlistEntry]:
+        """Largest waiting party that fits the capacity, earliest arrival first; one probe of waitlist_queue_idx."""
+        model = (
+            self.waitlist_model.objects
+            .filter(status=WaitlistEntry.Status.WAITING, party_size__lte=capacity)
+            .order_by('-party_size', 'arrived_at')
+            .first()
+        )
+        return WaitlistMappers.to_domain(model) if model else None
+
+
+    def create(self, entry: WaitlistEntry) -> WaitlistEntry:
+        model = WaitlistMappers.to_model(entry)
+        model.save()
+        entry.id = model.id
+        return entry
+
+
+    def update(self, entry: WaitlistEntry) -> WaitlistEntry:
+        model = self.waitlist_model.objects.filter(id=entry.id).first()
+        if not model:
+            raise ValueError(f"Waitlist entry with id {entry.id} not found")
+
+        WaitlistMappers.to_model(entry, model).save()
+        return entry
+
+
+    def delete(self, id: int) -> bool:
+        deleted, _ = self.waitlist_model.objects.filter(id=id).delete()
+        return deleted > 0
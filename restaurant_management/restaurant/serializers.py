@@ -13,6 +13,67 @@ class TableSerializer(serializers.Serializer):
     number = serializers.IntegerField()
     capacity = serializers.IntegerField()
     is_available = serializers.BooleanField()
+    group_id = serializers.IntegerField(allow_null=True)
+
+
+class TableBatchSerializer(serializers.Serializer):
+    tables = serializers.ListField(child=TableInsertSerializer(), min_length=1, max_length=200)
+
+
+class TableNumbersSerializer(serializers.Serializer):
+    numbers = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=200)
+
+
+class TableGroupSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    number = serializers.IntegerField(source='lead.number')
+    capacity = serializers.IntegerField()
+    table_numbers = serializers.ListField(child=serializers.IntegerField())
+
+
+class UpcomingReservationSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    customer_number = serializers.IntegerField()
+    reservation_date = serializers.DateTimeField()
+
+
+class TableStateSerializer(serializers.Serializer):
+    number = serializers.IntegerField(source='table.number')
+    capacity = serializers.IntegerField(source='table.capacity')
+    is_available = serializers.BooleanField(source='table.is_available')
+    group_id = serializers.IntegerField(source='table.group_id', allow_null=True)
+    table_numbers = serializers.ListField(child=serializers.IntegerField())
+    open_order_id = serializers.IntegerField(allow_null=True)
+    seated_since = serializers.DateTimeField(allow_null=True)
+    party_size = serializers.IntegerField(allow_null=True)
+    upcoming_reservation = UpcomingReservationSerializer(allow_null=True)
+
+
+class FloorStateSerializer(serializers.Serializer):
+    version = serializers.IntegerField()
+    built_at = serializers.DateTimeField()
+    tables = TableStateSerializer(many=True)
+
+
+class TableTurnoverSerializer(serializers.Serializer):
+    table_number = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    turns = serializers.IntegerField()
+    turns_per_shift = serializers.DictField(child=serializers.FloatField())
+    average_seat_minutes = serializers.FloatField(allow_null=True)
+    revenue = serializers.FloatField()
+    revenue_per_seat_hour = serializers.FloatField()
+
+
+class TableAnalyticsSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    turns_per_shift = serializers.DictField(child=serializers.FloatField())
+    average_seat_minutes = serializers.FloatField(allow_null=True)
+    revenue = serializers.FloatField()
+    revenue_per_seat_hour = serializers.FloatField()
+    tables = TableTurnoverSerializer(many=True)
 
 
 class IngredientInsertSerializer(serializers.ModelSerializer):
@@ -55,6 +116,51 @@ class MenuInsertItemSerializer(serializers.Serializer):
         return value
 
 
+class MenuUpsertItemSerializer(MenuInsertItemSerializer):
+    id = serializers.IntegerField(required=False)
+
+
+class MenuBulkUpsertSerializer(serializers.Serializer):
+    items = serializers.ListField(
+        child=MenuUpsertItemSerializer(),
+        allow_empty=False,
+        max_length=1000
+    )
+
+
+class MenuChangeSetSerializer(serializers.Serializer):
+    created = serializers.SerializerMethodField()
+    updated = serializers.SerializerMethodField()
+    unchanged = serializers.IntegerField()
+
+    def get_created(self, changes):
+        return MenuItemSerializer(changes.created, many=True).data
+
+    def get_updated(self, changes):
+        return MenuItemSerializer(changes.updated, many=True).data
+
+
+class MenuItemPriceSerializer(serializers.Serializer):
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    effective_from = serializers.DateTimeField()
+
+
+class MenuExtraInsertSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    menu_item_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+
+class MenuExtraSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    menu_item_ids = serializers.SerializerMethodField()
+
+    def get_menu_item_ids(self, menu_extra):
+        return sorted(menu_extra.menu_item_ids)
+
+
 class MenuItemSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     name = serializers.CharField()
@@ -84,6 +190,42 @@ class StockSerializer(serializers.Serializer):
     ingredient = IngredientSerializer()
 
 
+class LowStockAlertSerializer(serializers.Serializer):
+    stock_id = serializers.IntegerField()
+    ingredient = IngredientSerializer()
+    total_stock = serializers.IntegerField()
+    optimal_stock_quantity = serializers.IntegerField()
+    flagged_at = serializers.DateTimeField()
+
+
+class StockSnapshotSerializer(serializers.Serializer):
+    stock_id = serializers.IntegerField()
+    ingredient = IngredientSerializer()
+    total_stock = serializers.IntegerField()
+    as_of = serializers.DateTimeField()
+
+
+class StockForecastSerializer(serializers.Serializer):
+    stock_id = serializers.IntegerField()
+    ingredient_name = serializers.CharField()
+    unit = serializers.CharField()
+    total_stock = serializers.IntegerField()
+    average_daily_consumption = serializers.FloatField()
+    weekday_daily_consumption = serializers.ListField(child=serializers.FloatField())
+    days_until_stockout = serializers.IntegerField(allow_null=True)
+    stockout_date = serializers.DateField(allow_null=True)
+
+
+class StockLotSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    stock_id = serializers.IntegerField()
+    ingredient = IngredientSerializer()
+    initial_quantity = serializers.IntegerField()
+    remaining_quantity = serializers.IntegerField()
+    received_at = serializers.DateTimeField()
+    expires_at = serializers.DateTimeField(allow_null=True)
+
+
 class StockTransactionInsertSerializer(serializers.Serializer):
     stock_id = serializers.IntegerField()
     transaction_type = serializers.CharField()
@@ -93,6 +235,40 @@ class StockTransactionInsertSerializer(serializers.Serializer):
     expires_at = serializers.DateTimeField(required=False, allow_null=True)
 
 
+class InventoryCountInsertSerializer(serializers.Serializer):
+    employee_name = serializers.CharField(max_length=255)
+
+
+class InventoryCountLineInsertSerializer(serializers.Serializer):
+    stock_id = serializers.IntegerField()
+    counted_quantity = serializers.IntegerField(min_value=0)
+
+
+class InventoryCountLinesInsertSerializer(serializers.Serializer):
+    lines = serializers.ListField(
+        child=InventoryCountLineInsertSerializer(),
+        required=True,
+        allow_empty=False
+    )
+
+
+class InventoryCountLineSerializer(serializers.Serializer):
+    stock_id = serializers.IntegerField()
+    counted_quantity = serializers.IntegerField()
+    expected_quantity = serializers.IntegerField(allow_null=True)
+    variance = serializers.IntegerField(allow_null=True)
+    counted_at = serializers.DateTimeField()
+
+
+class InventoryCountSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    employee_name = serializers.CharField()
+    status = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    posted_at = serializers.DateTimeField(allow_null=True)
+    lines = InventoryCountLineSerializer(many=True)
+
+
 class ReservationInsertSerializer(serializers.Serializer):
     name = serializers.CharField()
     email = serializers.CharField(required=False, allow_null=True)
@@ -101,6 +277,50 @@ class ReservationInsertSerializer(serializers.Serializer):
     customer_number = serializers.IntegerField()
 
 
+class WaitlistInsertSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    phone_number = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    party_size = serializers.IntegerField(min_value=1)
+
+
+class WaitlistSeatSerializer(serializers.Serializer):
+    table_number = serializers.IntegerField()
+
+
+class WaitlistEntrySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    phone_number = serializers.CharField()
+    party_size = serializers.IntegerField()
+    status = serializers.CharField()
+    table = serializers.IntegerField(source='table.number', allow_null=True)
+    arrived_at = serializers.DateTimeField()
+    seated_at = serializers.DateTimeField(allow_null=True)
+    estimated_wait_minutes = serializers.IntegerField(allow_null=True)
+
+
+class ReservationImportSerializer(serializers.Serializer):
+    reservations = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=1000
+    )
+
+
+class ReservationImportRowSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    status = serializers.CharField()
+    reservation_id = serializers.IntegerField(source='reservation.id', allow_null=True)
+    table = serializers.IntegerField(source='reservation.table.number', allow_null=True)
+    error = serializers.CharField(allow_null=True)
+
+
+class AvailabilitySlotSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    available_tables = serializers.IntegerField()
+    requires_reallocation = serializers.BooleanField()
+
+
 class ReservationSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     name = serializers.CharField()
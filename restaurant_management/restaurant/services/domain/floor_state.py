@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from restaurant.services.domain.reservation import Reservation
+from restaurant.services.domain.table import Table
+from restaurant.services.domain.table_group import TableGroup
+
+
+class TableState:
+    def __init__(
+        self,
+        table: Table,
+        open_order_id: Optional[int] = None,
+        seated_since: Optional[datetime] = None,
+        party_size: Optional[int] = None,
+        upcoming_reservation: Optional[Reservation] = None,
+        table_numbers: Optional[List[int]] = None
+    ):
+        self.table = table
+        self.table_numbers = table_numbers or [table.number]
+        self.open_order_id = open_order_id
+        self.seated_since = seated_since
+        self.party_size = party_size
+        self.upcoming_reservation = upcoming_reservation
+
+    def __str__(self):
+        return f'{self.table} - {"free" if self.table.is_available else "occupied"}'
+
+
+class FloorState:
+    """
+    What the host stand shows for every table at one floor version: whether it
+    is free, the open order and since when the party sits there, how many they
+    are, and the next booking still expected at that table today. Merged
+    tables show as their group, which any member number also resolves to.
+    """
+    # A seating (waitlist or attended reservation) belongs to the open order started within this window of it
+    SEATING_WINDOW = timedelta(minutes=30)
+
+    def __init__(self, version: int, tables: List[TableState], built_at: datetime, layout: Optional[List[Table]] = None):
+        self.version = version
+        self.tables = tables
+        self.built_at = built_at
+        # Every physical table, merged or not
+        self.layout = layout if layout is not None else [state.table for state in tables]
+        self._by_number = {number: state for state in tables for number in state.table_numbers}
+
+    def __str__(self):
+        return f'Floor v{self.version} ({len(self.tables)} tables)'
+
+
+    def get(self, number: int) -> Optional[TableState]:
+        return self._by_number.get(number)
+
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        tables: Iterable[Table],
+        open_orders: Dict[int, Tuple[int, datetime]],
+        seatings: Iterable[Tuple[int, int, datetime]],
+        reservations: Iterable[Reservation],
+        now: datetime
+    ) -> "FloorState":
+        """
+        open_orders maps table id to (order id, started at); seatings are
+        (table id, party size, seated at) from the waitlist; reservations are
+        today's, in time order. Grouped tables are folded into one state per
+        group, keyed by its lead like its orders and bookings.
+        """
+        tables = list(tables)
+        members = {group.lead.number: group.table_numbers for group in TableGroup.groups_of(tables)}
+
+        seatings_by_table: Dict[int, List[Tuple[datetime, int]]] = {}
+        for table_id, party_size, seated_at in seatings:
+            seatings_by_table.setdefault(table_id, []).append((seated_at, party_size))
+
+        upcoming: Dict[int, Reservation] = {}
+        for reservation in reservations:
+            if reservation.table is None:
+                continue
+            if reservation.status == Reservation.Status.ATTENDED:
+                seatings_by_table.setdefault(reservation.table.id, []).append((reservation.reservation_date, reservation.customer_number))
+            elif reservation.status == Reservation.Status.BOOKED and reservation.reservation_date >= now - Reservation.NO_SHOW_GRACE:
+                upcoming.setdefault(reservation.table.id, reservation)
+
+        states = []
+        for table in TableGroup.merge_floor(tables):
+            state = TableState(table, upcoming_reservation=upcoming.get(table.id), table_numbers=members.get(table.number))
+
+            if table.id in open_orders:
+                state.open_order_id, started_at = open_orders[table.id]
+                state.seated_since = started_at
+
+                matching = [
+                    (seated_at, party_size) for seated_at, party_size in seatings_by_table.get(table.id, [])
+                    if abs(seated_at - started_at) <= cls.SEATING_WINDOW
+                ]
+                if matching:
+                    seated_at, state.party_size = max(matching)
+                    state.seated_since = min(seated_at, started_at)
+
+            states.append(state)
+
+        return cls(version, states, now, layout=tables)
@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+from typing import List, Optional
+import numpy as np
+
+
+class StockForecast:
+    HISTORY_DAYS = 365
+    MOVING_AVERAGE_DAYS = 28
+    HORIZON_DAYS = 90
+
+    def __init__(
+        self,
+        stock_id: int,
+        ingredient_name: str,
+        unit: str,
+        total_stock: int,
+        average_daily_consumption: float,
+        weekday_daily_consumption: List[float],
+        days_until_stockout: Optional[int],
+        forecast_date: date
+    ):
+        self.stock_id = stock_id
+        self.ingredient_name = ingredient_name
+        self.unit = unit
+        self.total_stock = total_stock
+        self.average_daily_consumption = average_daily_consumption
+        self.weekday_daily_consumption = weekday_daily_consumption
+        self.days_until_stockout = days_until_stockout
+        self.forecast_date = forecast_date
+
+
+    def __str__(self):
+        return f'{self.ingredient_name} - {self.days_until_stockout} days left'
+
+
+    @property
+    def stockout_date(self) -> Optional[date]:
+        if self.days_until_stockout is None:
+            return None
+        return self.forecast_date + timedelta(days=self.days_until_stockout)
+
+
+class ConsumptionForecaster:
+    """
+    Projects stockouts for every stock at once from a matrix of daily OUT
+    quantities (one row per stock, one column per day of history).
+    """
+    def __init__(
+        self,
+        history_days: int = StockForecast.HISTORY_DAYS,
+        moving_average_days: int = StockForecast.MOVING_AVERAGE_DAYS,
+        horizon_days: int = StockForecast.HORIZON_DAYS
+    ):
+        self.history_days = history_days
+        self.moving_average_days = moving_average_days
+        self.horizon_days = horizon_days
+
+
+    def history_start(self, today: date) -> date:
+        return today - timedelta(days=self.history_days)
+
+
+    def daily_matrix(self, stock_ids: np.ndarray, out_stock_ids: np.ndarray, out_days: np.ndarray, out_quantities: np.ndarray, today: date) -> np.ndarray:
+        """
+        Scatter (stock, day, quantity) rows into a stocks x days matrix.
+        stock_ids must be sorted ascending; today is left out as it is still open.
+        """
+        start = np.datetime64(self.history_start(today), 'D')
+        columns = (out_days - start).astype(np.int64)
+        in_range = (columns >= 0) & (columns < self.history_days)
+
+        # Rows of stocks missing from stock_ids (created after the levels were read) are dropped
+        rows = np.clip(np.searchsorted(stock_ids, out_stock_ids), 0, max(len(stock_ids) - 1, 0))
+        known = (stock_ids[rows] == out_stock_ids) if len(stock_ids) else np.zeros(len(out_stock_ids), dtype=bool)
+        kept = in_range & known
+
+        daily = np.zeros((len(stock_ids), self.history_days))
+        np.add.at(daily, (rows[kept], columns[kept]), out_quantities[kept])
+        return daily
+
+
+    def active_days(self, first_movement_days: np.ndarray, today: date) -> np.ndarray:
+        """Closed days since each stock's first movement (NaT for none), capped to the moving-average window."""
+        days = (np.datetime64(today, 'D') - first_movement_days).astype('timedelta64[D]').astype(np.float64)
+        days = np.where(np.isnat(first_movement_days), 0, days)
+        return np.clip(days, 1, self.moving_average_days)
+
+
+    def weekday_rates(self, daily: np.ndarray, today: date, active_days: Optional[np.ndarray] = None):
+        """
+        Moving-average daily rate and per-weekday rates (Monday first) for every row.
+        active_days is the window each row has existed for, so a stock younger
+        than the moving average is not averaged over days it did not exist.
+        """
+        if active_days is None:
+            active_days = np.full(daily.shape[0], float(self.moving_average_days))
+        average = daily[:, -self.moving_average_days:].sum(axis=1) / active_days
+
+        start_weekday = self.history_start(today).weekday()
+        weekdays = (np.arange(self.history_days) + start_weekday) % 7
+        weekday_matrix = np.eye(7)[weekdays]
+
+        weekday_means = (daily @ weekday_matrix) / weekday_matrix.sum(axis=0)
+        overall_means = daily.mean(axis=1, keepdims=True)
+        seasonal_factors = np.divide(
+            weekday_means,
+            overall_means,
+            out=np.ones_like(weekday_means),
+            where=overall_means > 0
+        )
+
+        return average, average[:, None] * seasonal_factors
+
+
+    def days_until_stockout(self, total_stocks: np.ndarray, weekday_rates: np.ndarray, today: date) -> np.ndarray:
+        """Days from today until the cumulative forecast reaches the stock on hand, -1 if beyond the horizon."""
+        future_weekdays = (today.weekday() + 1 + np.arange(self.horizon_days)) % 7
+        cumulative = np.cumsum(weekday_rates[:, future_weekdays], axis=1)
+
+        reached = cumulative >= total_stocks[:, None]
+        days = np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, -1)
+        return np.where(total_stocks <= 0, 0, days)
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import List, Optional
+from restaurant.services.domain.stock import Stock, StockTransaction
+from restaurant.utils.result import Result
+
+
+class InventoryCountLine:
+    def __init__(
+        self,
+        stock_id: int,
+        counted_quantity: int,
+        expected_quantity: Optional[int] = None,
+        variance: Optional[int] = None,
+        optimal_stock_quantity: Optional[int] = None,
+        counted_at: Optional[datetime] = None,
+        id: Optional[int] = None
+    ):
+        self.id = id
+        self.stock_id = stock_id
+        self.counted_quantity = counted_quantity
+        self.expected_quantity = expected_quantity
+        self.variance = variance
+        self.optimal_stock_quantity = optimal_stock_quantity
+        self.counted_at = counted_at or datetime.now()
+
+
+    def __str__(self):
+        return f'Stock {self.stock_id} - counted {self.counted_quantity}'
+
+
+    def compute_variance(self, expected_quantity: int) -> int:
+        self.expected_quantity = expected_quantity
+        self.variance = self.counted_quantity - expected_quantity
+        return self.variance
+
+
+    def to_adjustment(self, employee_name: str, date: datetime) -> Optional[StockTransaction]:
+        """The transaction that moves the stock from the expected to the counted quantity, if any."""
+        if not self.variance:
+            return None
+
+        stock = Stock(
+            id=self.stock_id,
+            ingredient=None,
+            total_stock=self.counted_quantity,
+            optimal_stock_quantity=self.optimal_stock_quantity
+        )
+
+        return StockTransaction(
+            ingredient_quantity=abs(self.variance),
+            date=date,
+            employee_name=employee_name,
+            transaction_type='IN' if self.variance > 0 else 'OUT',
+            stock=stock
+        )
+
+
+class InventoryCount:
+    class Status:
+        OPEN = 'OPEN'
+        POSTED = 'POSTED'
+
+        CHOICES = [
+            (OPEN, 'Open'),
+            (POSTED, 'Posted'),
+        ]
+
+    def __init__(
+        self,
+        employee_name: str,
+        status: str = Status.OPEN,
+        lines: Optional[List[InventoryCountLine]] = None,
+        created_at: Optional[datetime] = None,
+        posted_at: Optional[datetime] = None,
+        id: Optional[int] = None
+    ):
+        self.id = id
+        self.employee_name = employee_name
+        self.status = status
+        self.lines = lines or []
+        self.created_at = created_at or datetime.now()
+        self.posted_at = posted_at
+
+
+    def __str__(self):
+        return f'Count {self.id} - {self.status}'
+
+
+    def validate_open(self) -> Result:
+        if self.status != self.Status.OPEN:
+            return Result.error(f"Count {self.id} is already {self.status.lower()}")
+
+        return Result.success(None)
+
+
+    def validate_posting(self) -> Result:
+        open_result = self.validate_open()
+        if open_result.is_failure():
+            return open_result
+
+        if not self.lines:
+            return Result.error(f"Count {self.id} has no counted stocks to post")
+
+        return Result.success(None)
+
+
+    def build_adjustments(self, date: datetime) -> List[StockTransaction]:
+        adjustments = [line.to_adjustment(self.employee_name, date) for line in self.lines]
+        return [adjustment for adjustment in adjustments if adjustment is not None]
+
+
+    def mark_posted(self, posted_at: datetime):
+        self.status = self.Status.POSTED
+        self.posted_at = posted_at
@@ -0,0 +1,95 @@
+import copy
+from decimal import Decimal
+from typing import Iterable, List, Tuple
+from restaurant.services.domain.menu_item import MenuItem
+from restaurant.services.domain.menu_search import normalize_term
+
+
+class MenuChangeSet:
+    def __init__(self):
+        self.created: List[MenuItem] = []
+        self.updated: List[MenuItem] = []
+        self.unchanged = 0
+        self.errors: List[Tuple[int, str]] = []
+
+
+    def __str__(self):
+        return f'{len(self.created)} created, {len(self.updated)} updated, {self.unchanged} unchanged'
+
+
+    def has_changes(self) -> bool:
+        return bool(self.created or self.updated)
+
+
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+class MenuCatalogDiff:
+    """
+    Compares an incoming menu against the current catalog. Incoming items are
+    matched by id when they carry one, otherwise by name; matched items that
+    differ become updates, the rest become creates. Prices go through
+    MenuItem.update_price so bulk writes keep the same validation.
+    """
+    @staticmethod
+    def diff(current: Iterable[MenuItem], incoming: List[MenuItem]) -> MenuChangeSet:
+        current_by_id = {item.id: item for item in current}
+        current_by_name = {normalize_term(item.name): item for item in current_by_id.values()}
+
+        changes = MenuChangeSet()
+        seen = set()
+        for row, item in enumerate(incoming):
+            if item.id is not None:
+                existing = current_by_id.get(item.id)
+                if existing is None:
+                    changes.errors.append((row, f'Menu Item with ID [{item.id}] not found'))
+                    continue
+            else:
+                existing = current_by_name.get(normalize_term(item.name))
+
+            key = existing.id if existing else normalize_term(item.name)
+            if key in seen:
+                changes.errors.append((row, f"Menu Item '{item.name}' appears more than once"))
+                continue
+            seen.add(key)
+
+            try:
+                if existing is None:
+                    changes.created.append(MenuCatalogDiff._new_item(item))
+                elif MenuCatalogDiff._differs(existing, item):
+                    changes.updated.append(MenuCatalogDiff._updated_item(existing, item))
+                else:
+                    changes.unchanged += 1
+            except ValueError as e:
+                changes.errors.append((row, str(e)))
+
+        return changes
+
+
+    @staticmethod
+    def _differs(existing: MenuItem, item: MenuItem) -> bool:
+        return (
+            existing.name != item.name
+            or Decimal(existing.price) != Decimal(item.price)
+            or existing.category != item.category
+            or (existing.description or '') != (item.description or '')
+        )
+
+
+    @staticmethod
+    def _new_item(item: MenuItem) -> MenuItem:
+        new_item = MenuItem(id=None, name=item.name, price=item.price, category=item.category, description=item.description)
+        new_item.update_price(Decimal(item.price))
+        return new_item
+
+
+    @staticmethod
+    def _updated_item(existing: MenuItem, item: MenuItem) -> MenuItem:
+        # Snapshot items are shared between requests, so changes go on a copy
+        updated = copy.copy(existing)
+        updated.update_price(Decimal(item.price))
+        updated.name = item.name
+        updated.category = item.category
+        updated.description = item.description
+        return updated
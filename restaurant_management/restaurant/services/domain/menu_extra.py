@@ -0,0 +1,33 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Optional
+
+
+class MenuExtra:
+    def __init__(
+        self,
+        id: Optional[int],
+        name: str,
+        price: Decimal,
+        menu_item_ids: Iterable[int] = (),
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.menu_item_ids = frozenset(menu_item_ids)
+        self.created_at = created_at or datetime.now()
+        self.updated_at = updated_at or datetime.now()
+
+    def __str__(self):
+        return f'{self.name} (+{self.price})'
+
+    def is_allowed_for(self, menu_item_id: int) -> bool:
+        return menu_item_id in self.menu_item_ids
+
+    def update_price(self, new_price: Decimal):
+        if new_price < 0:
+            raise ValueError("Extra price can't be negative.")
+        self.price = new_price
+        self.updated_at = datetime.now()
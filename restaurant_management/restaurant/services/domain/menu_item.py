@@ -50,3 +50,13 @@ class MenuItem:
 
     def is_meal(self) -> bool:
         return self.category == CategoryEnum.MEALS
+
+
+class MenuItemPrice:
+    def __init__(self, menu_item_id: int, price: Decimal, effective_from: datetime):
+        self.menu_item_id = menu_item_id
+        self.price = price
+        self.effective_from = effective_from
+
+    def __str__(self):
+        return f'{self.price} from {self.effective_from}'
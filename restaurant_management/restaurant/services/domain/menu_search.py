@@ -0,0 +1,87 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+from restaurant.services.domain.menu_item import MenuItem, CategoryEnum
+
+# Menu sections in the order the menu is printed; ties in a search are broken by it
+CATEGORY_RANK = {category.value: rank for rank, category in enumerate(CategoryEnum)}
+# Python spelling of the PostgreSQL \m word-start constraint
+WORD_START = r'(?<!\w)(?=\w)'
+
+
+def normalize_term(text: str) -> str:
+    return ' '.join((text or '').lower().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of every word, padded the way pg_trgm pads them, so both search paths agree."""
+    grams = set()
+    for word in re.findall(r'\w+', normalize_term(text)):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class MenuMatch:
+    """How a name matched the query: lower kinds rank first."""
+    NAME_PREFIX = 0
+    WORD_PREFIX = 1
+    SIMILAR = 2
+
+
+class MenuSearchIndex:
+    """
+    In-memory trigram index over the catalog, used where pg_trgm is not
+    available, with the same rules as MenuItemRepository.search. Items whose
+    name starts with the query come first, then items with a word starting
+    with it, then names containing it anywhere or sharing enough of the
+    query's trigrams (the share of query trigrams found, close to pg_trgm's
+    word similarity); ties go by menu section and name.
+    """
+    WORD_SIMILARITY_THRESHOLD = 0.6
+
+    def __init__(self, items: Iterable[MenuItem]):
+        self.items: Dict[int, MenuItem] = {}
+        self.names: Dict[int, str] = {}
+        self.postings: Dict[str, Set[int]] = {}
+
+        for item in items:
+            self.items[item.id] = item
+            self.names[item.id] = normalize_term(item.name)
+            for gram in trigrams(item.name):
+                self.postings.setdefault(gram, set()).add(item.id)
+
+
+    def search(self, term: str, limit: int) -> List[MenuItem]:
+        query = normalize_term(term)
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+
+        # Substrings too short to share a trigram are still infix matches, as with icontains
+        candidates = set(shared) | {item_id for item_id, name in self.names.items() if query in name}
+        word_prefix = re.compile(WORD_START + re.escape(query))
+
+        ranked = []
+        for item_id in candidates:
+            name = self.names[item_id]
+            similarity = shared[item_id] / len(query_grams)
+
+            if name.startswith(query):
+                match = MenuMatch.NAME_PREFIX
+            elif word_prefix.search(name):
+                match = MenuMatch.WORD_PREFIX
+            elif query in name or similarity >= self.WORD_SIMILARITY_THRESHOLD:
+                match = MenuMatch.SIMILAR
+            else:
+                continue
+
+            item = self.items[item_id]
+            ranked.append((match, -similarity, CATEGORY_RANK.get(item.category, len(CATEGORY_RANK)), name, item_id))
+
+        ranked.sort()
+        return [self.items[entry[-1]] for entry in ranked[:limit]]
@@ -0,0 +1,91 @@
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from typing import Callable, Iterable, List, Optional
+from restaurant.services.domain.menu_item import MenuItem
+from restaurant.services.domain.menu_extra import MenuExtra
+from restaurant.services.domain.menu_search import MenuSearchIndex
+
+
+class MenuSnapshot:
+    """
+    Read-only view of one catalog version: items by id, items by category, the
+    serialized listing of every category, a search index and the priced extras
+    allowed on each item, all computed once at build time.
+    """
+    def __init__(
+        self,
+        version: int,
+        items: Iterable[MenuItem],
+        serialize: Callable[[List[MenuItem]], list],
+        extras: Iterable[MenuExtra] = ()
+    ):
+        self.version = version
+        self.items = tuple(sorted(items, key=lambda item: item.id))
+        self.items_by_id = MappingProxyType({item.id: item for item in self.items})
+
+        by_category = {}
+        for item in self.items:
+            by_category.setdefault(item.category, []).append(item)
+
+        self.items_by_category = MappingProxyType({category: tuple(items) for category, items in by_category.items()})
+        self.serialized_items = serialize(list(self.items))
+        self.serialized_by_category = MappingProxyType({
+            category: serialize(list(items)) for category, items in self.items_by_category.items()
+        })
+        self.search_index = MenuSearchIndex(self.items)
+
+        self.extras = tuple(sorted(extras, key=lambda extra: extra.id))
+        self.extras_by_id = MappingProxyType({extra.id: extra for extra in self.extras})
+        extras_by_menu_item = {}
+        for extra in self.extras:
+            for menu_item_id in extra.menu_item_ids:
+                extras_by_menu_item.setdefault(menu_item_id, []).append(extra)
+        self.extras_by_menu_item = MappingProxyType({item_id: tuple(extras) for item_id, extras in extras_by_menu_item.items()})
+
+
+    def __str__(self):
+        return f'Menu v{self.version} ({len(self.items)} items)'
+
+
+class MenuSnapshotHolder:
+    """
+    Per-process slot for the current MenuSnapshot. A new snapshot is built and
+    swapped in as a whole when the catalog version moves; readers always see
+    either the old or the new one. The shared version is read at most every
+    VERSION_CHECK_SECONDS unless the caller already knows it.
+    """
+    VERSION_CHECK_SECONDS = 5
+
+    def __init__(self, clock: Callable[[], float] = monotonic):
+        self.clock = clock
+        self.snapshot: Optional[MenuSnapshot] = None
+        self.checked_at = 0.0
+        self._lock = Lock()
+
+
+    def get(
+        self,
+        current_version: Callable[[], int],
+        build: Callable[[int], MenuSnapshot],
+        version: Optional[int] = None
+    ) -> MenuSnapshot:
+        snapshot = self.snapshot
+        if version is None:
+            if snapshot is not None and self.clock() - self.checked_at < self.VERSION_CHECK_SECONDS:
+                return snapshot
+            version = current_version()
+            self.checked_at = self.clock()
+
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            if self.snapshot is None or self.snapshot.version != version:
+                self.snapshot = build(version)
+            return self.snapshot
+
+
+    def invalidate(self):
+        """Force a version check on the next read, after a write from this process."""
+        self.checked_at = 0.0
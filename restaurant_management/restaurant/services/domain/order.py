@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 from pickle import TRUE
 from typing import List, Optional
 from restaurant.utils.exceptions import DomainException
@@ -10,7 +11,7 @@ class OrderStatus:
 
 
 class OrderItem:
-    def __init__(self, menu_item, added_at = datetime.now(), notes=None, quantity=1, id=None, menu_extra=None, is_delivered=False):
+    def __init__(self, menu_item, added_at = datetime.now(), notes=None, quantity=1, id=None, menu_extra=None, is_delivered=False, unit_price=None, extra_price=None):
         self.id = id
         self.menu_item = menu_item
         self.quantity = quantity
@@ -18,6 +19,9 @@ class OrderItem:
         self.menu_extra = menu_extra
         self.is_delivered = is_delivered
         self.added_at = added_at
+        # New items take the current prices; stored items keep the ones captured when they were added
+        self.unit_price = Decimal(unit_price if unit_price is not None else menu_item.price)
+        self.extra_price = Decimal(extra_price if extra_price is not None else (menu_extra.price if menu_extra else 0))
 
     def __str__(self):
         return f"{self.menu_item.name}"
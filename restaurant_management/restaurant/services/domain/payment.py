@@ -26,13 +26,13 @@ class PaymentItem:
         self.extra_item_price = extra_item_price
     
     def increase_extra_item_price(self):
-        self.price += self.menu_item_extra.price
+        self.extra_item_price = self.menu_extra_item.price
 
     def increase_item_quantity(self, quantity):
         self.quantity += quantity
 
     def calculate_total(self):
-        self.total = Decimal(self.quantity) * Decimal(self.price)
+        self.total = Decimal(self.quantity) * (Decimal(self.price) + Decimal(self.extra_item_price))
 
 
 class Payment:
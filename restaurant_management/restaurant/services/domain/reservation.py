@@ -19,6 +19,10 @@ class Reservation:
             (CANCELLED, 'Cancelled'),
         ]
 
+    # Statuses that still occupy the table around the reservation time
+    BLOCKING_STATUSES = (Status.BOOKED, Status.ATTENDED)
+    NO_SHOW_GRACE = timedelta(minutes=30)
+
     def __init__(
         self,
         name: str,
@@ -67,7 +71,26 @@ class Reservation:
         self.status = self.Status.NOT_ATTENDED
 
 
-    def assing_table(self, table : Table):
+    @staticmethod
+    def normalize_name(name: Optional[str]) -> str:
+        return ' '.join((name or '').lower().split())
+
+
+    @staticmethod
+    def normalize_email(email: Optional[str]) -> str:
+        return (email or '').strip().lower()
+
+
+    @staticmethod
+    def normalize_phone(phone_number: Optional[str]) -> str:
+        return ''.join(char for char in (phone_number or '') if char.isdigit())
+
+
+    def blocks_table(self) -> bool:
+        return self.status in self.BLOCKING_STATUSES
+
+
+    def assign_table(self, table : Table):
         self.table = table
 
 
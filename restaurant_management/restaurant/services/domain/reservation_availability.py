@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+from restaurant.services.domain.table import Table
+from restaurant.services.domain.reservation_timeline import ReservationTimeline
+
+
+class AvailabilitySlot:
+    def __init__(self, start: datetime, available_tables: int, requires_reallocation: bool = False):
+        self.start = start
+        self.available_tables = available_tables
+        # No table is free as booked, but moving the day's bookings would seat the party
+        self.requires_reallocation = requires_reallocation
+
+
+    def __str__(self):
+        return f'{self.start} - {self.available_tables} tables'
+
+
+class AvailabilityGrid:
+    """
+    Slot x table occupancy for one service day. Each table keeps a bitmask
+    with one bit per slot, set when a reservation on that table falls within
+    the conflict window of the slot start.
+    """
+    OPENING_HOUR = 12  # Same bounds as Reservation.validate_hour
+    CLOSING_HOUR = 22
+    SLOT_LENGTH = timedelta(minutes=30)
+
+    def __init__(self, opening: datetime, capacities: Dict[int, int], blocked: Dict[int, int]):
+        self.opening = opening
+        self.capacities = capacities
+        self.blocked = blocked
+
+
+    @classmethod
+    def slot_count(cls) -> int:
+        return (cls.CLOSING_HOUR - cls.OPENING_HOUR) * timedelta(hours=1) // cls.SLOT_LENGTH
+
+
+    @classmethod
+    def build(
+        cls,
+        opening: datetime,
+        tables: List[Table],
+        reservation_times: Iterable[Tuple[int, datetime]],
+        window: timedelta = ReservationTimeline.CONFLICT_WINDOW
+    ) -> "AvailabilityGrid":
+        last_slot = cls.slot_count() - 1
+        blocked = {table.id: 0 for table in tables}
+
+        for table_id, reservation_date in reservation_times:
+            if table_id not in blocked:
+                continue
+
+            first = max(0, -((opening - reservation_date + window) // cls.SLOT_LENGTH))
+            last = min(last_slot, (reservation_date + window - opening) // cls.SLOT_LENGTH)
+            if first <= last:
+                blocked[table_id] |= ((1 << (last - first + 1)) - 1) << first
+
+        capacities = {table.id: table.capacity for table in tables}
+        return cls(opening, capacities, blocked)
+
+
+    def slot_starts(self) -> List[datetime]:
+        return [self.opening + slot * self.SLOT_LENGTH for slot in range(self.slot_count())]
+
+
+    def free_slots(self, party_size: int) -> List[AvailabilitySlot]:
+        masks = [self.blocked[table_id] for table_id, capacity in self.capacities.items() if capacity >= party_size]
+
+        slots = []
+        for slot in range(self.slot_count()):
+            bit = 1 << slot
+            available_tables = sum(1 for mask in masks if not mask & bit)
+            if available_tables:
+                slots.append(AvailabilitySlot(self.opening + slot * self.SLOT_LENGTH, available_tables))
+
+        return slots
@@ -0,0 +1,68 @@
+from datetime import date
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional
+from restaurant.services.domain.reservation import Reservation
+
+
+class DailyReservationBook:
+    """
+    One day of the reservation book held in process memory. It is loaded once
+    per day, patched in place from reservation write notifications, and served
+    without a round trip. Writes made by other processes are picked up by
+    comparing the day's cache generation at most every STALENESS_CHECK_SECONDS.
+    """
+    STALENESS_CHECK_SECONDS = 5
+
+    def __init__(self, clock: Callable[[], float] = monotonic):
+        self.clock = clock
+        self.day: Optional[date] = None
+        self.generation: Optional[int] = None
+        self.checked_at = 0.0
+        self._reservations: Dict[int, Reservation] = {}
+        self._lock = Lock()
+
+
+    def get(
+        self,
+        today: date,
+        load: Callable[[date], List[Reservation]],
+        current_generation: Callable[[date], int]
+    ) -> List[Reservation]:
+        with self._lock:
+            if self.day != today:
+                self._reload(today, load, current_generation)
+            elif self.clock() - self.checked_at >= self.STALENESS_CHECK_SECONDS:
+                self.checked_at = self.clock()
+                if current_generation(today) != self.generation:
+                    self._reload(today, load, current_generation)
+
+            return sorted(self._reservations.values(), key=lambda reservation: (reservation.reservation_date, reservation.id))
+
+
+    def apply(self, reservations: Iterable[Reservation], reservation_day: Callable[[Reservation], date], deleted: bool = False):
+        """Patch the book with reservations written by this process; other days are ignored."""
+        with self._lock:
+            if self.day is None:
+                return
+
+            for reservation in reservations:
+                if deleted or reservation_day(reservation) != self.day:
+                    self._reservations.pop(reservation.id, None)
+                else:
+                    self._reservations[reservation.id] = reservation
+
+
+    def clear(self):
+        with self._lock:
+            self.day = None
+            self.generation = None
+            self._reservations = {}
+
+
+    def _reload(self, today: date, load: Callable[[date], List[Reservation]], current_generation: Callable[[date], int]):
+        # Read the generation first so a write racing with the load triggers another reload
+        self.generation = current_generation(today)
+        self._reservations = {reservation.id: reservation for reservation in load(today)}
+        self.day = today
+        self.checked_at = self.clock()
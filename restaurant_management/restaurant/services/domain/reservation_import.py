@@ -0,0 +1,44 @@
+from typing import Optional
+from restaurant.services.domain.reservation import Reservation
+
+
+class ReservationImportRow:
+    class Status:
+        PENDING = 'PENDING'
+        CREATED = 'CREATED'
+        REJECTED = 'REJECTED'
+
+    def __init__(
+        self,
+        row: int,
+        reservation: Optional[Reservation] = None,
+        status: str = Status.PENDING,
+        error: Optional[str] = None
+    ):
+        self.row = row
+        self.reservation = reservation
+        self.status = status
+        self.error = error
+
+
+    def __str__(self):
+        return f'Row {self.row} - {self.status}'
+
+
+    @classmethod
+    def rejected(cls, row: int, error: str) -> "ReservationImportRow":
+        return cls(row=row, status=cls.Status.REJECTED, error=error)
+
+
+    def is_pending(self) -> bool:
+        return self.status == self.Status.PENDING
+
+
+    def reject(self, error: str):
+        self.status = self.Status.REJECTED
+        self.error = error
+
+
+    def mark_created(self, reservation: Reservation):
+        self.status = self.Status.CREATED
+        self.reservation = reservation
@@ -0,0 +1,62 @@
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from restaurant.services.domain.table import Table
+
+
+class ReservationTimeline:
+    """
+    Reservation start times per table, kept sorted so a conflict check is a
+    bisect instead of a query. Two reservations on the same table conflict
+    when they start within CONFLICT_WINDOW of each other (bounds included).
+    """
+    CONFLICT_WINDOW = timedelta(hours=2)
+
+    def __init__(self, window: timedelta = CONFLICT_WINDOW):
+        self.window = window
+        self._starts: Dict[int, List[datetime]] = {}
+
+
+    @staticmethod
+    def from_reservations(reservation_times: Iterable[Tuple[int, datetime]], window: timedelta = CONFLICT_WINDOW) -> "ReservationTimeline":
+        timeline = ReservationTimeline(window)
+        for table_id, reservation_date in reservation_times:
+            timeline._starts.setdefault(table_id, []).append(reservation_date)
+
+        for starts in timeline._starts.values():
+            starts.sort()
+
+        return timeline
+
+
+    def add(self, table_id: int, reservation_date: datetime):
+        insort(self._starts.setdefault(table_id, []), reservation_date)
+
+
+    def remove(self, table_id: int, reservation_date: datetime):
+        starts = self._starts.get(table_id, [])
+        index = bisect_left(starts, reservation_date)
+        if index < len(starts) and starts[index] == reservation_date:
+            del starts[index]
+
+
+    def is_free(self, table_id: int, reservation_date: datetime) -> bool:
+        starts = self._starts.get(table_id, [])
+        index = bisect_left(starts, reservation_date - self.window)
+        return index == len(starts) or starts[index] > reservation_date + self.window
+
+
+    def next_start(self, table_id: int, since: datetime) -> Optional[datetime]:
+        """Start of the first reservation on the table at or after since."""
+        starts = self._starts.get(table_id, [])
+        index = bisect_left(starts, since)
+        return starts[index] if index < len(starts) else None
+
+
+    def first_free_table(self, tables: List[Table], reservation_date: datetime) -> Optional[Table]:
+        """First table, in the given order, with no reservation inside the conflict window."""
+        for table in tables:
+            if self.is_free(table.id, reservation_date):
+                return table
+
+        return None
@@ -1,8 +1,11 @@
 from datetime import datetime
-from datetime import datetime
-from typing import List
+from decimal import Decimal
+from typing import List, Optional
 
 class Stock:
+    # Share of the optimal quantity under which a stock shows up as low
+    LOW_STOCK_RATIO = Decimal('0.25')
+
     def __init__(self, 
                  id, 
                  ingredient, 
@@ -40,7 +43,23 @@ class Stock:
 
         self.stock_transactions.append(transaction)
 
-        self.stock_transactions.append(transaction)
+
+    def consume_lots(self, lots: List["StockLot"], ingredient_quantity: int) -> List["StockLot"]:
+        """
+        Withdraw the quantity from the given open lots, oldest first.
+        Returns the lots that were touched so only those need to be persisted.
+        """
+        consumed_lots = []
+        pending_quantity = ingredient_quantity
+
+        for lot in sorted(lots, key=lambda lot: (lot.received_at, lot.id or 0)):
+            if pending_quantity <= 0:
+                break
+
+            pending_quantity -= lot.consume(pending_quantity)
+            consumed_lots.append(lot)
+
+        return consumed_lots
     
 
     def is_stock_available(self, quantity: int) -> bool:
@@ -57,6 +76,10 @@ class Stock:
         self.updated_at = datetime.now()
 
 
+    def is_low_stock(self) -> bool:
+        return self.total_stock < self.optimal_stock_quantity * self.LOW_STOCK_RATIO
+
+
     def is_out_valid(self, ingredient_quantity: int) -> bool:
         """Check if enough stock is available to withdraw."""
         return self.total_stock >= ingredient_quantity
@@ -86,8 +109,10 @@ class StockTransaction:
         employee_name : str,
         transaction_type: str, 
         expires_at=None,  
-        stock=None  
+        stock=None,
+        id=None
     ):
+        self.id = id
         self.ingredient_quantity = ingredient_quantity
         self.transaction_type = transaction_type
         self.date = date
@@ -100,3 +125,96 @@ class StockTransaction:
         return f'{self.transaction_type} - {self.ingredient_quantity}'
 
 
+    def is_stock_in(self) -> bool:
+        return self.transaction_type == 'IN'
+
+
+class StockLot:
+    def __init__(
+        self,
+        stock_id: int,
+        initial_quantity: int,
+        remaining_quantity: int,
+        received_at: datetime,
+        expires_at: Optional[datetime] = None,
+        transaction_id: Optional[int] = None,
+        ingredient=None,
+        id: Optional[int] = None
+    ):
+        self.id = id
+        self.stock_id = stock_id
+        self.transaction_id = transaction_id
+        self.initial_quantity = initial_quantity
+        self.remaining_quantity = remaining_quantity
+        self.received_at = received_at
+        self.expires_at = expires_at
+        self.ingredient = ingredient
+
+
+    def __str__(self):
+        return f'Lot {self.id} - {self.remaining_quantity}/{self.initial_quantity}'
+
+
+    @staticmethod
+    def from_transaction(stock: Stock, transaction: StockTransaction, received_at: datetime) -> "StockLot":
+        """received_at is when the lot was recorded, never the transaction's client-supplied date, so FIFO order can't be backdated."""
+        return StockLot(
+            stock_id=stock.id,
+            transaction_id=transaction.id,
+            initial_quantity=transaction.ingredient_quantity,
+            remaining_quantity=transaction.ingredient_quantity,
+            received_at=received_at,
+            expires_at=transaction.expires_at,
+            ingredient=stock.ingredient
+        )
+
+
+    def consume(self, ingredient_quantity: int) -> int:
+        """Take up to the given quantity from the lot and return what was actually taken."""
+        taken = min(self.remaining_quantity, ingredient_quantity)
+        self.remaining_quantity -= taken
+        return taken
+
+
+    def is_depleted(self) -> bool:
+        return self.remaining_quantity <= 0
+
+
+class LowStockAlert:
+    def __init__(
+        self,
+        stock_id: int,
+        total_stock: int,
+        optimal_stock_quantity: int,
+        flagged_at: datetime,
+        ingredient=None,
+        id: Optional[int] = None
+    ):
+        self.id = id
+        self.stock_id = stock_id
+        self.total_stock = total_stock
+        self.optimal_stock_quantity = optimal_stock_quantity
+        self.flagged_at = flagged_at
+        self.ingredient = ingredient
+
+
+    def __str__(self):
+        return f'Stock {self.stock_id} - {self.total_stock}/{self.optimal_stock_quantity}'
+
+
+class StockSnapshot:
+    def __init__(
+        self,
+        stock_id: int,
+        total_stock: int,
+        as_of: datetime,
+        ingredient=None
+    ):
+        self.stock_id = stock_id
+        self.total_stock = total_stock
+        self.as_of = as_of
+        self.ingredient = ingredient
+
+
+    def __str__(self):
+        return f'Stock {self.stock_id} - {self.total_stock} as of {self.as_of}'
@@ -11,8 +11,10 @@ class Table:
         id: int = None,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
+        group_id: Optional[int] = None,
     ):
         self.id = id
+        self.group_id = group_id
         self.number = number
         self.capacity = capacity
         self.is_available = is_available
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+from restaurant.services.domain.reservation import Reservation
+from restaurant.services.domain.reservation_timeline import ReservationTimeline
+from restaurant.services.domain.table import Table
+
+
+class TableAllocator:
+    """
+    Packs a day's bookings onto the floor. Bookings are placed largest party
+    first, each on the smallest table that fits and is free around its start
+    (best-fit decreasing), so small parties stop taking the big tables that
+    later large parties need. Pinned reservations keep their table and only
+    block it.
+    """
+    def __init__(self, tables: List[Table], window: timedelta = ReservationTimeline.CONFLICT_WINDOW):
+        self.tables = sorted(tables, key=lambda table: (table.capacity, table.number))
+        self.window = window
+
+
+    def allocate(self, pinned: Iterable[Tuple[int, datetime]], bookings: List[Reservation]) -> List[Optional[Table]]:
+        """Table for each booking, in the order given; None for bookings that could not be seated."""
+        timeline = ReservationTimeline.from_reservations(pinned, self.window)
+
+        order = sorted(
+            range(len(bookings)),
+            key=lambda index: (-bookings[index].customer_number, bookings[index].reservation_date, index)
+        )
+
+        assignments: List[Optional[Table]] = [None] * len(bookings)
+        for index in order:
+            booking = bookings[index]
+            for table in self.tables:
+                if table.capacity < booking.customer_number:
+                    continue
+                if timeline.is_free(table.id, booking.reservation_date):
+                    timeline.add(table.id, booking.reservation_date)
+                    assignments[index] = table
+                    break
+
+        return assignments
+
+
+    @staticmethod
+    def seated_covers(bookings: List[Reservation], assignments: List[Optional[Table]]) -> int:
+        return sum(booking.customer_number for booking, table in zip(bookings, assignments) if table is not None)
@@ -0,0 +1,162 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from restaurant.services.domain.reservation_availability import AvailabilityGrid
+from restaurant.services.domain.table import Table
+import numpy as np
+
+
+class TableTurnover:
+    def __init__(
+        self,
+        table_number: int,
+        capacity: int,
+        turns: int,
+        turns_per_shift: Dict[str, float],
+        average_seat_minutes: Optional[float],
+        revenue: float,
+        revenue_per_seat_hour: float
+    ):
+        self.table_number = table_number
+        self.capacity = capacity
+        self.turns = turns
+        self.turns_per_shift = turns_per_shift
+        self.average_seat_minutes = average_seat_minutes
+        self.revenue = revenue
+        self.revenue_per_seat_hour = revenue_per_seat_hour
+
+
+    def __str__(self):
+        return f'Table {self.table_number} - {self.turns} turns'
+
+
+class TableAnalytics:
+    def __init__(
+        self,
+        start_date: date,
+        end_date: date,
+        tables: List[TableTurnover],
+        turns_per_shift: Dict[str, float],
+        average_seat_minutes: Optional[float],
+        revenue: float,
+        revenue_per_seat_hour: float
+    ):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.tables = tables
+        self.turns_per_shift = turns_per_shift
+        self.average_seat_minutes = average_seat_minutes
+        self.revenue = revenue
+        self.revenue_per_seat_hour = revenue_per_seat_hour
+
+
+    def __str__(self):
+        return f'Table analytics {self.start_date} - {self.end_date}'
+
+
+class TurnoverAnalyzer:
+    """
+    Folds completed orders into a (day, table, metric) matrix in one NumPy pass
+    and summarizes any run of days from it. Metrics per table and day are the
+    turns of each shift, the seated seconds and the paid revenue, so a closed
+    day can be stored once and reused by every range that covers it.
+    Revenue per seat-hour is measured against the seats open for service
+    (capacity times opening hours), the usual RevPASH.
+    """
+    SHIFTS = (
+        ('LUNCH', AvailabilityGrid.OPENING_HOUR, 17),
+        ('DINNER', 17, AvailabilityGrid.CLOSING_HOUR),
+    )
+    SEAT_SECONDS = len(SHIFTS)
+    REVENUE = len(SHIFTS) + 1
+    METRICS = len(SHIFTS) + 2
+    OPEN_HOURS = AvailabilityGrid.CLOSING_HOUR - AvailabilityGrid.OPENING_HOUR
+
+    def shift_index(self, local_hours: np.ndarray) -> np.ndarray:
+        """
+        Shift of each start hour, split at the shift boundaries only: any hour
+        before 17 (00:00-09:00 included) is lunch and any later hour is dinner.
+        """
+        bounds = np.array([end for _, _, end in self.SHIFTS[:-1]])
+        return np.searchsorted(bounds, local_hours, side='right')
+
+
+    def daily_matrix(
+        self,
+        days: Sequence[date],
+        table_ids: Sequence[int],
+        rows: List[Tuple[int, datetime, datetime, float]]
+    ) -> np.ndarray:
+        """
+        rows are (table id, local start, local end, revenue) of completed orders;
+        rows on days or tables outside the given ones are ignored.
+        """
+        matrix = np.zeros((len(days), len(table_ids), self.METRICS), dtype=np.float64)
+        if not rows:
+            return matrix
+
+        day_positions = {day: position for position, day in enumerate(days)}
+        table_positions = {table_id: position for position, table_id in enumerate(table_ids)}
+
+        kept = [row for row in rows if row[0] in table_positions and row[1].date() in day_positions]
+        if not kept:
+            return matrix
+
+        table_index = np.fromiter((table_positions[row[0]] for row in kept), dtype=np.int64, count=len(kept))
+        day_index = np.fromiter((day_positions[row[1].date()] for row in kept), dtype=np.int64, count=len(kept))
+        start_hours = np.fromiter((row[1].hour for row in kept), dtype=np.int64, count=len(kept))
+        seat_seconds = np.fromiter(((row[2] - row[1]).total_seconds() for row in kept), dtype=np.float64, count=len(kept))
+        revenue = np.fromiter((row[3] for row in kept), dtype=np.float64, count=len(kept))
+
+        np.add.at(matrix, (day_index, table_index, self.shift_index(start_hours)), 1)
+        np.add.at(matrix, (day_index, table_index, self.SEAT_SECONDS), np.maximum(seat_seconds, 0))
+        np.add.at(matrix, (day_index, table_index, self.REVENUE), revenue)
+        return matrix
+
+
+    def summarize(self, start_date: date, end_date: date, tables: List[Table], matrix: np.ndarray) -> TableAnalytics:
+        """matrix is (days, tables, metrics) for the days of the range and the tables given, in that order."""
+        days = max(matrix.shape[0], 1)
+        totals = matrix.sum(axis=0)
+        turns = totals[:, :len(self.SHIFTS)].sum(axis=1)
+        capacities = np.array([table.capacity for table in tables], dtype=np.float64)
+        seat_hours = capacities * self.OPEN_HOURS * days
+
+        table_turnovers = [
+            TableTurnover(
+                table_number=table.number,
+                capacity=table.capacity,
+                turns=int(turns[index]),
+                turns_per_shift=self._per_shift(totals[index, :len(self.SHIFTS)] / days),
+                average_seat_minutes=self._average_minutes(totals[index, self.SEAT_SECONDS], turns[index]),
+                revenue=round(float(totals[index, self.REVENUE]), 2),
+                revenue_per_seat_hour=self._ratio(totals[index, self.REVENUE], seat_hours[index])
+            )
+            for index, table in enumerate(tables)
+        ]
+
+        table_count = max(len(tables), 1)
+        return TableAnalytics(
+            start_date=start_date,
+            end_date=end_date,
+            tables=table_turnovers,
+            turns_per_shift=self._per_shift(totals[:, :len(self.SHIFTS)].sum(axis=0) / (days * table_count)),
+            average_seat_minutes=self._average_minutes(totals[:, self.SEAT_SECONDS].sum(), turns.sum()),
+            revenue=round(float(totals[:, self.REVENUE].sum()), 2),
+            revenue_per_seat_hour=self._ratio(totals[:, self.REVENUE].sum(), seat_hours.sum())
+        )
+
+
+    def _per_shift(self, values: np.ndarray) -> Dict[str, float]:
+        return {name: round(float(value), 2) for (name, _, _), value in zip(self.SHIFTS, values)}
+
+
+    def _average_minutes(self, seat_seconds: float, turns: float) -> Optional[float]:
+        if turns == 0:
+            return None
+        return round(float(seat_seconds / turns / 60), 1)
+
+
+    def _ratio(self, value: float, per: float) -> float:
+        if per == 0:
+            return 0.0
+        return round(float(value / per), 2)
@@ -0,0 +1,84 @@
+from typing import Dict, Iterable, List, Optional
+from restaurant.services.domain.table import Table
+from restaurant.utils.result import Result
+
+
+class TableGroup:
+    """
+    Tables pushed together for a large party. While merged they act as one
+    table: it takes the number and id of the lowest-numbered member (the lead,
+    which holds the group's orders and bookings), seats the sum of their
+    capacities and is free only when every member is.
+    """
+    def __init__(self, id: Optional[int], tables: Iterable[Table]):
+        self.id = id
+        self.tables = sorted(tables, key=lambda table: table.number)
+
+
+    def __str__(self):
+        return f'Tables {"+".join(str(number) for number in self.table_numbers)} ({self.capacity} seats)'
+
+
+    @property
+    def lead(self) -> Table:
+        return self.tables[0]
+
+
+    @property
+    def capacity(self) -> int:
+        return sum(table.capacity for table in self.tables)
+
+
+    @property
+    def table_numbers(self) -> List[int]:
+        return [table.number for table in self.tables]
+
+
+    def as_table(self) -> Table:
+        return Table(
+            id=self.lead.id,
+            number=self.lead.number,
+            capacity=self.capacity,
+            is_available=all(table.is_available for table in self.tables),
+            group_id=self.id
+        )
+
+
+    @staticmethod
+    def groups_of(tables: Iterable[Table]) -> List["TableGroup"]:
+        members: Dict[int, List[Table]] = {}
+        for table in tables:
+            if table.group_id is not None:
+                members.setdefault(table.group_id, []).append(table)
+        return [TableGroup(group_id, group_tables) for group_id, group_tables in members.items()]
+
+
+    @staticmethod
+    def merge_floor(tables: Iterable[Table]) -> List[Table]:
+        """The floor as it can be booked and seated: ungrouped tables as they are, each group as one table."""
+        tables = list(tables)
+        floor = [table for table in tables if table.group_id is None]
+        floor.extend(group.as_table() for group in TableGroup.groups_of(tables))
+        return sorted(floor, key=lambda table: table.number)
+
+
+    @staticmethod
+    def validate_merge(tables: Iterable[Table], numbers: List[int]) -> Result:
+        by_number = {table.number: table for table in tables}
+
+        if len(set(numbers)) < 2:
+            return Result.error("At least two different tables are needed to merge")
+
+        missing = sorted(set(numbers) - set(by_number))
+        if missing:
+            return Result.error(f"Tables with numbers {missing} not found")
+
+        grouped = sorted(number for number in set(numbers) if by_number[number].group_id is not None)
+        if grouped:
+            return Result.error(f"Tables with numbers {grouped} are already merged")
+
+        occupied = sorted(number for number in set(numbers) if not by_number[number].is_available)
+        if occupied:
+            return Result.error(f"Tables with numbers {occupied} are not available")
+
+        return Result.success(None)
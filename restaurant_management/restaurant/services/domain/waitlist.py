@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from restaurant.services.domain.table import Table
+from restaurant.services.domain.reservation_timeline import ReservationTimeline
+from restaurant.utils.result import Result
+
+
+class WaitlistEntry:
+    class Status:
+        WAITING = 'WAITING'
+        SEATED = 'SEATED'
+        CANCELLED = 'CANCELLED'
+
+        CHOICES = [
+            (WAITING, 'Waiting'),
+            (SEATED, 'Seated'),
+            (CANCELLED, 'Cancelled'),
+        ]
+
+    def __init__(
+        self,
+        name: str,
+        party_size: int,
+        phone_number: str = '',
+        status: str = Status.WAITING,
+        table: Optional[Table] = None,
+        arrived_at: Optional[datetime] = None,
+        seated_at: Optional[datetime] = None,
+        estimated_wait: Optional[timedelta] = None,
+        id: Optional[int] = None
+    ):
+        self.id = id
+        self.name = name
+        self.party_size = party_size
+        self.phone_number = phone_number
+        self.status = status
+        self.table = table
+        self.arrived_at = arrived_at or datetime.now()
+        self.seated_at = seated_at
+        self.estimated_wait = estimated_wait
+
+
+    def __str__(self):
+        return f'{self.name} ({self.party_size}) - {self.status}'
+
+
+    @property
+    def estimated_wait_minutes(self) -> Optional[int]:
+        if self.estimated_wait is None:
+            return None
+        return int(self.estimated_wait.total_seconds() // 60)
+
+
+    def validate_seating(self, table: Table) -> Result:
+        if self.status != self.Status.WAITING:
+            return Result.error(f"Waitlist entry {self.id} is already {self.status.lower()}")
+
+        if table.capacity < self.party_size:
+            return Result.error(f"Table {table.number} seats {table.capacity}, party has {self.party_size}")
+
+        return Result.success(None)
+
+
+    def seat(self, table: Table, seated_at: datetime):
+        self.status = self.Status.SEATED
+        self.table = table
+        self.seated_at = seated_at
+
+
+    def cancel(self):
+        self.status = self.Status.CANCELLED
+
+
+class WaitTimeEstimator:
+    """
+    Replays the queue against the floor: every table frees up at its expected
+    time and again one turnover later, and parties in arrival order take the
+    earliest table that fits them. A table is only offered when the party can
+    finish before the table's next booking; otherwise it is next free one
+    turnover after that booking starts.
+    """
+    DEFAULT_TURNOVER = timedelta(minutes=60)
+
+    def __init__(self, turnover_by_capacity: Dict[int, timedelta]):
+        self.turnover_by_capacity = turnover_by_capacity
+
+
+    def turnover(self, capacity: int) -> timedelta:
+        return self.turnover_by_capacity.get(capacity, self.DEFAULT_TURNOVER)
+
+
+    def next_free_at(self, table: Table, occupied_since: Optional[datetime], now: datetime) -> datetime:
+        if table.is_available:
+            return now
+        if occupied_since is None:
+            return now + self.turnover(table.capacity)
+        return max(now, occupied_since + self.turnover(table.capacity))
+
+
+    def seatable_at(self, table: Table, free_at: datetime, bookings: Optional[ReservationTimeline] = None) -> datetime:
+        """First time from free_at a walk-in can sit at the table and leave before its next booking."""
+        if bookings is None:
+            return free_at
+
+        turnover = self.turnover(table.capacity)
+        booking = bookings.next_start(table.id, free_at)
+        while booking is not None and booking < free_at + turnover:
+            free_at = booking + turnover
+            booking = bookings.next_start(table.id, free_at)
+
+        return free_at
+
+
+    def estimate(
+        self,
+        tables: List[Tuple[Table, datetime]],
+        entries: List[WaitlistEntry],
+        now: datetime,
+        bookings: Optional[ReservationTimeline] = None
+    ) -> List[WaitlistEntry]:
+        """Set estimated_wait on each entry; tables are (table, next free time) pairs, bookings their upcoming reservations."""
+        by_id = {table.id: table for table, _ in tables}
+        free_at = {table.id: self.seatable_at(table, next_free, bookings) for table, next_free in tables}
+        capacities = {table.id: table.capacity for table, _ in tables}
+
+        for entry in sorted(entries, key=lambda entry: (entry.arrived_at, entry.id or 0)):
+            fitting = [table_id for table_id, capacity in capacities.items() if capacity >= entry.party_size]
+            if not fitting:
+                entry.estimated_wait = None
+                continue
+
+            table_id = min(fitting, key=lambda table_id: (free_at[table_id], capacities[table_id]))
+            entry.estimated_wait = max(timedelta(0), free_at[table_id] - now)
+            free_at[table_id] = self.seatable_at(
+                by_id[table_id], max(free_at[table_id], now) + self.turnover(capacities[table_id]), bookings
+            )
+
+        return entries
@@ -0,0 +1,73 @@
+from restaurant.repository.stock_repository import StockRepository
+from restaurant.services.domain.forecast import StockForecast, ConsumptionForecaster
+from typing import List
+from datetime import date
+from django.core.cache import cache
+from django.utils import timezone
+from injector import inject
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ForecastService:
+    @inject
+    def __init__(self, stock_repository: StockRepository):
+        self.stock_repository = stock_repository
+        self.forecaster = ConsumptionForecaster()
+
+
+    def get_stock_forecasts(self) -> List[StockForecast]:
+        today = timezone.localdate()
+        cache_key = f'stock_forecasts_{today.isoformat()}'
+
+        forecasts = cache.get(cache_key)
+        if forecasts is None:
+            forecasts = self.forecast_stocks(today)
+            cache.set(cache_key, forecasts, timeout=86400)
+
+        return forecasts
+
+
+    def forecast_stocks(self, today: date) -> List[StockForecast]:
+        stock_levels = self.stock_repository.get_stock_levels()
+        if not stock_levels:
+            return []
+
+        stock_ids, total_stocks, ingredient_names, units = zip(*stock_levels)
+        stock_ids = np.array(stock_ids, dtype=np.int64)
+        total_stocks = np.array(total_stocks, dtype=np.float64)
+
+        out_stock_ids, out_days, out_quantities = self.stock_repository.get_daily_out_quantities(
+            self.forecaster.history_start(today)
+        )
+
+        first_movements = self.stock_repository.get_first_movement_dates()
+        first_movement_days = np.array(
+            [first_movements.get(int(stock_id)) or 'NaT' for stock_id in stock_ids], dtype='datetime64[D]'
+        )
+
+        daily = self.forecaster.daily_matrix(stock_ids, out_stock_ids, out_days, out_quantities, today)
+        active_days = self.forecaster.active_days(first_movement_days, today)
+        averages, weekday_rates = self.forecaster.weekday_rates(daily, today, active_days)
+        days_left = self.forecaster.days_until_stockout(total_stocks, weekday_rates, today)
+
+        forecasts = [
+            StockForecast(
+                stock_id=int(stock_ids[index]),
+                ingredient_name=ingredient_names[index],
+                unit=units[index],
+                total_stock=int(total_stocks[index]),
+                average_daily_consumption=round(float(averages[index]), 2),
+                weekday_daily_consumption=np.round(weekday_rates[index], 2).tolist(),
+                days_until_stockout=int(days_left[index]) if days_left[index] >= 0 else None,
+                forecast_date=today
+            )
+            for index in range(len(stock_ids))
+        ]
+
+        logger.info(f"Consumption forecast computed for {len(forecasts)} stocks.")
+        return sorted(
+            forecasts,
+            key=lambda forecast: (forecast.days_until_stockout is None, forecast.days_until_stockout or 0)
+        )
@@ -0,0 +1,118 @@
+from restaurant.repository.inventory_count_repository import InventoryCountRepository
+from restaurant.repository.stock_repository import StockRepository
+from restaurant.services.stock_service import StockService
+from restaurant.services.domain.inventory_count import InventoryCount, InventoryCountLine
+from restaurant.services.domain.stock import StockLot
+from restaurant.utils.result import Result
+from restaurant.utils.exceptions import DomainException
+from typing import List, Optional
+from django.db.transaction import atomic
+from django.utils import timezone
+from injector import inject
+import logging
+
+logger = logging.getLogger(__name__)
+
+class InventoryCountService:
+    @inject
+    def __init__(
+        self,
+        count_repository: InventoryCountRepository,
+        stock_repository: StockRepository,
+        stock_service: StockService
+    ):
+        self.count_repository = count_repository
+        self.stock_repository = stock_repository
+        self.stock_service = stock_service
+
+
+    def get_count_by_id(self, count_id) -> Optional[InventoryCount]:
+        return self.count_repository.get_by_id(count_id)
+
+
+    def get_all_counts(self) -> List[InventoryCount]:
+        return self.count_repository.get_all()
+
+
+    def open_count(self, employee_name: str) -> InventoryCount:
+        count = self.count_repository.create(InventoryCount(employee_name=employee_name))
+
+        logger.info(f"Inventory count with ID {count.id} opened by {employee_name}.")
+        return count
+
+
+    def validate_lines(self, lines_data) -> Result:
+        stock_ids = [line_data.get('stock_id') for line_data in lines_data]
+        if len(stock_ids) != len(set(stock_ids)):
+            return Result.error("Each stock can only be counted once per submission")
+
+        missing_ids = set(stock_ids) - self.stock_repository.get_existing_ids(stock_ids)
+        if missing_ids:
+            return Result.error(f"Stocks with IDs {sorted(missing_ids)} not found")
+
+        return Result.success(None)
+
+
+    def submit_lines(self, count: InventoryCount, lines_data) -> InventoryCount:
+        open_result = count.validate_open()
+        if open_result.is_failure():
+            raise DomainException(open_result.get_error_msg())
+
+        lines = [
+            InventoryCountLine(
+                stock_id=line_data.get('stock_id'),
+                counted_quantity=line_data.get('counted_quantity')
+            )
+            for line_data in lines_data
+        ]
+        self.count_repository.save_lines(count.id, lines)
+
+        logger.info(f"{len(lines)} counted stocks submitted to inventory count with ID {count.id}.")
+        return self.count_repository.get_by_id(count.id)
+
+
+    @atomic
+    def post_count(self, count_id) -> Optional[InventoryCount]:
+        """
+        Compare every counted quantity against the locked stock totals and post
+        one adjustment transaction per variance, all written in bulk. The stock
+        rows stay locked until commit; StockService.add_transaction takes the
+        same lock, so a transaction posted meanwhile applies on top of the
+        adjusted total instead of overwriting it.
+        """
+        count = self.count_repository.get_by_id_for_update(count_id)
+        if count is None:
+            return None
+
+        posting_result = count.validate_posting()
+        if posting_result.is_failure():
+            raise DomainException(posting_result.get_error_msg())
+
+        now = timezone.now()
+        adjustments = count.build_adjustments(now)
+        self.stock_repository.save_transactions(adjustments)
+
+        stock_in = [adjustment for adjustment in adjustments if adjustment.is_stock_in()]
+        self.stock_repository.create_lots([StockLot.from_transaction(adjustment.stock, adjustment, now) for adjustment in stock_in])
+
+        stock_out = [adjustment for adjustment in adjustments if not adjustment.is_stock_in()]
+        open_lots = self.stock_repository.get_open_lots_for_update_by_stock([adjustment.stock.id for adjustment in stock_out])
+        consumed_lots = [
+            lot
+            for adjustment in stock_out
+            for lot in adjustment.stock.consume_lots(open_lots.get(adjustment.stock.id, []), adjustment.ingredient_quantity)
+        ]
+        self.stock_repository.update_lots(consumed_lots)
+
+        adjusted_stocks = [adjustment.stock for adjustment in adjustments]
+        for stock in adjusted_stocks:
+            stock.updated_at = now
+        self.stock_repository.update_totals(adjusted_stocks)
+        self.stock_service.refresh_low_stock(adjusted_stocks)
+
+        count.mark_posted(now)
+        self.count_repository.update_lines(count.id, count.lines)
+        self.count_repository.update(count)
+
+        logger.info(f"Inventory count with ID {count.id} posted with {len(adjustments)} adjustments over {len(count.lines)} stocks.")
+        return count
@@ -1,47 +1,163 @@
 from restaurant.repository.menu_item_repository import MenuItemRepository
+from restaurant.repository.menu_extra_repository import MenuExtraRepository
 from restaurant.mappers.menu_item_mappers import MenuItemMapper
-from restaurant.services.domain.menu_item import MenuItem
+from restaurant.services.domain.menu_item import MenuItem, MenuItemPrice
+from restaurant.services.domain.menu_extra import MenuExtra
+from restaurant.services.domain.menu_snapshot import MenuSnapshot, MenuSnapshotHolder
+from restaurant.serializers import MenuItemSerializer
+from restaurant.utils.cache_generations import CacheGenerations
+from restaurant.services.domain.menu_catalog_diff import MenuCatalogDiff, MenuChangeSet
+from restaurant.utils.rendered_payload import RenderedPayload
+from restaurant.utils.result import Result
+from typing import Callable, List, Optional
 from injector import inject
 from django.core.cache import cache # type: ignore
+from django.db import connection, transaction
+from django.db.models import ProtectedError
+from restaurant.utils.exceptions import DomainException
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bumped on every menu write; its value is the catalog version served as ETag
+CATALOG_TAG = 'catalog'
+
+MENU_SEARCH_LIMIT = 20
+
+# Current catalog of this worker, shared by every MenuItemService instance
+menu_snapshot = MenuSnapshotHolder()
+
 class MenuItemService:
     @inject
-    def __init__(self, menu_repository: MenuItemRepository):
+    def __init__(self, menu_repository: MenuItemRepository, menu_extra_repository: MenuExtraRepository):
         self.menu_repository = menu_repository
+        self.menu_extra_repository = menu_extra_repository
+        self.cache_generations = CacheGenerations('menu')
     
-    def get_menu_by_id(self, menu_id) -> MenuItem:
-        menu = cache.get(f'menu_{menu_id}')
+    def get_catalog_version(self) -> int:
+        return self.cache_generations.current(CATALOG_TAG)[0]
 
-        if menu is None:
-            menu = self.menu_repository.get_by_id(menu_id)
-            cache.set(f'menu_{menu_id}', menu, timeout=36000)
-        
-        return menu
+    def get_snapshot(self, version: Optional[int] = None) -> MenuSnapshot:
+        return menu_snapshot.get(self.get_catalog_version, self._build_snapshot, version)
+
+    def get_menu_by_id(self, menu_id) -> Optional[MenuItem]:
+        try:
+            return self.get_snapshot().items_by_id.get(int(menu_id))
+        except (TypeError, ValueError):
+            return None
+
+    def get_all_menus(self, version: Optional[int] = None) -> List[MenuItem]:
+        return list(self.get_snapshot(version).items)
+
+    def get_menus_by_category(self, category: str, version: Optional[int] = None) -> List[MenuItem]:
+        return list(self.get_snapshot(version).items_by_category.get(category, ()))
+
+    def get_price_history(self, menu_id) -> List[MenuItemPrice]:
+        return self.menu_repository.get_price_history(menu_id)
+
+    def get_all_extras(self) -> List[MenuExtra]:
+        return list(self.get_snapshot().extras)
+
+    def get_extras_for_item(self, menu_item_id: int) -> List[MenuExtra]:
+        return list(self.get_snapshot().extras_by_menu_item.get(menu_item_id, ()))
+
+    def validate_extra(self, menu_extra: MenuExtra) -> Result:
+        if menu_extra.price < 0:
+            return Result.error("Extra price can't be negative.")
+
+        unknown_ids = menu_extra.menu_item_ids - set(self.get_snapshot().items_by_id)
+        if unknown_ids:
+            return Result.error(f"Menu Items with IDs {sorted(unknown_ids)} not found")
+
+        return Result.success(None)
 
-    def get_all_menus(self) -> list:
-        menus = cache.get('all_menus')
+    def create_extra(self, menu_extra: MenuExtra) -> MenuExtra:
+        created_extra = self.menu_extra_repository.create(menu_extra)
+        self._bump_catalog()
 
-        if menus is None:
-            menus = self.menu_repository.get_all()
-            cache.set('all_menus', menus, timeout=36000)
+        logger.info(f"Menu extra with ID {created_extra.id} created successfully.")
+        return created_extra
 
-        return menus
+    def delete_extra_by_id(self, extra_id) -> bool:
+        try:
+            is_deleted = self.menu_extra_repository.delete(extra_id)
+        except ProtectedError:
+            raise DomainException(f"Menu extra with ID [{extra_id}] is used by orders")
+
+        if is_deleted:
+            self._bump_catalog()
+            logger.info(f"Menu extra with ID {extra_id} deleted successfully.")
+        return is_deleted
+
+    def search_menu(self, term: str, limit: int = MENU_SEARCH_LIMIT) -> List[MenuItem]:
+        limit = min(limit, MENU_SEARCH_LIMIT)
+        if connection.vendor == 'postgresql':
+            return self.menu_repository.search(term, limit)
+        return self.get_snapshot().search_index.search(term, limit)
+
+    def get_rendered_payload(self, name: str, version: int, build: Callable[[MenuSnapshot], dict]) -> RenderedPayload:
+        """Response body for a catalog read, rendered once per catalog version and shared through the cache."""
+        cache_key = f'menu_rendered_{name}_{version}'
+        payload = cache.get(cache_key)
+
+        if payload is None:
+            payload = RenderedPayload.render(build(self.get_snapshot(version)))
+            cache.set(cache_key, payload, timeout=36000)
+
+        return payload
 
     def create_menu(self, serializer_data) -> MenuItem:
         menu_item = MenuItemMapper.map_serializer_to_domain(serializer_data)
         
         created_menu = self.menu_repository.create(menu_item)
+        self._bump_catalog()
         
         logger.info(f"Menu with ID {created_menu.id} created successfully.")
         return created_menu
 
+    def upsert_menus(self, menu_items: List[MenuItem], dry_run: bool = False) -> Result:
+        """
+        Apply a full or partial menu in one go: only items that actually changed
+        are written, in one transaction, and the catalog version moves once.
+        Any invalid item rejects the whole batch.
+        """
+        changes = MenuCatalogDiff.diff(self.menu_repository.get_all(), menu_items)
+        if not changes.is_valid():
+            return Result.error([f'Item {row}: {error}' for row, error in changes.errors])
+
+        if changes.has_changes() and not dry_run:
+            changes.created = self.menu_repository.bulk_upsert(changes.created, changes.updated)
+            self._bump_catalog()
+            logger.info(f"Menu upserted: {changes}.")
+
+        return Result.success(changes)
+
     def delete_menu_by_id(self, menu_id):
         is_delete = self.menu_repository.delete(menu_id)
         
         if is_delete:
+            self._bump_catalog()
             logger.info(f"Menu with ID {menu_id} deleted successfully.")
         return is_delete
 
+    def _bump_catalog(self):
+        # After commit, so no worker can cache rows that are about to change under the new version
+        transaction.on_commit(self._apply_catalog_bump)
+
+    def _apply_catalog_bump(self):
+        self.cache_generations.bump(CATALOG_TAG)
+        menu_snapshot.invalidate()
+
+    def _build_snapshot(self, version: int) -> MenuSnapshot:
+        # The catalog rows are shared across workers so only the first one to see a version hits the database
+        cache_key = f'menu_catalog_rows_{version}'
+        rows = cache.get(cache_key)
+
+        if rows is None:
+            rows = (self.menu_repository.get_all(), self.menu_extra_repository.get_all())
+            cache.set(cache_key, rows, timeout=36000)
+
+        menus, extras = rows
+        snapshot = MenuSnapshot(version, menus, lambda items: MenuItemSerializer(items, many=True).data, extras)
+        logger.info(f"{snapshot} loaded.")
+        return snapshot
@@ -2,8 +2,11 @@ from typing import List
 from restaurant.repository.order_repository import OrderRepository
 from restaurant.services.domain.order import Order, OrderStatus, OrderItem
 from restaurant.services.domain.table import Table
-from restaurant.repository.table_respository import TableRepository
-from restaurant.repository.menu_item_repository import MenuItemRepository
+from restaurant.services.table_service import TableService
+from restaurant.services.menu_service import MenuItemService
+from restaurant.services.waitlist_service import WaitlistService
+from restaurant.services.domain.waitlist import WaitlistEntry
+from typing import Optional
 from injector import inject
 import logging
 
@@ -14,12 +17,14 @@ class OrderService:
     def __init__(
         self, 
         order_repository : OrderRepository, 
-        table_repository : TableRepository,
-        menu_item_repository : MenuItemRepository,
+        table_service : TableService,
+        menu_service : MenuItemService,
+        waitlist_service : WaitlistService,
         ):
         self.order_repository = order_repository
-        self.table_repository = table_repository
-        self.menu_item_repository = menu_item_repository
+        self.table_service = table_service
+        self.menu_service = menu_service
+        self.waitlist_service = waitlist_service
     
 
     def get_order_by_id(self, order_id):
@@ -40,7 +45,7 @@ class OrderService:
             table=table
         )
 
-        self.table_repository.set_as_unavailable(new_order.table.number)
+        self.table_service.set_as_unavailable(new_order.table.number)
         
         created_order = self.order_repository.create(new_order)
         logger.info(f"Order with ID {created_order.id} initiated successfully for table {table.number}.")
@@ -49,20 +54,30 @@ class OrderService:
 
     def proccess_items(self, items_data):
         created_items = []
+        # Checked against the current catalog version (one cache read) so writes never use another worker's stale menu
+        menu = self.menu_service.get_snapshot(version=self.menu_service.get_catalog_version())
         
         for item_data in items_data: 
             menu_item_id = item_data.get('menu_item_id')  
             quantity = item_data.get('quantity') 
             notes = item_data.get('notes') 
+            menu_extra_id = item_data.get('menu_extra_id')
 
-            menu_item = self.menu_item_repository.get_by_id(menu_item_id)
+            menu_item = menu.items_by_id.get(menu_item_id)
             if not menu_item:
                 raise ValueError(f'Menu Item with [{menu_item_id}] not found')
 
+            menu_extra = None
+            if menu_extra_id is not None:
+                menu_extra = menu.extras_by_id.get(menu_extra_id)
+                if not menu_extra or not menu_extra.is_allowed_for(menu_item.id):
+                    raise ValueError(f'Menu Extra with [{menu_extra_id}] not available for Menu Item [{menu_item_id}]')
+
             order_item = OrderItem(
                 menu_item=menu_item,
                 quantity=quantity,
-                notes=notes
+                notes=notes,
+                menu_extra=menu_extra
             )
             created_items.append(order_item)
 
@@ -97,18 +112,25 @@ class OrderService:
         order.set_as_cancel()
 
         self.order_repository.update(order)
-        self.table_repository.set_as_unavailable(order.table.number)
+        self.release_table(order.table)
         logger.info(f"Order with ID {order.id} canceled.")
 
     def end_order(self, order: Order):
         order.set_as_complete()
 
-        self.table_repository.set_as_unavailable(order.table.number)
         updated_order = self.order_repository.update(order)
+        self.release_table(order.table)
         logger.info(f"Order with ID {order.id} completed.")
         
         return updated_order
 
+    def release_table(self, table: Table) -> Optional[WaitlistEntry]:
+        """Free the table and suggest the waiting party that fits it best."""
+        self.table_service.set_as_available(table.number)
+        table.mark_available()
+
+        return self.waitlist_service.suggest_for_table(table)
+
     def set_item_as_delivered(self, order_id, item_id):
         order = self.order_repository.get_by_id(order_id)
         order.set_item_as_delivered(item_id)
@@ -96,7 +96,9 @@ class PaymentService:
         for order_item in order_items:
             key = (
                 order_item.menu_item.id, 
-                order_item.menu_extra.id if order_item.menu_extra else None
+                order_item.menu_extra.id if order_item.menu_extra else None,
+                order_item.unit_price,
+                order_item.extra_price
             )
 
             if key in payment_items:
@@ -109,20 +111,17 @@ class PaymentService:
         
         
     def __create_payment_item(self, order_item : OrderItem):
+        # Lines are priced with what the order item captured when it was added, never the current menu
         payment_item = PaymentItem(
                 menu_item=order_item.menu_item,
                 menu_extra_item=order_item.menu_extra,
                 order_item=order_item,
                 quantity=order_item.quantity,
-                price=order_item.menu_item.price
+                price=order_item.unit_price,
+                extra_item_price=order_item.extra_price
             )
 
         payment_item.calculate_total()
-
-        if payment_item.menu_extra_item:
-            payment_item.menu_extra_item = order_item.menu_extra.price
-            payment_item.increase_extra_item_price()
-        
         return payment_item
 
 
@@ -3,38 +3,64 @@ from restaurant.utils.result import Result
 from restaurant.repository.reservation_repository import ReservationRepository
 from restaurant.repository.table_respository import TableRepository
 from restaurant.services.domain.reservation import Reservation
-from datetime import datetime
+from restaurant.services.domain.reservation_timeline import ReservationTimeline
+from restaurant.services.domain.reservation_availability import AvailabilityGrid, AvailabilitySlot
+from restaurant.services.domain.reservation_import import ReservationImportRow
+from restaurant.services.domain.table_allocation import TableAllocator
+from restaurant.services.domain.table_group import TableGroup
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from time import sleep
 from restaurant.utils.exceptions import DomainException
+from restaurant.utils.cache_generations import CacheGenerations
+from restaurant.services.domain.reservation_book import DailyReservationBook
+from restaurant.services.table_service import floor_generations, lock_tables, FLOOR_TAG, LAYOUT_TAG, LOCK_RETRY_PASSES, LOCK_RETRY_DELAY
+from restaurant.signals import reservations_changed
 from django.core.cache import cache
+from django.db.transaction import on_commit
+from django.dispatch import receiver
+from django.utils import timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-process view of today's reservations, patched by reservations_changed
+today_reservations = DailyReservationBook()
+
+ALL_TAG = 'all'
+# Carried by lookups by id or guest; the no-show sweep never loads the rows it updates, so it bumps this instead of their tags
+NO_SHOW_TAG = 'no_show'
+MAX_RANGE_TAG_DAYS = 31
+GUEST_SEARCH_LIMIT = 20
+
 class ReservationService:
     def __init__(self):
         self.reservation_repository = ReservationRepository()
         self.table_repository = TableRepository()
+        self.cache_generations = CacheGenerations('reservations')
 
     def get_all(self):
-        reservations = cache.get('all_reservations')
+        cache_key = self.cache_generations.key('all_reservations', tags=[ALL_TAG])
+        reservations = cache.get(cache_key)
 
         if reservations is None:
             reservations = self.reservation_repository.get_all()
-            cache.set('all_reservations', reservations, timeout=3600)  
+            cache.set(cache_key, reservations, timeout=3600)  
         
         return reservations
 
     def get_by_id(self, id):
-        reservation = cache.get(f'reservation_{id}')
+        cache_key = self.cache_generations.key('reservation', id, tags=[f'reservation:{id}', NO_SHOW_TAG])
+        reservation = cache.get(cache_key)
         
         if reservation is None:
             reservation = self.reservation_repository.get_by_id(id)
-            cache.set(f'reservation_{id}', reservation, timeout=3600)
+            cache.set(cache_key, reservation, timeout=3600)
         
         return reservation
 
     def get_by_filter(self, filter, value):
-        cache_key = f'reservations_{filter}_{value}'
+        cache_key = self.cache_generations.key('reservations_by', filter, value, tags=[self._filter_tag(filter, value), NO_SHOW_TAG])
         reservations = cache.get(cache_key)
         
         if reservations is None:
@@ -52,8 +78,15 @@ class ReservationService:
             cache.set(cache_key, reservations, timeout=3600)
         return reservations
 
+    def get_today(self) -> List[Reservation]:
+        return today_reservations.get(timezone.localdate(), self._load_day, self._day_generation)
+
+
     def get_by_time_range(self, start: datetime, end: datetime):
-        cache_key = f'reservations_time_range_{start.timestamp()}_{end.timestamp()}'
+        cache_key = self.cache_generations.key(
+            'reservations_time_range', start.timestamp(), end.timestamp(),
+            tags=self._date_range_tags(start.date(), end.date())
+        )
         reservations = cache.get(cache_key)
 
         if reservations is None:
@@ -63,6 +96,98 @@ class ReservationService:
         return reservations
     
 
+    def search_guests(self, term: str, limit: int = GUEST_SEARCH_LIMIT) -> List[Reservation]:
+        return self.reservation_repository.search_guests(term, min(limit, GUEST_SEARCH_LIMIT))
+
+
+    def get_availability(self, day: date, party_size: int) -> List[AvailabilitySlot]:
+        """
+        Slots with a table free as booked, plus the slots where create() would
+        still seat the party by repacking the day's bookings.
+        """
+        layout_version = floor_generations.current(LAYOUT_TAG)
+        cache_key = self.cache_generations.key(
+            'availability_slots', day.isoformat(), party_size, layout_version,
+            tags=[f'date:{day.isoformat()}']
+        )
+        slots = cache.get(cache_key)
+
+        if slots is None:
+            grid = self._get_availability_grid(day, layout_version)
+            slots = grid.free_slots(party_size)
+
+            free_starts = {slot.start for slot in slots}
+            full_starts = [start for start in grid.slot_starts() if start not in free_starts]
+            slots += [
+                AvailabilitySlot(start, 0, requires_reallocation=True)
+                for start in self._fit_by_reallocation(day, party_size, full_starts)
+            ]
+            slots.sort(key=lambda slot: slot.start)
+            cache.set(cache_key, slots, timeout=3600)
+
+        return slots
+
+
+    def _get_availability_grid(self, day: date, layout_version) -> AvailabilityGrid:
+        cache_key = self.cache_generations.key(
+            'availability', day.isoformat(), layout_version,
+            tags=[f'date:{day.isoformat()}']
+        )
+        grid = cache.get(cache_key)
+
+        if grid is None:
+            grid = self._build_availability_grid(day)
+            cache.set(cache_key, grid, timeout=3600)
+
+        return grid
+
+
+    def _fit_by_reallocation(self, day: date, party_size: int, starts: List[datetime]) -> List[datetime]:
+        """The starts at which the allocator would seat the party together with the day's bookings, as _book_with_reallocation does."""
+        if not starts:
+            return []
+
+        tables = TableGroup.merge_floor(self.table_repository.get_all())
+        if not any(table.capacity >= party_size for table in tables):
+            return []
+
+        pinned, movable = self._load_day_allocation(day)
+        allocator = TableAllocator(tables)
+
+        fitting = []
+        for start in starts:
+            probe = Reservation(
+                name=None,
+                email=None,
+                phone_number=None,
+                customer_number=party_size,
+                reservation_date=start
+            )
+            if all(table is not None for table in allocator.allocate(pinned, movable + [probe])):
+                fitting.append(start)
+
+        return fitting
+
+
+    def validate_availability_query(self, day: date, party_size: int) -> Result:
+        if party_size < 1:
+            return Result.error("Party size must be at least 1.")
+
+        probe = Reservation(
+            name=None,
+            email=None,
+            phone_number=None,
+            customer_number=party_size,
+            reservation_date=datetime.combine(day, time(AvailabilityGrid.OPENING_HOUR))
+        )
+
+        date_result = probe.validate_date()
+        if date_result.is_failure():
+            return date_result
+
+        return probe.validate_customer_limit()
+
+
     def validate_creation(self, reservation : Reservation) -> Result:
         date_result = reservation.validate_date()
         if date_result.is_failure():
@@ -86,24 +211,126 @@ class ReservationService:
             logger.warning(f"No suitable tables available for {reservation.customer_number} customers.")
             raise DomainException("No suitable tables available for the requested number of customers.")
 
-        for table in suitable_tables:
-            reservation_conflict = self.reservation_repository.get_by_table_and_reservation_time(
-                table,
-                reservation.reservation_date
+        reservation_date = self._as_aware(reservation.reservation_date)
+        reservation.reservation_date = reservation_date
+        timeline = self._build_timeline(suitable_tables, reservation_date)
+
+        candidates = [table for table in suitable_tables if timeline.is_free(table.id, reservation_date)]
+        if candidates:
+            created_reservation = self._book_first_free(reservation, candidates, reservation_date)
+        else:
+            created_reservation = self._book_with_reallocation(reservation)
+
+        if created_reservation is None:
+            logger.warning(f"No tables available for the requested date {reservation.reservation_date} and customer capacity {reservation.customer_number}.")
+            raise DomainException("No tables available for the requested date and customer capacity.")
+
+        self._invalidate(created_reservation)
+        logger.info(f"Reservation created successfully with ID {created_reservation.id} for table {created_reservation.table.id}.")
+        return created_reservation
+
+    def import_reservations(self, rows: List[ReservationImportRow]) -> List[ReservationImportRow]:
+        """
+        Validate and book a batch of reservations in row order. Tables are
+        allocated against one in-memory timeline covering every affected day
+        and the accepted rows are inserted together; each row reports its own outcome.
+        """
+        for row in rows:
+            if row.is_pending():
+                validation_result = self.validate_creation(row.reservation)
+                if validation_result.is_failure():
+                    row.reject(validation_result.get_error_msg())
+
+        pending = [row for row in rows if row.is_pending()]
+        if not pending:
+            return rows
+
+        smallest_party = min(row.reservation.customer_number for row in pending)
+        tables = self._find_suitable_tables(smallest_party)
+        reservation_dates = [self._as_aware(row.reservation.reservation_date) for row in pending]
+
+        with lock_tables(self.reservation_repository, tables):
+            reservation_times = self.reservation_repository.get_reservation_times_by_range(
+                min(reservation_dates) - ReservationTimeline.CONFLICT_WINDOW,
+                max(reservation_dates) + ReservationTimeline.CONFLICT_WINDOW
             )
+            timeline = ReservationTimeline.from_reservations(reservation_times)
+
+            allocated = []
+            for row, reservation_date in zip(pending, reservation_dates):
+                candidates = [table for table in tables if table.capacity >= row.reservation.customer_number]
+                table = timeline.first_free_table(candidates, reservation_date)
+                if table is None:
+                    row.reject("No tables available for the requested date and customer capacity.")
+                    continue
+
+                row.reservation.assign_table(table)
+                timeline.add(table.id, reservation_date)
+                allocated.append(row)
+
+            created_reservations = self.reservation_repository.create_many([row.reservation for row in allocated])
+
+        for row, reservation in zip(allocated, created_reservations):
+            row.mark_created(reservation)
+
+        self._invalidate(*created_reservations)
+        logger.info(f"Reservation import: {len(created_reservations)} of {len(rows)} rows created.")
+        return rows
+
+
+    def reoptimize_day(self, day: date) -> int:
+        """
+        Repack the day's future booked reservations over all tables. The new plan is
+        applied only if it still seats every one of them. Returns how many reservations moved table.
+        """
+        tables = TableGroup.merge_floor(self.table_repository.get_all())
+
+        with lock_tables(self.reservation_repository, tables):
+            pinned, movable = self._load_day_allocation(day)
+            assignments = TableAllocator(tables).allocate(pinned, movable)
+            if any(table is None for table in assignments):
+                logger.info(f"Reservations for {day} kept as they are: repacking would unseat a booking.")
+                return 0
+
+            moved = self._apply_assignments(movable, assignments)
+
+        logger.info(f"Reservations for {day} repacked, {moved} moved table.")
+        return moved
+
+
+    def sweep_no_shows(self, grace: timedelta = Reservation.NO_SHOW_GRACE) -> int:
+        """
+        Mark every booked reservation that started more than `grace` ago as not attended,
+        freeing its table for conflict checks, in one UPDATE. Caches are invalidated per
+        affected day plus the no-show tag rather than per row. Returns the number of
+        reservations updated.
+        """
+        cutoff = timezone.now() - grace
+        days = self.reservation_repository.get_overdue_booked_days(cutoff)
+        if not days:
+            return 0
+
+        updated = self.reservation_repository.mark_overdue_not_attended(cutoff)
+        if updated:
+            self.cache_generations.bump(ALL_TAG, NO_SHOW_TAG, *[f'date:{day.isoformat()}' for day in days])
+            on_commit(lambda: self._notify_swept(days))
 
-            if not reservation_conflict: 
-                reservation.assign_table(table) 
-                created_reservation = self.reservation_repository.create(reservation)
-                logger.info(f"Reservation created successfully with ID {created_reservation.id} for table {table.id}.")
-                return created_reservation
+        logger.info(f"{updated} reservations marked as not attended.")
+        return updated
+
+
+    def _notify_swept(self, days: List[date]):
+        """The swept rows were never loaded, so receivers get the affected days instead of reservations."""
+        if timezone.localdate() in days:
+            floor_generations.bump(FLOOR_TAG)
+        reservations_changed.send(sender=ReservationService, reservations=(), deleted=False, days=days)
 
-        logger.warning(f"No tables available for the requested date {reservation.reservation_date} and customer capacity {reservation.customer_number}.")
-        raise DomainException("No tables available for the requested date and customer capacity.")
 
     def delete_by_id(self, id):
+        reservation = self.reservation_repository.get_by_id(id)
         deleted = self.reservation_repository.delete(id)
         if deleted:
+            self._invalidate(reservation, deleted=True)
             logger.info(f"Reservation with ID {id} deleted successfully.")
         else:
             logger.warning(f"Failed to delete reservation with ID {id}.")
@@ -112,7 +339,7 @@ class ReservationService:
 
 
     def _find_suitable_tables(self, party_size):
-        all_tables = self.table_repository.get_all()
+        all_tables = TableGroup.merge_floor(self.table_repository.get_all())
 
         suitables_tables = []
         for table in all_tables:
@@ -123,4 +350,194 @@ class ReservationService:
             suitables_tables, 
             key=lambda table: table.capacity
         )
-        
\ No newline at end of file
+
+
+    def _book_first_free(self, reservation: Reservation, candidates, reservation_date: datetime) -> Optional[Reservation]:
+        """
+        Insert the reservation on the first candidate that can be locked and is
+        still free once locked. A table held by another writer is skipped right
+        away and retried only after the remaining candidates were tried.
+        """
+        for attempt in range(LOCK_RETRY_PASSES):
+            contended = []
+            for table in candidates:
+                with self.reservation_repository.try_lock_table(table.id) as acquired:
+                    if not acquired:
+                        contended.append(table)
+                        continue
+
+                    if self._build_timeline([table], reservation_date).is_free(table.id, reservation_date):
+                        reservation.assign_table(table)
+                        return self.reservation_repository.create(reservation)
+
+            if not contended:
+                return None
+
+            candidates = contended
+            sleep(LOCK_RETRY_DELAY * (attempt + 1))
+
+        return None
+
+
+    def _book_with_reallocation(self, reservation: Reservation) -> Optional[Reservation]:
+        """
+        No table is free as things stand: repack the day's future bookings together
+        with the new one and book it only if every booking is still seated.
+        """
+        tables = TableGroup.merge_floor(self.table_repository.get_all())
+        reservation_day = timezone.localtime(reservation.reservation_date).date()
+
+        with lock_tables(self.reservation_repository, tables):
+            pinned, movable = self._load_day_allocation(reservation_day)
+            assignments = TableAllocator(tables).allocate(pinned, movable + [reservation])
+            if any(table is None for table in assignments):
+                return None
+
+            moved = self._apply_assignments(movable, assignments[:-1])
+            reservation.assign_table(assignments[-1])
+            created_reservation = self.reservation_repository.create(reservation)
+
+        logger.info(f"Reservation {created_reservation.id} fitted after moving {moved} reservations.")
+        return created_reservation
+
+
+    def _load_day_allocation(self, day: date):
+        """
+        Split the reservations around the day into pinned (table, start) pairs and the
+        future booked reservations of the day, which the allocator may move.
+        """
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        end = start + timedelta(days=1)
+        now = timezone.now()
+
+        pinned, movable = [], []
+        reservations = self.reservation_repository.get_by_range_with_tables(
+            start - ReservationTimeline.CONFLICT_WINDOW,
+            end + ReservationTimeline.CONFLICT_WINDOW
+        )
+        for reservation in reservations:
+            if not reservation.blocks_table():
+                continue
+
+            is_movable = (
+                reservation.status == Reservation.Status.BOOKED
+                and start <= reservation.reservation_date < end
+                and reservation.reservation_date > now
+            )
+            if is_movable:
+                movable.append(reservation)
+            else:
+                pinned.append((reservation.table.id, reservation.reservation_date))
+
+        return pinned, movable
+
+
+    def _apply_assignments(self, reservations: List[Reservation], tables) -> int:
+        moved = [(reservation, table) for reservation, table in zip(reservations, tables) if reservation.table.id != table.id]
+        if not moved:
+            return 0
+
+        previous_tables = [f'table:{reservation.table.number}' for reservation, _ in moved]
+        for reservation, table in moved:
+            reservation.assign_table(table)
+
+        self.reservation_repository.update_tables([reservation for reservation, _ in moved])
+        self._invalidate(*[reservation for reservation, _ in moved])
+        self.cache_generations.bump(*previous_tables)
+        return len(moved)
+
+
+    def _build_timeline(self, tables, reservation_date: datetime) -> ReservationTimeline:
+        """Timeline of the candidate tables around the requested time, loaded in a single query."""
+        reservation_times = self.reservation_repository.get_reservation_times_by_tables(
+            [table.id for table in tables],
+            reservation_date - ReservationTimeline.CONFLICT_WINDOW,
+            reservation_date + ReservationTimeline.CONFLICT_WINDOW
+        )
+        return ReservationTimeline.from_reservations(reservation_times)
+
+
+    def _as_aware(self, value: datetime) -> datetime:
+        return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+    def _build_availability_grid(self, day: date) -> AvailabilityGrid:
+        """Occupancy of every table for the day, from one table query and one reservation query."""
+        opening = timezone.make_aware(datetime.combine(day, time(AvailabilityGrid.OPENING_HOUR)))
+        last_slot = opening + (AvailabilityGrid.slot_count() - 1) * AvailabilityGrid.SLOT_LENGTH
+
+        tables = TableGroup.merge_floor(self.table_repository.get_all())
+        reservation_times = self.reservation_repository.get_reservation_times_by_range(
+            opening - ReservationTimeline.CONFLICT_WINDOW,
+            last_slot + ReservationTimeline.CONFLICT_WINDOW
+        )
+        return AvailabilityGrid.build(opening, tables, reservation_times)
+
+
+    def _invalidate(self, *reservations: Reservation, deleted: bool = False):
+        """
+        Bump every tag the reservations can appear under, leaving unrelated cache entries
+        warm, and notify in-process views once the write is committed.
+        """
+        if not reservations:
+            return
+
+        on_commit(lambda: reservations_changed.send(sender=ReservationService, reservations=reservations, deleted=deleted))
+
+        tags = [ALL_TAG]
+        for reservation in reservations:
+            reservation_day = timezone.localtime(self._as_aware(reservation.reservation_date)).date()
+            tags += [
+                f'reservation:{reservation.id}',
+                f'date:{reservation_day.isoformat()}',
+                self._filter_tag('email', reservation.email),
+                self._filter_tag('phone_number', reservation.phone_number),
+                self._filter_tag('name', reservation.name),
+                f'table:{reservation.table.number}',
+            ]
+
+        self.cache_generations.bump(*tags)
+
+
+    def _load_day(self, day: date) -> List[Reservation]:
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        return self.reservation_repository.get_by_range_with_tables(start, start + timedelta(days=1) - timedelta(microseconds=1))
+
+
+    def _day_generation(self, day: date) -> int:
+        return self.cache_generations.current(f'date:{day.isoformat()}')[0]
+
+
+    def _filter_tag(self, filter: str, value) -> str:
+        """Filters match on normalized columns, so tag them by the normalized value."""
+        if filter == "email":
+            value = Reservation.normalize_email(value)
+        elif filter == "phone_number":
+            value = Reservation.normalize_phone(value)
+        elif filter == "name":
+            value = Reservation.normalize_name(value)
+
+        return f'{filter}:{value}'
+
+
+    def _date_range_tags(self, start: date, end: date) -> List[str]:
+        days = (end - start).days + 1
+        if days > MAX_RANGE_TAG_DAYS:
+            return [ALL_TAG]
+
+        return [f'date:{(start + timedelta(days=offset)).isoformat()}' for offset in range(days)]
+
+
+def _local_day(reservation: Reservation) -> date:
+    reservation_date = reservation.reservation_date
+    if timezone.is_naive(reservation_date):
+        reservation_date = timezone.make_aware(reservation_date)
+    return timezone.localtime(reservation_date).date()
+
+
+@receiver(reservations_changed, dispatch_uid='today_reservations')
+def update_today_reservations(sender, reservations, deleted, days=(), **kwargs):
+    if timezone.localdate() in days:
+        today_reservations.clear()
+        return
+    today_reservations.apply(reservations, _local_day, deleted)
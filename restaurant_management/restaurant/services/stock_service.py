@@ -1,13 +1,20 @@
 from restaurant.repository.stock_repository import StockRepository
-from restaurant.services.domain.stock import Stock, StockTransaction
+from restaurant.services.domain.stock import Stock, StockTransaction, StockLot, LowStockAlert, StockSnapshot
+from restaurant.signals import low_stock_detected
 from restaurant.utils.result import Result
-from typing import Optional
-from restaurant.utils.exceptions import StockNotFoundError
+from typing import List, Optional
+from datetime import datetime, timedelta
+from restaurant.utils.exceptions import StockNotFoundError, DomainException
+from django.db.transaction import atomic, on_commit
+from django.utils import timezone
 from injector import inject
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Recorded as the employee on the withdrawal written when a stock is cleared
+CLEAR_EMPLOYEE_NAME = 'Stock clear'
+
 class StockService:
     @inject
     def __init__(self, stock_repository : StockRepository):
@@ -39,32 +46,90 @@ class StockService:
         )
         
         new_stock = self.stock_repository.create(new_stock)
+        self.refresh_low_stock([new_stock])
         
         logger.info(f"Stock for ingredient {ingredient.name} created successfully with ID {new_stock.id}.")
         return new_stock
 
 
     def clear_stock(self, id) -> Stock:
-        stock = self.stock_repository.get_by_id(id)
-        if not stock:
-            logger.warning(f"Stock with ID {id} not found.")
-            raise StockNotFoundError(f"Stock with ID {id} not found")
-
-        stock.clear()
-        self.stock_repository.update(stock)
+        with atomic():
+            stock = self.stock_repository.get_by_id_for_update(id)
+            if not stock:
+                logger.warning(f"Stock with ID {id} not found.")
+                raise StockNotFoundError(f"Stock with ID {id} not found")
+
+            cleared_quantity = stock.total_stock
+            stock.clear()
+            # The ledger stays the source of truth for as-of replays, so the clear is recorded as a withdrawal
+            if cleared_quantity > 0:
+                self.stock_repository.save_transaction(StockTransaction(
+                    ingredient_quantity=cleared_quantity,
+                    date=timezone.now(),
+                    employee_name=CLEAR_EMPLOYEE_NAME,
+                    transaction_type='OUT',
+                    stock=stock
+                ))
+            self.stock_repository.deplete_lots(stock.id)
+            self.stock_repository.update_totals([stock])
+            self.refresh_low_stock([stock])
         
         logger.info(f"Stock with ID {id} cleared successfully.")
         return stock
 
 
+    @atomic
     def add_transaction(self, stock: Stock, transaction: StockTransaction) -> Stock:
+        """
+        Apply the transaction to the stock row locked here and re-validate it
+        against the locked total, so concurrent transactions and inventory
+        postings never overwrite each other's totals.
+        """
+        stock = self.stock_repository.get_by_id_for_update(stock.id)
+        if stock is None:
+            raise DomainException(f"Stock with ID {transaction.stock.id} no longer exists")
+
+        validation_result = self.validate_transaction(stock, transaction)
+        if validation_result.is_failure():
+            raise DomainException(validation_result.get_error_msg())
+
+        transaction.stock = stock
         stock.add_transaction(transaction)
         self.stock_repository.save_transaction(transaction)
+
+        if transaction.is_stock_in():
+            self.stock_repository.create_lot(StockLot.from_transaction(stock, transaction, timezone.now()))
+        else:
+            open_lots = self.stock_repository.get_open_lots_for_update(stock.id)
+            consumed_lots = stock.consume_lots(open_lots, transaction.ingredient_quantity)
+            self.stock_repository.update_lots(consumed_lots)
         
-        updated_stock = self.stock_repository.update(stock)
+        self.stock_repository.update_totals([stock])
+        self.refresh_low_stock([stock])
         
         logger.info(f"Transaction added to stock with ID {stock.id}. Transaction ID: {transaction.id}")
-        return updated_stock
+        return stock
+
+
+    def get_stocks_as_of(self, as_of: datetime) -> List[StockSnapshot]:
+        return self.stock_repository.get_snapshots_as_of(as_of)
+
+
+    def take_snapshot(self) -> int:
+        taken_at = timezone.now()
+        snapshot_count = self.stock_repository.create_snapshot(taken_at)
+
+        logger.info(f"Snapshot of {snapshot_count} stocks taken at {taken_at}.")
+        return snapshot_count
+
+
+    def get_low_stock_alerts(self) -> List[LowStockAlert]:
+        return self.stock_repository.get_low_stock_alerts()
+
+
+    def get_expiring_lots(self, days: int) -> List[StockLot]:
+        until = timezone.now() + timedelta(days=days)
+        return self.stock_repository.get_expiring_lots(until)
 
 
     def delete_stock_by_id(self, id) -> bool:
@@ -85,4 +150,10 @@ class StockService:
         return Result.success(None)
 
 
+    def refresh_low_stock(self, stocks: List[Stock]):
+        flagged_ids = set(self.stock_repository.sync_low_stock_alerts(stocks))
 
+        for stock in stocks:
+            if stock.id in flagged_ids:
+                logger.warning(f"Stock with ID {stock.id} is below {Stock.LOW_STOCK_RATIO:%} of its optimal quantity.")
+                on_commit(lambda stock=stock: low_stock_detected.send(sender=StockService, stock=stock))
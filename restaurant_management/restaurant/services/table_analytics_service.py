@@ -0,0 +1,92 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+from restaurant.repository.order_repository import OrderRepository
+from restaurant.services.table_service import TableService
+from restaurant.services.domain.table_analytics import TableAnalytics, TurnoverAnalyzer
+from restaurant.utils.result import Result
+from django.core.cache import cache
+from django.utils import timezone
+from injector import inject
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_RANGE_DAYS = 366
+# Late payments and orders running past midnight still land on the previous day, so it stays open this long
+SETTLE_DAYS = 1
+
+
+class TableAnalyticsService:
+    @inject
+    def __init__(self, order_repository: OrderRepository, table_service: TableService):
+        self.order_repository = order_repository
+        self.table_service = table_service
+        self.analyzer = TurnoverAnalyzer()
+
+
+    def validate_range(self, start_date: date, end_date: date) -> Result:
+        if start_date > end_date:
+            return Result.error('start_date cannot be after end_date')
+
+        if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+            return Result.error(f'Range cannot be longer than {MAX_RANGE_DAYS} days')
+
+        return Result.success(None)
+
+
+    def get_table_analytics(self, start_date: date, end_date: date) -> TableAnalytics:
+        """
+        Turnover and revenue per table over the range. Closed days are computed
+        once and kept in cache; only open days and days never seen are read
+        from the orders, in one query. Tables and capacities are today's, as no
+        history of them is kept: past seat-hours use the current capacity and
+        days of tables deleted since then are left out.
+        """
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        last_closed = timezone.localdate() - timedelta(days=SETTLE_DAYS + 1)
+
+        cached = cache.get_many([self._day_key(day) for day in days if day <= last_closed])
+        daily = {day: cached[self._day_key(day)] for day in days if self._day_key(day) in cached}
+
+        missing = [day for day in days if day not in daily]
+        if missing:
+            computed = self._compute_days(missing)
+            daily.update(computed)
+            cache.set_many({self._day_key(day): computed[day] for day in missing if day <= last_closed}, timeout=None)
+            logger.info(f"Table analytics computed for {len(missing)} days, {len(days) - len(missing)} from cache.")
+
+        tables = self.table_service.get_all_tables(merge_groups=False)
+        empty = [0.0] * TurnoverAnalyzer.METRICS
+        matrix = np.array(
+            [[daily[day].get(table.id, empty) for table in tables] for day in days],
+            dtype=np.float64
+        ).reshape(len(days), len(tables), TurnoverAnalyzer.METRICS)
+
+        return self.analyzer.summarize(start_date, end_date, tables, matrix)
+
+
+    def _compute_days(self, days: List[date]) -> Dict[date, Dict[int, List[float]]]:
+        """Metrics per table id for each day, keeping only tables with activity so days stay small in cache."""
+        start = timezone.make_aware(datetime.combine(min(days), time.min))
+        end = timezone.make_aware(datetime.combine(max(days) + timedelta(days=1), time.min))
+
+        rows = [
+            (table_id, timezone.localtime(started), timezone.localtime(ended), paid_total)
+            for table_id, started, ended, paid_total in self.order_repository.get_completed_order_rows(start, end)
+        ]
+        table_ids = sorted({row[0] for row in rows})
+        matrix = self.analyzer.daily_matrix(days, table_ids, rows)
+
+        return {
+            day: {
+                table_id: matrix[day_index, table_index].tolist()
+                for table_index, table_id in enumerate(table_ids)
+                if matrix[day_index, table_index].any()
+            }
+            for day_index, day in enumerate(days)
+        }
+
+
+    def _day_key(self, day: date) -> str:
+        return f'table_analytics_{day.isoformat()}'
@@ -1,28 +1,126 @@
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, time, timedelta
+from time import sleep
+from typing import Dict, List, Optional
 from restaurant.services.domain.table import Table
+from restaurant.services.domain.table_group import TableGroup
+from restaurant.services.domain.reservation import Reservation
+from restaurant.services.domain.floor_state import FloorState, TableState
 from restaurant.repository.table_respository import TableRepository
+from restaurant.repository.order_repository import OrderRepository
+from restaurant.repository.waitlist_repository import WaitlistRepository
+from restaurant.repository.reservation_repository import ReservationRepository
+from restaurant.utils.cache_generations import CacheGenerations
+from restaurant.utils.result import Result
+from restaurant.utils.exceptions import DomainException
+from restaurant.signals import reservations_changed
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import ProtectedError
+from django.dispatch import receiver
+from django.utils import timezone
 from injector import inject
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bumped on every table, order, seating and reservation write; its value is the floor version
+FLOOR_TAG = 'floor'
+# Bumped only when tables are added, removed, resized, merged or split; reservation availability depends on it
+LAYOUT_TAG = 'layout'
+# Upcoming reservations depend on the clock too, so a version is rebuilt at least this often
+FLOOR_STATE_TIMEOUT = 60
+LOCK_RETRY_PASSES = 3
+LOCK_RETRY_DELAY = 0.01
+
+floor_generations = CacheGenerations('floor')
+
+
+@contextmanager
+def lock_tables(reservation_repository: ReservationRepository, tables: List[Table]):
+    """Hold the booking lock of every table (in id order), retrying a few times on contention."""
+    for attempt in range(LOCK_RETRY_PASSES):
+        with ExitStack() as stack:
+            acquired = all(
+                stack.enter_context(reservation_repository.try_lock_table(table.id))
+                for table in sorted(tables, key=lambda table: table.id)
+            )
+            if acquired:
+                yield
+                return
+
+        sleep(LOCK_RETRY_DELAY * (attempt + 1))
+
+    raise DomainException("Tables are being booked concurrently, please retry.")
+
 
 class TableService:
     @inject
-    def __init__(self, table_repository: TableRepository):
+    def __init__(
+        self,
+        table_repository: TableRepository,
+        order_repository: OrderRepository,
+        waitlist_repository: WaitlistRepository,
+        reservation_repository: ReservationRepository,
+    ):
         self.table_repository = table_repository
+        self.order_repository = order_repository
+        self.waitlist_repository = waitlist_repository
+        self.reservation_repository = reservation_repository
+
+
+    def get_floor_version(self) -> int:
+        return floor_generations.current(FLOOR_TAG)[0]
+
+
+    def get_floor_state(self) -> FloorState:
+        version = self.get_floor_version()
+        cache_key = f'floor_state_{version}'
+        floor = cache.get(cache_key)
+
+        if floor is None:
+            floor = self._build_floor_state(version)
+            cache.set(cache_key, floor, timeout=FLOOR_STATE_TIMEOUT)
+
+        return floor
+
+
+    def get_table_by_number(self, number : int) -> Optional[Table]:
+        """The table as it is seated; a merged table's number resolves to its whole group."""
+        state = self.get_floor_state().get(int(number))
+        return state.table if state else None
+
+
+    def get_all_tables(self, merge_groups: bool = True) -> List[Table]:
+        """Tables as they are seated, or with merge_groups=False every physical table on its own."""
+        floor = self.get_floor_state()
+        if not merge_groups:
+            return list(floor.layout)
+        return [state.table for state in floor.tables]
+
+
+    def set_as_available(self, number):
+        if self.table_repository.set_as_available(number):
+            self.mark_floor_changed()
+
 
+    def set_as_unavailable(self, number):
+        if self.table_repository.set_as_unavailable(number):
+            self.mark_floor_changed()
 
-    def get_table_by_number(self, number : int) -> Table:
-        return self.table_repository.get_by_id(number)
 
+    def mark_floor_changed(self):
+        # After commit, so a reader can never rebuild the new version from rows that are about to change
+        transaction.on_commit(lambda: floor_generations.bump(FLOOR_TAG))
 
-    def get_all_tables(self) -> list:
-        return self.table_repository.get_all()
+
+    def mark_layout_changed(self):
+        transaction.on_commit(lambda: floor_generations.bump(FLOOR_TAG, LAYOUT_TAG))
 
 
     def validate_unique_table_number(self, validated_data) -> bool:
         exisiting_table = self.table_repository.get_by_id(number= validated_data['number'])
-        
+
         return exisiting_table is None
 
 
@@ -34,17 +132,217 @@ class TableService:
         )
 
         created_table = self.table_repository.create(new_table)
-        
+        self.mark_layout_changed()
+
         logger.info(f"Table with number {created_table.number} and {created_table.capacity} seats created successfully.")
         return created_table
 
 
     def delete_table(self, number) -> bool:
         deleted = self.table_repository.delete(number)
-        
+
         if deleted:
+            self.mark_layout_changed()
             logger.info(f"Table with number {number} deleted successfully.")
         else:
             logger.warning(f"Failed to delete table with number {number}.")
-        
-        return deleted
\ No newline at end of file
+
+        return deleted
+
+
+    def validate_batch_create(self, tables_data: List[Dict]) -> Result:
+        numbers = [table_data['number'] for table_data in tables_data]
+
+        repeated = sorted({number for number in numbers if numbers.count(number) > 1})
+        if repeated:
+            return Result.error(f"Table numbers {repeated} are repeated")
+
+        existing = sorted(self.table_repository.get_existing_numbers(numbers))
+        if existing:
+            return Result.error(f"Tables with numbers {existing} already exist")
+
+        return Result.success(None)
+
+
+    def validate_batch_update(self, tables_data: List[Dict]) -> Result:
+        numbers = [table_data['number'] for table_data in tables_data]
+
+        repeated = sorted({number for number in numbers if numbers.count(number) > 1})
+        if repeated:
+            return Result.error(f"Table numbers {repeated} are repeated")
+
+        missing = sorted(set(numbers) - self.table_repository.get_existing_numbers(numbers))
+        if missing:
+            return Result.error(f"Tables with numbers {missing} not found")
+
+        return Result.success(None)
+
+
+    def create_tables(self, tables_data: List[Dict]) -> List[Table]:
+        new_tables = [
+            Table(number=table_data['number'], capacity=table_data['capacity'], is_available=True)
+            for table_data in tables_data
+        ]
+
+        with transaction.atomic():
+            created_tables = self.table_repository.create_many(new_tables)
+            self.mark_layout_changed()
+
+        logger.info(f"{len(created_tables)} tables created successfully.")
+        return created_tables
+
+
+    def update_capacities(self, tables_data: List[Dict]) -> Result:
+        """All or none: a merged table or a capacity below a booked party fails the batch."""
+        capacities = {table_data['number']: table_data['capacity'] for table_data in tables_data}
+        targets = [table for table in self.table_repository.get_all() if table.number in capacities]
+
+        with lock_tables(self.reservation_repository, targets):
+            # Re-read under the booking locks, the tables may have been merged or booked meanwhile
+            targets = [table for table in self.table_repository.get_all() if table.number in capacities]
+
+            grouped = sorted(table.number for table in targets if table.group_id is not None)
+            if grouped:
+                return Result.error(f"Tables with numbers {grouped} are merged, split them first")
+
+            largest_parties = self._largest_booked_parties([table.id for table in targets])
+            too_small = sorted(
+                table.number for table in targets
+                if largest_parties.get(table.id, 0) > capacities[table.number]
+            )
+            if too_small:
+                return Result.error(f"Tables with numbers {too_small} have reservations larger than the new capacity")
+
+            with transaction.atomic():
+                updated = self.table_repository.update_capacities(capacities)
+                self.mark_layout_changed()
+
+        logger.info(f"Capacity of {updated} tables updated successfully.")
+        return Result.success(updated)
+
+
+    def delete_tables(self, numbers: List[int]) -> Result:
+        """All or none: any table missing, merged or still referenced by orders or reservations fails the batch."""
+        tables = {table.number: table for table in self.table_repository.get_all()}
+
+        missing = sorted(set(numbers) - set(tables))
+        if missing:
+            return Result.error(f"Tables with numbers {missing} not found")
+
+        grouped = sorted(number for number in set(numbers) if tables[number].group_id is not None)
+        if grouped:
+            return Result.error(f"Tables with numbers {grouped} are merged, split them first")
+
+        try:
+            with transaction.atomic():
+                deleted = self.table_repository.delete_many(list(set(numbers)))
+                self.mark_layout_changed()
+        except ProtectedError:
+            raise DomainException(f"Tables with numbers {sorted(set(numbers))} have orders or reservations")
+
+        logger.info(f"{deleted} tables deleted successfully.")
+        return Result.success(deleted)
+
+
+    def merge_tables(self, numbers: List[int]) -> Result:
+        """
+        Group the tables under the lowest number, which keeps its bookings; the
+        other tables must have none left, since the group seats as one table.
+        """
+        tables = self.table_repository.get_all()
+        merge_result = TableGroup.validate_merge(tables, numbers)
+        if merge_result.is_failure():
+            return merge_result
+
+        members = TableGroup(None, [table for table in tables if table.number in set(numbers)])
+
+        # Booking locks keep a concurrent reservation off the members between the check and the merge
+        with lock_tables(self.reservation_repository, members.tables):
+            booked = self.reservation_repository.get_booked_parties_by_tables(
+                [table.id for table in members.tables[1:]],
+                timezone.now() - Reservation.NO_SHOW_GRACE
+            )
+            if booked:
+                booked_ids = {table_id for table_id, _ in booked}
+                booked_numbers = [table.number for table in members.tables if table.id in booked_ids]
+                return Result.error(f"Tables with numbers {booked_numbers} have upcoming reservations")
+
+            with transaction.atomic():
+                members.id = self.table_repository.create_group(members.table_numbers)
+                self.mark_layout_changed()
+
+        logger.info(f"{members} merged into group {members.id}.")
+        return Result.success(members)
+
+
+    def split_group(self, group_id: int) -> Result:
+        """Give the group's tables back; refused while the group is seated or its lead is booked beyond its own size."""
+        tables = self._get_group_tables(group_id)
+        if not tables:
+            return Result.error(f"Table group with ID {group_id} not found")
+
+        with lock_tables(self.reservation_repository, tables):
+            # Re-read under the booking locks, a booking may have landed on the lead meanwhile
+            tables = self._get_group_tables(group_id)
+            if not tables:
+                return Result.error(f"Table group with ID {group_id} not found")
+
+            group = TableGroup(group_id, tables)
+            if not group.as_table().is_available:
+                return Result.error(f"{group} is occupied")
+
+            largest_party = self._largest_booked_parties([group.lead.id]).get(group.lead.id, 0)
+            if largest_party > group.lead.capacity:
+                return Result.error(f"{group} has a reservation for {largest_party} people")
+
+            with transaction.atomic():
+                self.table_repository.delete_group(group_id)
+                self.mark_layout_changed()
+
+        logger.info(f"Table group {group_id} split into tables {group.table_numbers}.")
+        return Result.success(group)
+
+
+    def _get_group_tables(self, group_id: int) -> List[Table]:
+        return [table for table in self.table_repository.get_all() if table.group_id == group_id]
+
+
+    def _largest_booked_parties(self, table_ids: List[int]) -> Dict[int, int]:
+        """Largest party per table among the bookings still expected there."""
+        largest = {}
+        booked = self.reservation_repository.get_booked_parties_by_tables(table_ids, timezone.now() - Reservation.NO_SHOW_GRACE)
+        for table_id, party in booked:
+            largest[table_id] = max(largest.get(table_id, 0), party)
+        return largest
+
+
+    def _build_floor_state(self, version: int) -> FloorState:
+        """Tables, open orders, today's seatings and today's reservations: four queries per floor version."""
+        now = timezone.now()
+        day_start = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        day_end = day_start + timedelta(days=1)
+
+        floor = FloorState.build(
+            version=version,
+            tables=self.table_repository.get_all(),
+            open_orders=self.order_repository.get_open_orders_by_table(),
+            seatings=self.waitlist_repository.get_seatings_since(day_start),
+            reservations=self.reservation_repository.get_by_range_with_tables(day_start, day_end),
+            now=now
+        )
+        logger.info(f"{floor} built.")
+        return floor
+
+
+@receiver(reservations_changed, dispatch_uid='floor_state')
+def invalidate_floor_state(sender, reservations, **kwargs):
+    """The floor only shows today's reservations, so bookings for other days leave it warm."""
+    today = timezone.localdate()
+    for reservation in reservations:
+        reservation_date = reservation.reservation_date
+        if timezone.is_naive(reservation_date):
+            reservation_date = timezone.make_aware(reservation_date)
+
+        if timezone.localtime(reservation_date).date() == today:
+            floor_generations.bump(FLOOR_TAG)
+            return
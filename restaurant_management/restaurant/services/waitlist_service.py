@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from restaurant.repository.waitlist_repository import WaitlistRepository
+from restaurant.services.table_service import TableService
+from restaurant.repository.order_repository import OrderRepository
+from restaurant.repository.reservation_repository import ReservationRepository
+from restaurant.services.domain.waitlist import WaitlistEntry, WaitTimeEstimator
+from restaurant.services.domain.reservation import Reservation
+from restaurant.services.domain.reservation_timeline import ReservationTimeline
+from restaurant.services.domain.table import Table
+from restaurant.signals import waitlist_party_suggested
+from restaurant.utils.result import Result
+from django.core.cache import cache
+from django.utils import timezone
+from injector import inject
+import logging
+
+logger = logging.getLogger(__name__)
+
+TURNOVER_HISTORY_DAYS = 30
+# Bookings further out than this do not change a walk-in's wait
+BOOKING_HORIZON = timedelta(hours=6)
+
+
+class WaitlistService:
+    @inject
+    def __init__(
+        self,
+        waitlist_repository: WaitlistRepository,
+        table_service: TableService,
+        order_repository: OrderRepository,
+        reservation_repository: ReservationRepository,
+    ):
+        self.waitlist_repository = waitlist_repository
+        self.table_service = table_service
+        self.order_repository = order_repository
+        self.reservation_repository = reservation_repository
+
+
+    def get_entry_by_id(self, entry_id) -> Optional[WaitlistEntry]:
+        return self.waitlist_repository.get_by_id(entry_id)
+
+
+    def get_waiting(self) -> List[WaitlistEntry]:
+        entries = self.waitlist_repository.get_waiting()
+        return self._estimate(entries)
+
+
+    def add_party(self, validated_data) -> WaitlistEntry:
+        entry = WaitlistEntry(
+            name=validated_data['name'],
+            phone_number=validated_data.get('phone_number') or '',
+            party_size=validated_data['party_size'],
+            arrived_at=timezone.now()
+        )
+        entry = self.waitlist_repository.create(entry)
+        logger.info(f"Party {entry.name} of {entry.party_size} added to the waitlist with ID {entry.id}.")
+
+        waiting = self._estimate(self.waitlist_repository.get_waiting())
+        return next((waiting_entry for waiting_entry in waiting if waiting_entry.id == entry.id), entry)
+
+
+    def suggest_for_table(self, table: Table) -> Optional[WaitlistEntry]:
+        """
+        Best waiting party for a table that just freed up: the largest that fits,
+        then the longest waiting. Nobody is suggested when the table is booked
+        before a party seated now would be done.
+        """
+        now = timezone.now()
+        estimator = WaitTimeEstimator(self._get_turnover())
+        if estimator.seatable_at(table, now, self._get_bookings([table], now)) > now:
+            logger.info(f"Table {table.number} is free but held for an upcoming reservation.")
+            return None
+
+        entry = self.waitlist_repository.get_best_fit(table.capacity)
+        if entry is None:
+            return None
+
+        logger.info(f"Table {table.number} is free, suggested waiting party {entry.name} of {entry.party_size}.")
+        waitlist_party_suggested.send(sender=WaitlistService, table=table, entry=entry)
+        return entry
+
+
+    def validate_seating(self, entry: WaitlistEntry, table: Table) -> Result:
+        seating_result = entry.validate_seating(table)
+        if seating_result.is_failure():
+            return seating_result
+
+        if not table.is_available:
+            return Result.error(f"Table {table.number} is not available")
+
+        return Result.success(None)
+
+
+    def seat(self, entry: WaitlistEntry, table: Table) -> WaitlistEntry:
+        entry.seat(table, timezone.now())
+        self.waitlist_repository.update(entry)
+        self.table_service.mark_floor_changed()
+        logger.info(f"Waitlist entry {entry.id} seated at table {table.number}.")
+        return entry
+
+
+    def cancel(self, entry: WaitlistEntry) -> WaitlistEntry:
+        entry.cancel()
+        self.waitlist_repository.update(entry)
+        logger.info(f"Waitlist entry {entry.id} cancelled.")
+        return entry
+
+
+    def _estimate(self, entries: List[WaitlistEntry]) -> List[WaitlistEntry]:
+        if not entries:
+            return entries
+
+        now = timezone.now()
+        estimator = WaitTimeEstimator(self._get_turnover())
+        occupied_since = self.order_repository.get_open_order_starts()
+
+        tables = [
+            (table, estimator.next_free_at(table, occupied_since.get(table.id), now))
+            for table in self.table_service.get_all_tables()
+        ]
+        bookings = self._get_bookings([table for table, _ in tables], now)
+        return estimator.estimate(tables, entries, now, bookings)
+
+
+    def _get_bookings(self, tables: List[Table], now: datetime) -> ReservationTimeline:
+        """Upcoming bookings on the tables; a late party still inside its grace period holds its table from now."""
+        reservation_times = self.reservation_repository.get_reservation_times_by_tables(
+            [table.id for table in tables],
+            now - Reservation.NO_SHOW_GRACE,
+            now + BOOKING_HORIZON,
+            statuses=(Reservation.Status.BOOKED,)
+        )
+        return ReservationTimeline.from_reservations(
+            (table_id, max(reservation_date, now)) for table_id, reservation_date in reservation_times
+        )
+
+
+    def _get_turnover(self):
+        turnover = cache.get('table_turnover')
+
+        if turnover is None:
+            since = timezone.now() - timedelta(days=TURNOVER_HISTORY_DAYS)
+            turnover = self.order_repository.get_turnover_by_capacity(since)
+            cache.set('table_turnover', turnover, timeout=3600)
+
+        return turnover
@@ -0,0 +1,15 @@
+from django.dispatch import Signal
+
+# Sent after commit when a stock first drops below Stock.LOW_STOCK_RATIO of its
+# optimal quantity. Receivers get `stock`; hook push notifications in here.
+low_stock_detected = Signal()
+
+# Sent after commit for every reservation write made through ReservationService.
+# Receivers get `reservations` (domain objects as written) and `deleted`. Bulk
+# writes that never load their rows (the no-show sweep) send no reservations
+# and the affected local `days` instead.
+reservations_changed = Signal()
+
+# Sent when an order frees a table and a waiting party fits it.
+# Receivers get `table` and `entry` (the suggested WaitlistEntry).
+waitlist_party_suggested = Signal()
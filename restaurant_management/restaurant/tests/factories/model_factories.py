@@ -2,7 +2,7 @@ import factory
 from factory.django import DjangoModelFactory
 from django.utils import timezone
 from faker import Faker
-from restaurant.repository.models.models import MenuItemModel, MenuExtra, TableModel, ReservationModel, IngredientModel, StockModel, StockTransactionModel, PaymentModel, OrderItem, OrderModel
+from restaurant.repository.models.models import MenuItemModel, MenuExtra, TableModel, ReservationModel, IngredientModel, StockModel, StockTransactionModel, PaymentModel, OrderItemModel, OrderModel
 
 fake = Faker()
 
@@ -99,7 +99,7 @@ class OrderFactory(DjangoModelFactory):
 
 class OrderItemFactory(DjangoModelFactory):
     class Meta:
-        model = OrderItem
+        model = OrderItemModel
 
     order = factory.SubFactory(OrderFactory)
     menu_item = factory.SubFactory(MenuItemFactory)
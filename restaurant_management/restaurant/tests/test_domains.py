@@ -1,9 +1,21 @@
 import unittest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from random import Random
+from time import perf_counter
+import numpy as np
 from restaurant.services.domain.ingredient import Ingredient
 from restaurant.services.domain.table import Table
 from restaurant.services.domain.reservation import Reservation
+from restaurant.services.domain.forecast import ConsumptionForecaster
+from restaurant.services.domain.reservation_availability import AvailabilityGrid
+from restaurant.services.domain.reservation_timeline import ReservationTimeline
+from restaurant.services.domain.table_allocation import TableAllocator
+from restaurant.services.domain.table_analytics import TurnoverAnalyzer
+from restaurant.services.domain.menu_item import MenuItem
+from restaurant.services.domain.menu_catalog_diff import MenuCatalogDiff
+from restaurant.services.domain.menu_search import MenuSearchIndex
+from restaurant.services.domain.waitlist import WaitlistEntry, WaitTimeEstimator
 from restaurant.tests.factories.model_factories import TableFactory, ReservationFactory
 from restaurant.mappers.reservation_mappers import ReservationMapper
 
@@ -147,3 +159,183 @@ class TestReservation(unittest.TestCase):
         result = reservation.validate_customer_limit()
         self.assertTrue(result.is_failure())
         self.assertEqual(result.get_error_msg(), "Reservation can't be above 8 customers")
+
+
+class TestConsumptionForecaster(unittest.TestCase):
+    def test_rows_of_unknown_stocks_are_dropped(self):
+        today = date(2025, 3, 3)
+        forecaster = ConsumptionForecaster(history_days=7, moving_average_days=7)
+        day = np.datetime64(today - timedelta(days=1), 'D')
+
+        daily = forecaster.daily_matrix(
+            np.array([3, 5], dtype=np.int64), np.array([3, 4, 5, 9], dtype=np.int64),
+            np.array([day] * 4), np.array([1.0, 10.0, 2.0, 20.0]), today
+        )
+        self.assertEqual(daily.sum(axis=1).tolist(), [1.0, 2.0])
+
+
+class TestAvailabilityGrid(unittest.TestCase):
+    def setUp(self):
+        self.opening = datetime(2025, 3, 6, AvailabilityGrid.OPENING_HOUR)
+        tables = [Table(id=1, number=1, capacity=2), Table(id=2, number=2, capacity=6)]
+        self.grid = AvailabilityGrid.build(self.opening, tables, [(2, self._at(18)), (9, self._at(13))])
+
+    def _at(self, hour, minute=0):
+        return self.opening.replace(hour=hour, minute=minute)
+
+    def test_booking_blocks_its_conflict_window(self):
+        starts = [slot.start for slot in self.grid.free_slots(4)]
+
+        self.assertEqual(starts[0], self._at(12))
+        self.assertIn(self._at(15, 30), starts)
+        self.assertNotIn(self._at(16), starts)
+        self.assertNotIn(self._at(20), starts)
+        self.assertEqual(len(starts), AvailabilityGrid.slot_count() - 9)
+
+    def test_slots_count_the_tables_that_fit(self):
+        slots = {slot.start: slot.available_tables for slot in self.grid.free_slots(2)}
+
+        self.assertEqual(list(slots), self.grid.slot_starts())
+        self.assertEqual((slots[self._at(13)], slots[self._at(18)]), (2, 1))
+        self.assertEqual(self.grid.free_slots(7), [])
+
+
+class TestTableAllocator(unittest.TestCase):
+    def test_allocator_packs_a_busy_day_quickly(self):
+        random = Random(7)
+        noon = datetime(2025, 3, 6, 12)
+        capacities = [2] * 14 + [4] * 14 + [6] * 8 + [8] * 4
+        tables = [Table(id=index + 1, number=index + 1, capacity=capacity) for index, capacity in enumerate(capacities)]
+        bookings = [
+            Reservation(
+                name="Guest", email="guest@example.com", phone_number="555",
+                customer_number=random.randint(1, 8), reservation_date=noon + timedelta(minutes=30 * random.randrange(20))
+            )
+            for _ in range(300)
+        ]
+
+        started = perf_counter()
+        assignments = TableAllocator(tables).allocate([], bookings)
+        self.assertLess(perf_counter() - started, 1)
+
+        seated = [(table.id, booking.reservation_date) for booking, table in zip(bookings, assignments) if table is not None]
+        for table_id, start in seated:
+            conflicts = [other for other_id, other in seated if other_id == table_id and abs(other - start) <= timedelta(hours=2)]
+            self.assertEqual(len(conflicts), 1)
+        self.assertTrue(all(table is None or table.capacity >= booking.customer_number for booking, table in zip(bookings, assignments)))
+        self.assertGreater(TableAllocator.seated_covers(bookings, assignments), 0)
+
+
+class TestMenuCatalogDiff(unittest.TestCase):
+    def setUp(self):
+        self.current = [
+            MenuItem(1, 'Burger', Decimal('9.50'), 'MEALS', 'Beef'),
+            MenuItem(2, 'Soda', Decimal('2.00'), 'DRINKS', 'Cola'),
+        ]
+
+    def test_items_are_matched_by_id_then_name(self):
+        changes = MenuCatalogDiff.diff(self.current, [
+            MenuItem(1, 'burger', Decimal('10.50'), 'MEALS', 'Beef'),
+            MenuItem(None, 'SODA', Decimal('2.00'), 'DRINKS', 'Cola'),
+            MenuItem(None, 'Flan', Decimal('4.00'), 'DESSERTS', 'Vanilla'),
+        ])
+
+        self.assertTrue(changes.is_valid())
+        self.assertEqual([(item.id, item.name, item.price) for item in changes.updated], [(1, 'burger', Decimal('10.50')), (2, 'SODA', Decimal('2.00'))])
+        self.assertEqual([(item.id, item.name) for item in changes.created], [(None, 'Flan')])
+        self.assertEqual(self.current[0].price, Decimal('9.50'))
+
+    def test_invalid_rows_are_reported(self):
+        changes = MenuCatalogDiff.diff(self.current, [
+            MenuItem(None, 'Flan', Decimal('4.00'), 'DESSERTS'),
+            MenuItem(2, 'Soda', Decimal('0'), 'DRINKS', 'Cola'),
+            MenuItem(999, 'Ghost', Decimal('1.00'), 'DRINKS'),
+            MenuItem(None, 'FLAN', Decimal('5.00'), 'DESSERTS'),
+        ])
+
+        self.assertFalse(changes.is_valid())
+        self.assertEqual([row for row, _ in changes.errors], [1, 2, 3])
+        self.assertEqual(str(changes), '1 created, 0 updated, 0 unchanged')
+
+
+class TestTurnoverAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = TurnoverAnalyzer()
+        self.day = date(2025, 3, 3)
+        self.tables = [Table(id=1, number=1, capacity=4), Table(id=2, number=2, capacity=2)]
+
+    def _at(self, hour, minute=0, day=None):
+        day = day or self.day
+        return datetime(day.year, day.month, day.day, hour, minute)
+
+    def test_shifts_split_at_their_boundaries(self):
+        self.assertEqual(self.analyzer.shift_index(np.array([9, 12, 16, 17, 21])).tolist(), [0, 0, 0, 1, 1])
+
+    def test_orders_fold_into_turns_seat_time_and_revenue(self):
+        matrix = self.analyzer.daily_matrix([self.day], [1, 2], [
+            (1, self._at(13), self._at(14, 30), 100.0),
+            (1, self._at(19), self._at(20), 50.0),
+            (3, self._at(13), self._at(14), 80.0),
+            (2, self._at(13, day=self.day + timedelta(days=1)), self._at(14, day=self.day + timedelta(days=1)), 80.0),
+        ])
+        self.assertEqual(matrix[0, 0].tolist(), [1.0, 1.0, 9000.0, 150.0])
+        self.assertEqual(matrix[0, 1].tolist(), [0.0, 0.0, 0.0, 0.0])
+
+        analytics = self.analyzer.summarize(self.day, self.day, self.tables, matrix)
+        busy, idle = analytics.tables
+        self.assertEqual((busy.turns, busy.average_seat_minutes, busy.revenue, busy.revenue_per_seat_hour), (2, 75.0, 150.0, 3.75))
+        self.assertEqual((idle.turns, idle.average_seat_minutes), (0, None))
+        self.assertEqual(analytics.turns_per_shift, {'LUNCH': 0.5, 'DINNER': 0.5})
+
+
+class TestWaitTimeEstimator(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2025, 3, 3, 19)
+
+    def _estimate(self, bookings=()):
+        estimator = WaitTimeEstimator({4: timedelta(minutes=90), 2: timedelta(minutes=45)})
+        tables = [
+            (Table(id=1, number=1, capacity=2, is_available=False), self.now + timedelta(minutes=5)),
+            (Table(id=2, number=2, capacity=4, is_available=False), self.now + timedelta(minutes=30)),
+        ]
+        entries = [
+            WaitlistEntry(name=name, party_size=party_size, arrived_at=self.now - timedelta(minutes=minutes_ago), id=index)
+            for index, (name, party_size, minutes_ago) in enumerate((("Pair", 2, 20), ("Quad", 4, 10), ("Second pair", 2, 5)))
+        ]
+        estimator.estimate(tables, entries, self.now, ReservationTimeline.from_reservations(bookings))
+        return [entry.estimated_wait for entry in entries]
+
+    def test_wait_estimates_follow_turnover(self):
+        # two-top frees in 5 minutes, four-top in 30, then the two-top again 45 minutes after the first pair sits
+        self.assertEqual(self._estimate(), [timedelta(minutes=5), timedelta(minutes=30), timedelta(minutes=50)])
+
+    def test_wait_estimates_keep_booked_tables_for_their_booking(self):
+        # a booking at the four-top in an hour leaves no room for a 90 minute turn before it
+        waits = self._estimate(bookings=[(2, self.now + timedelta(minutes=60))])
+        self.assertEqual(waits, [timedelta(minutes=5), timedelta(minutes=150), timedelta(minutes=50)])
+
+
+class TestMenuSearchIndex(unittest.TestCase):
+    def setUp(self):
+        names = [
+            (1, 'Cheese Burger', 'MEALS'), (2, 'Burrito', 'MEALS'), (3, 'Burger Sauce', 'EXTRAS'),
+            (4, 'Burger', 'MEALS'), (5, 'Churros', 'DESSERTS'), (6, 'Lemonade', 'DRINKS'),
+        ]
+        self.index = MenuSearchIndex([MenuItem(id, name, '10.00', category) for id, name, category in names])
+
+    def _search(self, term, limit=10):
+        return [item.name for item in self.index.search(term, limit)]
+
+    def test_name_prefix_ranks_before_word_prefix(self):
+        self.assertEqual(self._search('burg'), ['Burger', 'Burger Sauce', 'Cheese Burger', 'Burrito'])
+
+    def test_ties_follow_menu_sections(self):
+        self.assertEqual(self._search('bur')[:3], ['Burger', 'Burrito', 'Burger Sauce'])
+
+    def test_typos_match_by_trigrams(self):
+        self.assertEqual(self._search('lemonada'), ['Lemonade'])
+        self.assertEqual(self._search('xyz'), [])
+        self.assertEqual(self._search('  '), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self._search('bur', limit=2)), 2)
@@ -0,0 +1,1309 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+import json
+import tempfile
+import threading
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from restaurant.repository.models.models import (
+    IngredientModel, StockModel, StockLotModel, LowStockAlertModel, StockTransactionModel, StockSnapshotModel,
+    TableModel, ReservationModel, OrderModel, WaitlistEntryModel, PaymentModel, MenuItemModel, MenuExtra as MenuExtraModel
+)
+from restaurant.repository.stock_repository import StockRepository
+from restaurant.repository.inventory_count_repository import InventoryCountRepository
+from restaurant.repository.reservation_repository import ReservationRepository
+from restaurant.repository.order_repository import OrderRepository
+from restaurant.repository.table_respository import TableRepository
+from restaurant.repository.waitlist_repository import WaitlistRepository
+from restaurant.repository.menu_item_repository import MenuItemRepository
+from restaurant.repository.menu_extra_repository import MenuExtraRepository
+from restaurant.repository.payment_repository import PaymentRepository
+from restaurant.mappers.order_mappers import OrderItemMappers
+from restaurant.services.domain.stock import StockTransaction
+from restaurant.services.domain.reservation import Reservation
+from restaurant.services.domain.reservation_book import DailyReservationBook
+from restaurant.services.domain.reservation_import import ReservationImportRow
+from restaurant.services.domain.menu_snapshot import MenuSnapshotHolder
+from restaurant.services.domain.menu_search import MenuSearchIndex
+from restaurant.services.domain.menu_item import MenuItem
+from restaurant.services.domain.menu_extra import MenuExtra
+from restaurant.services.domain.payment import Payment
+from restaurant.services.domain.order import Order
+from restaurant.services.stock_service import StockService
+from restaurant.services.forecast_service import ForecastService
+from restaurant.services.inventory_count_service import InventoryCountService
+from restaurant.services.reservation_service import ReservationService, today_reservations
+from restaurant.services.order_service import OrderService
+from restaurant.services.waitlist_service import WaitlistService
+from restaurant.services.table_service import TableService
+from restaurant.services.table_analytics_service import TableAnalyticsService
+from restaurant.services.menu_service import MenuItemService, menu_snapshot
+from restaurant.services.payment_service import PaymentService
+from restaurant.signals import low_stock_detected, reservations_changed, waitlist_party_suggested
+from restaurant.utils.exceptions import DomainException
+
+
+class StockServiceLotTest(TestCase):
+    def setUp(self):
+        ingredient = IngredientModel.objects.create(name="Tomato", unit="kg")
+        stock_model = StockModel.objects.create(ingredient=ingredient, total_stock=0, optimal_stock_quantity=100)
+
+        self.stock_service = StockService(StockRepository())
+        self.stock = self.stock_service.get_stock_by_id(stock_model.id)
+        self.now = timezone.now()
+
+    def _add(self, transaction_type, quantity, date, expires_at=None):
+        transaction = StockTransaction(
+            ingredient_quantity=quantity,
+            date=date,
+            employee_name="Tester",
+            transaction_type=transaction_type,
+            expires_at=expires_at,
+            stock=self.stock
+        )
+        self.stock = self.stock_service.add_transaction(self.stock, transaction)
+
+    def _posted_on_their_dates(self):
+        StockTransactionModel.objects.update(recorded_at=F('date'))
+
+    def test_stock_in_creates_lot(self):
+        self._add('IN', 5, self.now, self.now + timedelta(days=2))
+
+        lot = StockLotModel.objects.get(stock_id=self.stock.id)
+        self.assertEqual(lot.initial_quantity, 5)
+        self.assertEqual(lot.remaining_quantity, 5)
+
+    def test_stock_out_consumes_oldest_lots_first(self):
+        self._add('IN', 5, self.now - timedelta(days=2), self.now + timedelta(days=1))
+        self._add('IN', 5, self.now - timedelta(days=1), self.now + timedelta(days=10))
+        self._add('OUT', 7, self.now)
+
+        remaining = list(StockLotModel.objects.order_by('received_at').values_list('remaining_quantity', flat=True))
+        self.assertEqual(remaining, [0, 3])
+        self.assertEqual(self.stock.total_stock, 3)
+
+    def test_backdated_stock_in_queues_behind_earlier_lots(self):
+        self._add('IN', 5, self.now)
+        self._add('IN', 5, self.now - timedelta(days=10))
+        self._add('OUT', 5, self.now)
+
+        remaining = list(StockLotModel.objects.order_by('id').values_list('remaining_quantity', flat=True))
+        self.assertEqual(remaining, [0, 5])
+
+    def test_stale_stock_does_not_overwrite_the_total(self):
+        stale_stock = self.stock_service.get_stock_by_id(self.stock.id)
+        self._add('IN', 10, self.now)
+
+        updated = self.stock_service.add_transaction(stale_stock, StockTransaction(
+            ingredient_quantity=5, date=self.now, employee_name="Tester", transaction_type='IN', stock=stale_stock
+        ))
+
+        self.assertEqual(updated.total_stock, 15)
+        self.assertEqual(StockModel.objects.get(id=self.stock.id).total_stock, 15)
+        with self.assertRaises(DomainException):
+            self.stock_service.add_transaction(stale_stock, StockTransaction(
+                ingredient_quantity=20, date=self.now, employee_name="Tester", transaction_type='OUT', stock=stale_stock
+            ))
+
+    def test_expiring_lots_skip_depleted_and_later_lots(self):
+        self._add('IN', 5, self.now - timedelta(days=3), self.now + timedelta(days=1))
+        self._add('IN', 5, self.now - timedelta(days=2), self.now + timedelta(days=2))
+        self._add('IN', 5, self.now - timedelta(days=1), self.now + timedelta(days=30))
+        self._add('OUT', 5, self.now)
+
+        expiring = self.stock_service.get_expiring_lots(3)
+
+        self.assertEqual(len(expiring), 1)
+        self.assertEqual(expiring[0].remaining_quantity, 5)
+        self.assertEqual(expiring[0].ingredient.name, "Tomato")
+
+    def test_low_stock_projection_follows_adjustments(self):
+        flagged = []
+        receiver = lambda sender, stock, **kwargs: flagged.append(stock.id)
+        low_stock_detected.connect(receiver)
+        self.addCleanup(low_stock_detected.disconnect, receiver)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add('IN', 50, self.now)
+        self.assertFalse(LowStockAlertModel.objects.filter(stock_id=self.stock.id).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add('OUT', 30, self.now)
+        alert = LowStockAlertModel.objects.get(stock_id=self.stock.id)
+        self.assertEqual(alert.total_stock, 20)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add('OUT', 5, self.now)
+        self.assertEqual(LowStockAlertModel.objects.get(stock_id=self.stock.id).total_stock, 15)
+        self.assertEqual(flagged, [self.stock.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add('IN', 40, self.now)
+        self.assertEqual(self.stock_service.get_low_stock_alerts(), [])
+
+    def test_stocks_as_of_replays_ledger_after_latest_snapshot(self):
+        self._add('IN', 10, self.now - timedelta(days=3))
+        StockSnapshotModel.objects.create(stock_id=self.stock.id, total_stock=10, taken_at=self.now - timedelta(days=2))
+        self._add('OUT', 4, self.now - timedelta(days=1))
+        self._add('IN', 5, self.now)
+        self._posted_on_their_dates()
+        StockModel.objects.filter(id=self.stock.id).update(created_at=self.now - timedelta(days=10))
+
+        as_of = self.stock_service.get_stocks_as_of(self.now - timedelta(hours=12))
+        self.assertEqual([snapshot.total_stock for snapshot in as_of], [6])
+
+        StockSnapshotModel.objects.all().delete()
+        as_of = self.stock_service.get_stocks_as_of(self.now - timedelta(days=2))
+        self.assertEqual([snapshot.total_stock for snapshot in as_of], [10])
+
+    def test_cleared_stock_is_replayed_from_the_ledger(self):
+        self._add('IN', 10, self.now - timedelta(days=1))
+        self._posted_on_their_dates()
+        StockSnapshotModel.objects.create(stock_id=self.stock.id, total_stock=10, taken_at=self.now - timedelta(hours=1))
+        StockModel.objects.filter(id=self.stock.id).update(created_at=self.now - timedelta(days=10))
+
+        self.stock_service.clear_stock(self.stock.id)
+
+        as_of = self.stock_service.get_stocks_as_of(timezone.now())
+        self.assertEqual([snapshot.total_stock for snapshot in as_of], [0])
+        self.assertFalse(StockLotModel.objects.filter(stock_id=self.stock.id, remaining_quantity__gt=0).exists())
+
+    def test_backdated_transaction_posted_after_a_snapshot_is_replayed(self):
+        self._add('IN', 10, self.now - timedelta(days=1))
+        self._posted_on_their_dates()
+        StockSnapshotModel.objects.create(stock_id=self.stock.id, total_stock=10, taken_at=self.now - timedelta(hours=1))
+        StockModel.objects.filter(id=self.stock.id).update(created_at=self.now - timedelta(days=10))
+
+        self._add('OUT', 3, self.now - timedelta(hours=2))
+        self._add('OUT', 2, self.now + timedelta(hours=1))
+
+        as_of = self.stock_service.get_stocks_as_of(self.now - timedelta(minutes=30))
+        self.assertEqual([snapshot.total_stock for snapshot in as_of], [7])
+
+
+class ForecastServiceTest(TestCase):
+    def setUp(self):
+        self.today = date(2025, 3, 3)  # Monday
+        ingredient = IngredientModel.objects.create(name="Flour", unit="kg")
+        self.stock = StockModel.objects.create(ingredient=ingredient, total_stock=30, optimal_stock_quantity=100)
+        idle_ingredient = IngredientModel.objects.create(name="Saffron", unit="g")
+        self.idle_stock = StockModel.objects.create(ingredient=idle_ingredient, total_stock=5, optimal_stock_quantity=10)
+
+        # Eight weeks of 2 units a day, 9 on Saturdays
+        for offset in range(1, 57):
+            day = self.today - timedelta(days=offset)
+            StockTransactionModel.objects.create(
+                stock=self.stock,
+                ingredient_quantity=9 if day.weekday() == 5 else 2,
+                transaction_type='OUT',
+                date=timezone.make_aware(timezone.datetime(day.year, day.month, day.day, 12)),
+            )
+
+        self.forecast_service = ForecastService(StockRepository())
+
+    def test_forecast_uses_weekday_seasonality(self):
+        forecasts = self.forecast_service.forecast_stocks(self.today)
+        forecast = next(f for f in forecasts if f.stock_id == self.stock.id)
+
+        self.assertAlmostEqual(forecast.average_daily_consumption, 3.0, places=1)
+        self.assertGreater(forecast.weekday_daily_consumption[5], forecast.weekday_daily_consumption[0])
+        # Tue..Fri 2 each, Sat 9, Sun 2, Mon 2 -> 21 by Monday, 30 reached on the following Saturday
+        self.assertEqual(forecast.days_until_stockout, 12)
+        self.assertEqual(forecast.stockout_date, self.today + timedelta(days=12))
+
+    def test_stock_without_consumption_never_runs_out(self):
+        forecasts = self.forecast_service.forecast_stocks(self.today)
+
+        self.assertEqual(forecasts[-1].stock_id, self.idle_stock.id)
+        self.assertIsNone(forecasts[-1].days_until_stockout)
+
+    def test_young_stock_is_averaged_over_its_own_age(self):
+        ingredient = IngredientModel.objects.create(name="Basil", unit="g")
+        young_stock = StockModel.objects.create(ingredient=ingredient, total_stock=100, optimal_stock_quantity=200)
+        for offset in range(1, 8):
+            day = self.today - timedelta(days=offset)
+            StockTransactionModel.objects.create(
+                stock=young_stock, ingredient_quantity=4, transaction_type='OUT',
+                date=timezone.make_aware(timezone.datetime(day.year, day.month, day.day, 12)),
+            )
+
+        forecast = next(f for f in self.forecast_service.forecast_stocks(self.today) if f.stock_id == young_stock.id)
+        self.assertEqual(forecast.average_daily_consumption, 4.0)
+
+
+class InventoryCountServiceTest(TestCase):
+    def setUp(self):
+        stock_repository = StockRepository()
+        self.stock_service = StockService(stock_repository)
+        self.count_service = InventoryCountService(InventoryCountRepository(), stock_repository, self.stock_service)
+
+        self.stocks = []
+        for name, total_stock in [("Rice", 10), ("Beans", 10), ("Corn", 10)]:
+            ingredient = IngredientModel.objects.create(name=name, unit="kg")
+            stock_model = StockModel.objects.create(ingredient=ingredient, total_stock=0, optimal_stock_quantity=20)
+            stock = self.stock_service.get_stock_by_id(stock_model.id)
+            transaction = StockTransaction(
+                ingredient_quantity=total_stock,
+                date=timezone.now() - timedelta(days=1),
+                employee_name="Tester",
+                transaction_type='IN',
+                stock=stock
+            )
+            self.stocks.append(self.stock_service.add_transaction(stock, transaction))
+
+    def test_post_count_adjusts_every_variance(self):
+        count = self.count_service.open_count("Counter")
+        self.count_service.submit_lines(count, [
+            {'stock_id': self.stocks[0].id, 'counted_quantity': 14},
+            {'stock_id': self.stocks[1].id, 'counted_quantity': 3},
+            {'stock_id': self.stocks[2].id, 'counted_quantity': 10},
+        ])
+
+        posted = self.count_service.post_count(count.id)
+
+        self.assertEqual(posted.status, 'POSTED')
+        self.assertEqual([line.variance for line in posted.lines], [4, -7, 0])
+        totals = dict(StockModel.objects.values_list('id', 'total_stock'))
+        self.assertEqual([totals[stock.id] for stock in self.stocks], [14, 3, 10])
+
+        adjustments = StockTransactionModel.objects.filter(employee_name="Counter").order_by('stock_id')
+        self.assertEqual([(t.transaction_type, t.ingredient_quantity) for t in adjustments], [('IN', 4), ('OUT', 7)])
+        self.assertEqual(StockLotModel.objects.get(stock_id=self.stocks[1].id).remaining_quantity, 3)
+        self.assertEqual(StockLotModel.objects.filter(stock_id=self.stocks[0].id).count(), 2)
+        self.assertTrue(LowStockAlertModel.objects.filter(stock_id=self.stocks[1].id).exists())
+
+    def test_transactions_interleaved_with_posting_keep_the_adjustment(self):
+        count = self.count_service.open_count("Counter")
+        self.count_service.submit_lines(count, [{'stock_id': self.stocks[0].id, 'counted_quantity': 6}])
+
+        # A delivery read the stock before the count was posted and writes after it
+        delivery_stock = self.stock_service.get_stock_by_id(self.stocks[0].id)
+        self.count_service.post_count(count.id)
+        self.stock_service.add_transaction(delivery_stock, StockTransaction(
+            ingredient_quantity=4, date=timezone.now(), employee_name="Driver", transaction_type='IN', stock=delivery_stock
+        ))
+        self.assertEqual(StockModel.objects.get(id=self.stocks[0].id).total_stock, 10)
+
+        # A withdrawal posted between submitting and posting is part of what the count corrects
+        count = self.count_service.open_count("Counter")
+        self.count_service.submit_lines(count, [{'stock_id': self.stocks[0].id, 'counted_quantity': 7}])
+        kitchen_stock = self.stock_service.get_stock_by_id(self.stocks[0].id)
+        self.stock_service.add_transaction(kitchen_stock, StockTransaction(
+            ingredient_quantity=2, date=timezone.now(), employee_name="Kitchen", transaction_type='OUT', stock=kitchen_stock
+        ))
+        posted = self.count_service.post_count(count.id)
+
+        self.assertEqual(posted.lines[0].variance, -1)
+        self.assertEqual(StockModel.objects.get(id=self.stocks[0].id).total_stock, 7)
+        self.assertEqual(sum(StockLotModel.objects.filter(stock_id=self.stocks[0].id).values_list('remaining_quantity', flat=True)), 7)
+
+    def test_resubmitted_stock_overwrites_counted_quantity(self):
+        count = self.count_service.open_count("Counter")
+        self.count_service.submit_lines(count, [{'stock_id': self.stocks[0].id, 'counted_quantity': 1}])
+        count = self.count_service.submit_lines(count, [{'stock_id': self.stocks[0].id, 'counted_quantity': 9}])
+
+        self.assertEqual([line.counted_quantity for line in count.lines], [9])
+
+    def test_posted_count_cannot_be_posted_again(self):
+        count = self.count_service.open_count("Counter")
+        self.count_service.submit_lines(count, [{'stock_id': self.stocks[0].id, 'counted_quantity': 9}])
+        self.count_service.post_count(count.id)
+
+        with self.assertRaises(DomainException):
+            self.count_service.post_count(count.id)
+
+
+class ReservationServiceCreateTest(TestCase):
+    def setUp(self):
+        self.small = TableModel.objects.create(number=1, capacity=2)
+        self.medium = TableModel.objects.create(number=2, capacity=4)
+        self.large = TableModel.objects.create(number=3, capacity=6)
+        self.evening = timezone.make_aware(datetime.now().replace(hour=20, minute=0, second=0, microsecond=0) + timedelta(days=3))
+        self.reservation_service = ReservationService()
+
+    def _book(self, table, reservation_date):
+        ReservationModel.objects.create(
+            name="Guest", email="guest@example.com", phone_number="555", customer_number=2,
+            table=table, reservation_date=reservation_date, status='BOOKED'
+        )
+
+    def _reservation(self, customer_number, reservation_date):
+        return Reservation(
+            name="New", email="new@example.com", phone_number="556",
+            customer_number=customer_number, reservation_date=reservation_date
+        )
+
+    def test_picks_smallest_free_table_in_one_window_query(self):
+        self._book(self.small, self.evening + timedelta(hours=2))
+        self._book(self.medium, self.evening + timedelta(hours=2, minutes=1))
+
+        # tables, reservations in the window, recheck under the table lock, insert, table reload by the mapper
+        with self.assertNumQueries(5):
+            created = self.reservation_service.create(self._reservation(2, self.evening))
+
+        self.assertEqual(created.table.id, self.medium.id)
+
+    def test_no_free_table_raises(self):
+        for table in (self.small, self.medium, self.large):
+            self._book(table, self.evening - timedelta(minutes=30))
+
+        with self.assertRaises(DomainException):
+            self.reservation_service.create(self._reservation(2, self.evening))
+
+
+class ReservationAvailabilityTest(TestCase):
+    def setUp(self):
+        self.small = TableModel.objects.create(number=1, capacity=2)
+        self.large = TableModel.objects.create(number=2, capacity=6)
+        self.day = (datetime.now() + timedelta(days=3)).date()
+        self.reservation_service = ReservationService()
+        self.addCleanup(cache.clear)
+
+    def _at(self, hour, minute=0):
+        return timezone.make_aware(datetime.combine(self.day, time(hour, minute)))
+
+    def test_free_slots_exclude_conflict_window(self):
+        ReservationModel.objects.create(
+            name="Guest", email="guest@example.com", phone_number="555", customer_number=4,
+            table=self.large, reservation_date=self._at(18), status='BOOKED'
+        )
+
+        slots = self.reservation_service.get_availability(self.day, 4)
+        starts = [slot.start for slot in slots]
+
+        self.assertEqual(starts[0], self._at(12))
+        self.assertIn(self._at(15, 30), starts)
+        self.assertNotIn(self._at(16), starts)
+        self.assertNotIn(self._at(20), starts)
+        self.assertEqual(starts[-1], self._at(21, 30))
+        self.assertEqual(len(starts), 20 - 9)
+
+        small_party = self.reservation_service.get_availability(self.day, 2)
+        self.assertEqual(len(small_party), 20)
+        self.assertEqual(next(s for s in small_party if s.start == self._at(18)).available_tables, 1)
+
+    def test_slots_that_fit_after_reallocation_are_offered(self):
+        ReservationModel.objects.create(
+            name="Pair", email="pair@example.com", phone_number="555", customer_number=2,
+            table=self.large, reservation_date=self._at(18), status='BOOKED'
+        )
+
+        slots = {slot.start: slot for slot in self.reservation_service.get_availability(self.day, 6)}
+
+        self.assertEqual(len(slots), 20)
+        self.assertFalse(slots[self._at(15, 30)].requires_reallocation)
+        self.assertTrue(slots[self._at(18)].requires_reallocation)
+        self.assertEqual(slots[self._at(18)].available_tables, 0)
+
+    def test_creating_a_reservation_invalidates_the_day(self):
+        self.reservation_service.get_availability(self.day, 6)
+
+        self.reservation_service.create(Reservation(
+            name="New", email="new@example.com", phone_number="556",
+            customer_number=6, reservation_date=self._at(13).replace(tzinfo=None)
+        ))
+
+        starts = [slot.start for slot in self.reservation_service.get_availability(self.day, 6)]
+        self.assertEqual(starts[0], self._at(15, 30))
+
+    def test_same_day_query_is_rejected(self):
+        result = self.reservation_service.validate_availability_query(datetime.now().date(), 2)
+        self.assertTrue(result.is_failure())
+
+
+class ReservationCacheInvalidationTest(TestCase):
+    def setUp(self):
+        self.table = TableModel.objects.create(number=7, capacity=4)
+        self.day = (datetime.now() + timedelta(days=3)).replace(hour=19, minute=0, second=0, microsecond=0)
+        self.reservation_service = ReservationService()
+        self.addCleanup(cache.clear)
+
+    def _create(self, reservation_date, name="Ana", email="ana@example.com"):
+        return self.reservation_service.create(Reservation(
+            name=name, email=email, phone_number="555 0101",
+            customer_number=2, reservation_date=reservation_date
+        ))
+
+    def _day_range(self, day):
+        start = day.replace(hour=0, minute=0)
+        return start, start + timedelta(days=1) - timedelta(microseconds=1)
+
+    def test_reads_after_create_are_fresh(self):
+        self.assertEqual(self.reservation_service.get_all(), [])
+        self.assertEqual(self.reservation_service.get_by_filter("name", "Ana"), [])
+        self.assertEqual(self.reservation_service.get_by_filter("table", "7"), [])
+        self.assertEqual(self.reservation_service.get_by_time_range(*self._day_range(self.day)), [])
+
+        created = self._create(self.day)
+
+        self.assertEqual([r.id for r in self.reservation_service.get_all()], [created.id])
+        self.assertEqual([r.id for r in self.reservation_service.get_by_filter("name", "Ana")], [created.id])
+        self.assertEqual([r.id for r in self.reservation_service.get_by_filter("table", "7")], [created.id])
+        self.assertEqual([r.id for r in self.reservation_service.get_by_time_range(*self._day_range(self.day))], [created.id])
+
+    def test_reads_after_delete_are_fresh(self):
+        created = self._create(self.day)
+        self.assertIsNotNone(self.reservation_service.get_by_id(created.id))
+        self.assertEqual(len(self.reservation_service.get_by_filter("phone_number", "555 0101")), 1)
+
+        self.reservation_service.delete_by_id(created.id)
+
+        self.assertIsNone(self.reservation_service.get_by_id(created.id))
+        self.assertEqual(self.reservation_service.get_by_filter("phone_number", "555 0101"), [])
+
+    def test_write_leaves_unrelated_entries_warm(self):
+        other_day = self.day + timedelta(days=1)
+        self._create(other_day, name="Luis", email="luis@example.com")
+        self.reservation_service.get_by_time_range(*self._day_range(other_day))
+        self.reservation_service.get_by_filter("email", "luis@example.com")
+
+        self._create(self.day)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self.reservation_service.get_by_time_range(*self._day_range(other_day))), 1)
+            self.assertEqual(len(self.reservation_service.get_by_filter("email", "luis@example.com")), 1)
+
+
+class ReservationGuestSearchTest(TestCase):
+    def setUp(self):
+        TableModel.objects.create(number=1, capacity=4)
+        TableModel.objects.create(number=2, capacity=4)
+        self.reservation_service = ReservationService()
+        self.addCleanup(cache.clear)
+
+        evening = datetime.now().replace(hour=19, minute=0, second=0, microsecond=0)
+        self.ana = self._create("Ana  Torres", "Ana.Torres@Example.com", "+52 (55) 1234-5678", evening + timedelta(days=2))
+        self.luis = self._create("Luis Ortega", "luis@example.com", "55 9876 0000", evening + timedelta(days=3))
+
+    def _create(self, name, email, phone_number, reservation_date):
+        return self.reservation_service.create(Reservation(
+            name=name, email=email, phone_number=phone_number,
+            customer_number=2, reservation_date=reservation_date
+        ))
+
+    def test_prefix_search_on_normalized_columns(self):
+        self.assertEqual([r.id for r in self.reservation_service.search_guests("ana t")], [self.ana.id])
+        self.assertEqual([r.id for r in self.reservation_service.search_guests("ANA.TOR")], [self.ana.id])
+        self.assertEqual([r.id for r in self.reservation_service.search_guests("55 98")], [self.luis.id])
+        self.assertEqual([r.id for r in self.reservation_service.search_guests("52 55 12")], [self.ana.id])
+
+    def test_equality_filters_ignore_formatting(self):
+        self.assertEqual([r.id for r in self.reservation_service.get_by_filter("email", "ana.torres@example.com")], [self.ana.id])
+        self.assertEqual([r.id for r in self.reservation_service.get_by_filter("phone_number", "525512345678")], [self.ana.id])
+
+
+class ReservationConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        self.tables = [TableModel.objects.create(number=number, capacity=4) for number in range(1, 4)]
+        self.evening = datetime.now().replace(hour=20, minute=0, second=0, microsecond=0) + timedelta(days=2)
+        self.addCleanup(cache.clear)
+
+    def _book(self, results, barrier):
+        try:
+            barrier.wait()
+            reservation = ReservationService().create(Reservation(
+                name="Guest", email="guest@example.com", phone_number="555",
+                customer_number=2, reservation_date=self.evening
+            ))
+            results.append(reservation.table.id)
+        except DomainException:
+            results.append(None)
+        finally:
+            connections.close_all()
+
+    def test_concurrent_bookings_never_share_a_table(self):
+        results = []
+        barrier = threading.Barrier(8)
+        threads = [threading.Thread(target=self._book, args=(results, barrier)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        booked = [table_id for table_id in results if table_id is not None]
+        self.assertEqual(len(results), 8)
+        self.assertEqual(sorted(booked), sorted(table.id for table in self.tables))
+        self.assertEqual(ReservationModel.objects.count(), 3)
+
+
+class ReservationImportTest(TestCase):
+    def setUp(self):
+        self.small = TableModel.objects.create(number=1, capacity=2)
+        self.large = TableModel.objects.create(number=2, capacity=6)
+        self.evening = datetime.now().replace(hour=19, minute=0, second=0, microsecond=0) + timedelta(days=2)
+        self.reservation_service = ReservationService()
+        self.addCleanup(cache.clear)
+
+    def _row(self, index, customer_number, reservation_date):
+        return ReservationImportRow(row=index, reservation=Reservation(
+            name=f"Partner {index}", email=f"guest{index}@partner.com", phone_number="555",
+            customer_number=customer_number, reservation_date=reservation_date
+        ))
+
+    def test_import_reports_each_row(self):
+        rows = [
+            self._row(0, 2, self.evening),
+            self._row(1, 2, self.evening + timedelta(minutes=30)),
+            self._row(2, 2, self.evening + timedelta(hours=1)),
+            self._row(3, 2, self.evening.replace(hour=23)),
+            self._row(4, 9, self.evening),
+            ReservationImportRow.rejected(5, "Validation failed"),
+            self._row(6, 4, self.evening + timedelta(days=1)),
+        ]
+
+        # tables, reservations in the window, bulk insert
+        with self.assertNumQueries(3):
+            rows = self.reservation_service.import_reservations(rows)
+
+        self.assertEqual(
+            [row.status for row in rows],
+            ['CREATED', 'CREATED', 'REJECTED', 'REJECTED', 'REJECTED', 'REJECTED', 'CREATED']
+        )
+        self.assertEqual([rows[i].reservation.table.id for i in (0, 1, 6)], [self.small.id, self.large.id, self.large.id])
+        self.assertEqual(ReservationModel.objects.count(), 3)
+        self.assertEqual(len(self.reservation_service.get_all()), 3)
+
+    def test_import_respects_existing_reservations(self):
+        ReservationModel.objects.create(
+            name="Walk in", email="walk@example.com", phone_number="555", customer_number=2,
+            table=self.small, reservation_date=timezone.make_aware(self.evening), status='BOOKED'
+        )
+
+        rows = self.reservation_service.import_reservations([self._row(0, 2, self.evening + timedelta(hours=1))])
+
+        self.assertEqual(rows[0].reservation.table.id, self.large.id)
+
+
+class TableAllocationTest(TestCase):
+    def setUp(self):
+        self.two_top = TableModel.objects.create(number=1, capacity=2)
+        self.eight_top = TableModel.objects.create(number=2, capacity=8)
+        self.evening = timezone.make_aware(datetime.now().replace(hour=19, minute=0, second=0, microsecond=0) + timedelta(days=2))
+        self.reservation_service = ReservationService()
+        self.addCleanup(cache.clear)
+
+    def _reservation(self, customer_number, reservation_date, name="Guest"):
+        return Reservation(
+            name=name, email="guest@example.com", phone_number="555",
+            customer_number=customer_number, reservation_date=reservation_date
+        )
+
+    def test_booking_repacks_the_day_to_fit_a_large_party(self):
+        # The two-top is taken at 17:00, so the couple at 19:00 lands on the eight-top
+        ReservationModel.objects.create(
+            name="Early", email="early@example.com", phone_number="555", customer_number=2,
+            table=self.two_top, reservation_date=self.evening - timedelta(hours=2), status='ATTENDED'
+        )
+        couple = self.reservation_service.create(self._reservation(2, self.evening))
+        self.assertEqual(couple.table.id, self.eight_top.id)
+
+        ReservationModel.objects.filter(status='ATTENDED').delete()
+        party = self.reservation_service.create(self._reservation(7, self.evening + timedelta(minutes=30), name="Party"))
+
+        self.assertEqual(party.table.id, self.eight_top.id)
+        self.assertEqual(ReservationModel.objects.get(id=couple.id).table_id, self.two_top.id)
+
+    def test_reoptimize_day_moves_small_parties_off_large_tables(self):
+        ReservationModel.objects.create(
+            name="Couple", email="couple@example.com", phone_number="555", customer_number=2,
+            table=self.eight_top, reservation_date=self.evening, status='BOOKED'
+        )
+
+        moved = self.reservation_service.reoptimize_day(timezone.localtime(self.evening).date())
+
+        self.assertEqual(moved, 1)
+        self.assertEqual(ReservationModel.objects.get().table_id, self.two_top.id)
+
+
+class NoShowSweepTest(TestCase):
+    def setUp(self):
+        self.table = TableModel.objects.create(number=1, capacity=4)
+        self.now = timezone.now()
+        self.reservation_service = ReservationService()
+        self.addCleanup(cache.clear)
+
+    def _reservation(self, reservation_date, status='BOOKED'):
+        return ReservationModel.objects.create(
+            name="Guest", email="guest@example.com", phone_number="555", customer_number=2,
+            table=self.table, reservation_date=reservation_date, status=status
+        )
+
+    def test_sweep_marks_only_overdue_booked_reservations(self):
+        overdue = self._reservation(self.now - timedelta(hours=1))
+        within_grace = self._reservation(self.now - timedelta(minutes=10))
+        attended = self._reservation(self.now - timedelta(hours=3), status='ATTENDED')
+        self.assertEqual(self.reservation_service.get_by_id(overdue.id).status, 'BOOKED')
+
+        updated = self.reservation_service.sweep_no_shows()
+
+        self.assertEqual(updated, 1)
+        statuses = dict(ReservationModel.objects.values_list('id', 'status'))
+        self.assertEqual(
+            [statuses[overdue.id], statuses[within_grace.id], statuses[attended.id]],
+            ['NOT_ATTENDED', 'BOOKED', 'ATTENDED']
+        )
+        self.assertEqual(self.reservation_service.get_by_id(overdue.id).status, 'NOT_ATTENDED')
+
+    def test_sweep_is_one_update_whatever_the_backlog(self):
+        for days_ago in range(1, 40):
+            self._reservation(self.now - timedelta(days=days_ago))
+        self.assertEqual({reservation.status for reservation in self.reservation_service.get_by_filter('table', 1)}, {'BOOKED'})
+
+        # the affected days, then the update
+        with self.assertNumQueries(2):
+            self.assertEqual(self.reservation_service.sweep_no_shows(), 39)
+
+        self.assertEqual({reservation.status for reservation in self.reservation_service.get_by_filter('table', 1)}, {'NOT_ATTENDED'})
+        self.assertEqual(self.reservation_service.sweep_no_shows(), 0)
+
+    def test_sweep_refreshes_the_floor_and_notifies_once(self):
+        swept = self._reservation(self.now - timedelta(minutes=1))
+        table_service = TableService(TableRepository(), OrderRepository(), WaitlistRepository(), ReservationRepository())
+        self.assertEqual(table_service.get_floor_state().get(1).upcoming_reservation.id, swept.id)
+
+        received = []
+        def receiver(sender, **kwargs):
+            received.append(kwargs)
+        reservations_changed.connect(receiver)
+        self.addCleanup(reservations_changed.disconnect, receiver)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reservation_service.sweep_no_shows(grace=timedelta(0))
+
+        self.assertIsNone(table_service.get_floor_state().get(1).upcoming_reservation)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(list(received[0]['days']), [timezone.localtime(swept.reservation_date).date()])
+
+    def test_no_show_releases_the_table(self):
+        self._reservation(self.now - timedelta(hours=1))
+        slot = self.now + timedelta(minutes=30)
+
+        self.reservation_service.sweep_no_shows()
+        created = self.reservation_service.create(Reservation(
+            name="Walk in", email="walk@example.com", phone_number="556",
+            customer_number=2, reservation_date=slot
+        ))
+
+        self.assertEqual(created.table.id, self.table.id)
+
+
+class TodayReservationsTest(TestCase):
+    def setUp(self):
+        self.table = TableModel.objects.create(number=1, capacity=4)
+        self.reservation_service = ReservationService()
+        today_reservations.clear()
+        self.addCleanup(today_reservations.clear)
+        self.addCleanup(cache.clear)
+
+    def _create(self, reservation_date):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.reservation_service.create(Reservation(
+                name="Guest", email="guest@example.com", phone_number="555",
+                customer_number=2, reservation_date=reservation_date
+            ))
+
+    def test_today_is_loaded_once_and_patched_by_writes(self):
+        tonight = timezone.now().replace(hour=23, minute=0)
+        self.assertEqual(self.reservation_service.get_today(), [])
+
+        created = self._create(tonight)
+        self._create(tonight + timedelta(days=2))
+
+        with self.assertNumQueries(0):
+            self.assertEqual([r.id for r in self.reservation_service.get_today()], [created.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reservation_service.delete_by_id(created.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.reservation_service.get_today(), [])
+
+    def test_writes_from_other_processes_are_picked_up_after_staleness_check(self):
+        self.assertEqual(self.reservation_service.get_today(), [])
+        other = ReservationModel.objects.create(
+            name="Phone", email="phone@example.com", phone_number="555", customer_number=2,
+            table=self.table, reservation_date=timezone.now().replace(hour=23, minute=30), status='BOOKED'
+        )
+        self.reservation_service.cache_generations.bump(f'date:{timezone.localdate().isoformat()}')
+
+        self.assertEqual(self.reservation_service.get_today(), [])
+        today_reservations.checked_at -= DailyReservationBook.STALENESS_CHECK_SECONDS
+        self.assertEqual([r.id for r in self.reservation_service.get_today()], [other.id])
+
+    def test_day_rollover_reloads(self):
+        self.reservation_service.get_today()
+        today_reservations.day = timezone.localdate() - timedelta(days=1)
+
+        with self.assertNumQueries(1):
+            self.reservation_service.get_today()
+        self.assertEqual(today_reservations.day, timezone.localdate())
+
+
+class WaitlistServiceTest(TestCase):
+    def setUp(self):
+        self.two_top = TableModel.objects.create(number=1, capacity=2, is_available=False)
+        self.four_top = TableModel.objects.create(number=2, capacity=4, is_available=False)
+        self.now = timezone.now()
+        self.addCleanup(cache.clear)
+
+        self.order_repository = OrderRepository()
+        self.table_service = TableService(TableRepository(), self.order_repository, WaitlistRepository(), ReservationRepository())
+        self.waitlist_service = WaitlistService(WaitlistRepository(), self.table_service, self.order_repository, ReservationRepository())
+        self.order_service = OrderService(self.order_repository, self.table_service, MenuItemService(MenuItemRepository(), MenuExtraRepository()), self.waitlist_service)
+
+        # Four-tops turn over in 90 minutes, two-tops in 45
+        for table, minutes in ((self.four_top, 90), (self.two_top, 45)):
+            OrderModel.objects.create(
+                table=table, status='COMPLETED',
+                created_at=self.now - timedelta(days=1, minutes=minutes), end_at=self.now - timedelta(days=1)
+            )
+        self.open_order = OrderModel.objects.create(table=self.four_top, status='IN_PROGRESS', created_at=self.now - timedelta(minutes=60))
+        OrderModel.objects.create(table=self.two_top, status='IN_PROGRESS', created_at=self.now - timedelta(minutes=40))
+
+    def _add(self, name, party_size, minutes_ago):
+        entry = self.waitlist_service.add_party({'name': name, 'party_size': party_size})
+        WaitlistEntryModel.objects.filter(id=entry.id).update(arrived_at=self.now - timedelta(minutes=minutes_ago))
+        return entry
+
+    def test_end_order_frees_table_and_suggests_best_fit(self):
+        self._add("Solo", 1, 30)
+        trio = self._add("Trio", 3, 10)
+        self._add("Six", 6, 40)
+        suggestions = []
+        receiver = lambda sender, table, entry, **kwargs: suggestions.append((table.number, entry.id))
+        waitlist_party_suggested.connect(receiver)
+        self.addCleanup(waitlist_party_suggested.disconnect, receiver)
+
+        self.order_service.end_order(self.order_service.get_order_by_id(self.open_order.id))
+
+        self.assertTrue(TableModel.objects.get(id=self.four_top.id).is_available)
+        self.assertEqual(suggestions, [(2, trio.id)])
+
+    def test_waiting_parties_get_an_estimate(self):
+        self._add("Pair", 2, 20)
+        self.assertEqual([entry.estimated_wait_minutes is not None for entry in self.waitlist_service.get_waiting()], [True])
+
+    def test_table_booked_within_a_turnover_is_not_offered(self):
+        self._add("Trio", 3, 10)
+        ReservationModel.objects.create(
+            name='Ana', email='ana@example.com', phone_number='555', customer_number=4,
+            reservation_date=self.now + timedelta(minutes=15), table=self.four_top, status='BOOKED'
+        )
+        suggestions = []
+        receiver = lambda sender, table, entry, **kwargs: suggestions.append((table.number, entry.id))
+        waitlist_party_suggested.connect(receiver)
+        self.addCleanup(waitlist_party_suggested.disconnect, receiver)
+
+        self.order_service.end_order(self.order_service.get_order_by_id(self.open_order.id))
+
+        self.assertTrue(TableModel.objects.get(id=self.four_top.id).is_available)
+        self.assertEqual(suggestions, [])
+
+
+class MenuSnapshotTest(TestCase):
+    def setUp(self):
+        self.burger = MenuItemModel.objects.create(name='Burger', price='9.50', category='MEALS')
+        self.soda = MenuItemModel.objects.create(name='Soda', price='2.00', category='DRINKS')
+        self.menu_service = MenuItemService(MenuItemRepository(), MenuExtraRepository())
+        self.addCleanup(cache.clear)
+        menu_snapshot.snapshot = None
+        menu_snapshot.invalidate()
+
+    def test_reads_are_served_from_one_snapshot(self):
+        snapshot = self.menu_service.get_snapshot()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.menu_service.get_menu_by_id(self.burger.id).name, 'Burger')
+            self.assertEqual([item.name for item in self.menu_service.get_menus_by_category('DRINKS')], ['Soda'])
+            self.assertEqual(self.menu_service.get_menus_by_category('DESSERTS'), [])
+        self.assertEqual([item['name'] for item in snapshot.serialized_by_category['MEALS']], ['Burger'])
+        self.assertEqual(len(snapshot.serialized_items), 2)
+
+    def test_write_swaps_snapshot(self):
+        old = self.menu_service.get_snapshot()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_service.create_menu({'name': 'Cake', 'price': '5.00', 'category': 'DESSERTS'})
+        new = self.menu_service.get_snapshot()
+
+        self.assertIsNot(old, new)
+        self.assertGreater(new.version, old.version)
+        self.assertNotIn('DESSERTS', old.items_by_category)
+        self.assertEqual([item.name for item in new.items_by_category['DESSERTS']], ['Cake'])
+
+    def test_other_workers_writes_seen_after_check_interval(self):
+        holder = MenuSnapshotHolder(clock=lambda: self.now)
+        self.now = 100.0
+        snapshot = holder.get(self.menu_service.get_catalog_version, self.menu_service._build_snapshot)
+
+        self.menu_service.cache_generations.bump('catalog')
+        self.assertIs(holder.get(self.menu_service.get_catalog_version, self.menu_service._build_snapshot), snapshot)
+
+        self.now += MenuSnapshotHolder.VERSION_CHECK_SECONDS
+        self.assertIsNot(holder.get(self.menu_service.get_catalog_version, self.menu_service._build_snapshot), snapshot)
+
+    def test_search_is_served_from_the_snapshot(self):
+        self.menu_service.get_snapshot()
+
+        with self.assertNumQueries(0):
+            self.assertEqual([item.name for item in self.menu_service.search_menu('SOD')], ['Soda'])
+
+    def test_order_items_resolve_from_snapshot(self):
+        order_service = OrderService(OrderRepository(), None, self.menu_service, None)
+        self.menu_service.get_snapshot()
+
+        with self.assertNumQueries(0):
+            items = order_service.proccess_items([{'menu_item_id': self.soda.id, 'quantity': 2}])
+        self.assertEqual(items[0].menu_item.name, 'Soda')
+
+        with self.assertRaises(ValueError):
+            order_service.proccess_items([{'menu_item_id': 999, 'quantity': 1}])
+
+    def test_order_items_see_other_workers_deletes_at_once(self):
+        order_service = OrderService(OrderRepository(), None, self.menu_service, None)
+        self.assertIn(self.soda.id, self.menu_service.get_snapshot().items_by_id)
+
+        # Deleted by another worker: the catalog version moves but this process keeps its snapshot
+        MenuItemModel.objects.filter(id=self.soda.id).delete()
+        self.menu_service.cache_generations.bump('catalog')
+
+        self.assertIn(self.soda.id, self.menu_service.get_snapshot().items_by_id)
+        with self.assertRaises(ValueError):
+            order_service.proccess_items([{'menu_item_id': self.soda.id, 'quantity': 1}])
+
+
+class MenuSearchParityTest(TestCase):
+    """Both search paths over the same catalog; the PostgreSQL side runs where the test database is PostgreSQL."""
+    TERMS = {
+        'burg': ['Burger', 'Cheese Burger'],
+        'dog': ['Hot-Dog'],
+        'ken': ['Chicken Wings'],
+        'ic': ['Chicken Wings'],
+    }
+
+    def setUp(self):
+        for name, category in (('Chicken Wings', 'MEALS'), ('Cheese Burger', 'MEALS'), ('Burger', 'MEALS'), ('Hot-Dog', 'MEALS'), ('Lemonade', 'DRINKS')):
+            MenuItemModel.objects.create(name=name, price='10.00', category=category)
+        self.repository = MenuItemRepository()
+        self.index = MenuSearchIndex(self.repository.get_all())
+
+    def test_index_matches_prefixes_word_starts_and_infixes(self):
+        for term, expected in self.TERMS.items():
+            self.assertEqual([item.name for item in self.index.search(term, 10)], expected, term)
+
+    @skipUnless(connection.vendor == 'postgresql', "pg_trgm search needs PostgreSQL")
+    def test_postgres_ranks_like_the_index(self):
+        for term in self.TERMS:
+            self.assertEqual(
+                [item.name for item in self.repository.search(term, 10)],
+                [item.name for item in self.index.search(term, 10)],
+                term
+            )
+
+
+class MenuUpsertTest(TestCase):
+    def setUp(self):
+        self.burger = MenuItemModel.objects.create(name='Burger', price='9.50', category='MEALS', description='Beef')
+        self.soda = MenuItemModel.objects.create(name='Soda', price='2.00', category='DRINKS', description='Cola')
+        self.menu_service = MenuItemService(MenuItemRepository(), MenuExtraRepository())
+        self.addCleanup(cache.clear)
+
+    def _item(self, name, price, category, description='', id=None):
+        return MenuItem(id=id, name=name, price=Decimal(price), category=category, description=description)
+
+    def test_only_changes_are_written_with_one_version_bump(self):
+        version = self.menu_service.get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_result = self.menu_service.upsert_menus([
+                self._item('burger', '10.50', 'MEALS', 'Beef', id=self.burger.id),
+                self._item('Soda', '2.00', 'DRINKS', 'Cola'),
+                self._item('Flan', '4.00', 'DESSERTS', 'Vanilla'),
+            ])
+
+        changes = upsert_result.get_data()
+        self.assertEqual([item.name for item in changes.updated], ['burger'])
+        self.assertIsNotNone(changes.created[0].id)
+        self.assertEqual(changes.unchanged, 1)
+        self.assertEqual(self.menu_service.get_catalog_version(), version + 1)
+
+        self.burger.refresh_from_db()
+        self.assertEqual((self.burger.name, self.burger.price), ('burger', Decimal('10.50')))
+        self.assertEqual(MenuItemModel.objects.count(), 3)
+
+    def test_invalid_item_rejects_the_batch(self):
+        version = self.menu_service.get_catalog_version()
+
+        upsert_result = self.menu_service.upsert_menus([
+            self._item('Flan', '4.00', 'DESSERTS'),
+            self._item('Soda', '0', 'DRINKS'),
+            self._item('Ghost', '1.00', 'DRINKS', id=999),
+            self._item('FLAN', '5.00', 'DESSERTS'),
+        ])
+
+        self.assertTrue(upsert_result.is_failure())
+        self.assertEqual(len(upsert_result.get_error_msg()), 3)
+        self.assertEqual(MenuItemModel.objects.count(), 2)
+        self.assertEqual(self.menu_service.get_catalog_version(), version)
+
+    def test_import_command(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'menu.json'
+        path.write_text(json.dumps([
+            {'name': 'Soda', 'price': '2.50', 'category': 'DRINKS'},
+            {'name': 'Flan', 'price': '4.00', 'category': 'DESSERTS'},
+        ]))
+
+        out = StringIO()
+        call_command('import_menu', str(path), '--dry-run', stdout=out)
+        self.assertIn('1 created, 1 updated, 0 unchanged', out.getvalue())
+        self.assertEqual(MenuItemModel.objects.count(), 2)
+
+        call_command('import_menu', str(path), stdout=StringIO())
+        self.assertEqual(MenuItemModel.objects.count(), 3)
+        self.assertEqual(MenuItemModel.objects.get(id=self.soda.id).price, Decimal('2.50'))
+
+
+class MenuExtraTest(TestCase):
+    def setUp(self):
+        self.burger = MenuItemModel.objects.create(name='Burger', price='9.50', category='MEALS')
+        self.soda = MenuItemModel.objects.create(name='Soda', price='2.00', category='DRINKS')
+        self.bacon = MenuExtraModel.objects.create(name='Bacon', price='1.25')
+        self.bacon.menu_items.set([self.burger])
+        self.menu_service = MenuItemService(MenuItemRepository(), MenuExtraRepository())
+        self.order_service = OrderService(OrderRepository(), None, self.menu_service, None)
+        self.addCleanup(cache.clear)
+
+    def test_extras_resolve_with_items_from_the_snapshot(self):
+        self.menu_service.get_snapshot()
+
+        with self.assertNumQueries(0):
+            items = self.order_service.proccess_items([
+                {'menu_item_id': self.burger.id, 'quantity': 1, 'menu_extra_id': self.bacon.id}
+                for _ in range(12)
+            ])
+        self.assertTrue(all(item.menu_extra.price == Decimal('1.25') for item in items))
+        self.assertEqual(OrderItemMappers.to_model(items[0]).menu_extra_id, self.bacon.id)
+
+        with self.assertRaises(ValueError):
+            self.order_service.proccess_items([{'menu_item_id': self.soda.id, 'quantity': 1, 'menu_extra_id': self.bacon.id}])
+
+    def test_new_extra_moves_the_catalog(self):
+        self.assertEqual([extra.name for extra in self.menu_service.get_extras_for_item(self.soda.id)], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_service.create_extra(MenuExtra(None, 'Ice', Decimal('0.00'), [self.soda.id]))
+        self.assertEqual([extra.name for extra in self.menu_service.get_extras_for_item(self.soda.id)], ['Ice'])
+
+    def test_payment_lines_include_extra_price(self):
+        items = self.order_service.proccess_items([
+            {'menu_item_id': self.burger.id, 'quantity': 2, 'menu_extra_id': self.bacon.id},
+            {'menu_item_id': self.burger.id, 'quantity': 1, 'menu_extra_id': self.bacon.id},
+            {'menu_item_id': self.burger.id, 'quantity': 1},
+        ])
+
+        payment_items = PaymentService(PaymentRepository()).generate_payment_items(items)
+        self.assertEqual([(line.quantity, line.total) for line in payment_items], [(3, Decimal('32.25')), (1, Decimal('9.50'))])
+
+        payment = Payment.init_payment(Order(table=None, status='COMPLETED'))
+        payment.items = payment_items
+        payment.calculate_numbers()
+        self.assertEqual(payment.sub_total, Decimal('41.75'))
+
+
+class MenuPriceHistoryTest(TestCase):
+    def setUp(self):
+        self.menu_service = MenuItemService(MenuItemRepository(), MenuExtraRepository())
+        self.order_service = OrderService(OrderRepository(), None, self.menu_service, None)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.burger = self.menu_service.create_menu({'name': 'Burger', 'price': Decimal('9.50'), 'category': 'MEALS'})
+        self.addCleanup(cache.clear)
+
+    def _reprice(self, price):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_service.upsert_menus([MenuItem(id=self.burger.id, name='Burger', price=Decimal(price), category='MEALS')])
+
+    def test_price_changes_are_recorded(self):
+        before = timezone.now()
+        self._reprice('11.00')
+        self._reprice('11.00')
+
+        history = self.menu_service.get_price_history(self.burger.id)
+        self.assertEqual([price.price for price in history], [Decimal('11.00'), Decimal('9.50')])
+        self.assertLessEqual(history[1].effective_from, before)
+        self.assertGreaterEqual(history[0].effective_from, before)
+
+    def test_open_tickets_keep_the_price_they_were_added_at(self):
+        table = TableModel.objects.create(number=1, capacity=4)
+        order = OrderModel.objects.create(table=table, status='IN_PROGRESS')
+        order_repository = OrderRepository()
+
+        old_items = self.order_service.proccess_items([{'menu_item_id': self.burger.id, 'quantity': 2}])
+        order_repository.update_items(Order(table=None, status='IN_PROGRESS', id=order.id, items=old_items))
+        self._reprice('11.00')
+        new_items = self.order_service.proccess_items([{'menu_item_id': self.burger.id, 'quantity': 1}])
+
+        stored = order_repository.get_by_id(order.id)
+        with self.assertNumQueries(0):
+            payment_items = PaymentService(PaymentRepository()).generate_payment_items(stored.items + new_items)
+
+        self.assertEqual([(line.price, line.total) for line in payment_items], [(Decimal('9.50'), Decimal('19.00')), (Decimal('11.00'), Decimal('11.00'))])
+
+
+class FloorStateTest(TestCase):
+    def setUp(self):
+        self.two_top = TableModel.objects.create(number=1, capacity=2)
+        self.four_top = TableModel.objects.create(number=2, capacity=4)
+        self.now = timezone.now()
+        self.addCleanup(cache.clear)
+
+        self.table_service = TableService(TableRepository(), OrderRepository(), WaitlistRepository(), ReservationRepository())
+        self.waitlist_service = WaitlistService(WaitlistRepository(), self.table_service, OrderRepository(), ReservationRepository())
+        self.order_service = OrderService(OrderRepository(), self.table_service, None, self.waitlist_service)
+
+    def test_floor_is_served_from_cache_until_a_write(self):
+        ReservationModel.objects.create(
+            name='Ana', email='ana@example.com', phone_number='555', customer_number=2,
+            reservation_date=self.now + timedelta(hours=1), table=self.two_top, status='BOOKED'
+        )
+        floor = self.table_service.get_floor_state()
+        self.assertEqual(floor.get(1).upcoming_reservation.name, 'Ana')
+
+        with self.assertNumQueries(0):
+            self.assertIs(self.table_service.get_table_by_number(2).is_available, True)
+            self.assertEqual(len(self.table_service.get_all_tables()), 2)
+
+        entry = self.waitlist_service.add_party({'name': 'Luis', 'party_size': 3})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.waitlist_service.seat(entry, self.table_service.get_table_by_number(2))
+            order = self.order_service.init_order(self.table_service.get_table_by_number(2))
+
+        state = self.table_service.get_floor_state().get(2)
+        self.assertGreater(self.table_service.get_floor_version(), floor.version)
+        self.assertFalse(state.table.is_available)
+        self.assertEqual((state.open_order_id, state.party_size), (order.id, 3))
+
+    def test_only_todays_bookings_bump_the_floor(self):
+        reservation_service = ReservationService()
+        version = self.table_service.get_floor_version()
+
+        def book(reservation_date):
+            with self.captureOnCommitCallbacks(execute=True):
+                reservation_service.create(Reservation(
+                    name='Ana', email='ana@example.com', phone_number='555',
+                    customer_number=2, reservation_date=reservation_date
+                ))
+
+        book(self.now + timedelta(days=3))
+        self.assertEqual(self.table_service.get_floor_version(), version)
+
+        book(self.now)
+        self.assertEqual(self.table_service.get_floor_version(), version + 1)
+
+    def test_availability_is_a_single_update(self):
+        with self.assertNumQueries(1):
+            self.table_service.set_as_unavailable(1)
+        self.assertFalse(TableModel.objects.get(id=self.two_top.id).is_available)
+
+
+class TableBatchTest(TestCase):
+    def setUp(self):
+        TableModel.objects.create(number=1, capacity=2)
+        TableModel.objects.create(number=2, capacity=4)
+        self.addCleanup(cache.clear)
+
+        self.table_service = TableService(TableRepository(), OrderRepository(), WaitlistRepository(), ReservationRepository())
+
+    def test_uniqueness_is_checked_in_one_query(self):
+        tables_data = [{'number': number, 'capacity': 4} for number in range(3, 40)]
+        with self.assertNumQueries(1):
+            self.assertTrue(self.table_service.validate_batch_create(tables_data).is_success())
+
+        clashing = self.table_service.validate_batch_create(tables_data + [{'number': 2, 'capacity': 2}, {'number': 3, 'capacity': 2}])
+        self.assertEqual(clashing.get_error_msg(), "Table numbers [3] are repeated")
+        self.assertEqual(
+            self.table_service.validate_batch_create([{'number': 2, 'capacity': 2}]).get_error_msg(),
+            "Tables with numbers [2] already exist"
+        )
+
+    def test_batch_writes_bump_the_floor_once(self):
+        version = self.table_service.get_floor_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.table_service.create_tables([{'number': number, 'capacity': 6} for number in (3, 4)])
+            self.table_service.update_capacities([{'number': 1, 'capacity': 3}, {'number': 3, 'capacity': 8}])
+
+        self.assertEqual(self.table_service.get_floor_version(), version + 2)
+        self.assertEqual([(table.number, table.capacity) for table in self.table_service.get_all_tables()], [(1, 3), (2, 4), (3, 8), (4, 6)])
+
+    def test_delete_is_all_or_nothing(self):
+        OrderModel.objects.create(table=TableModel.objects.get(number=2), status='COMPLETED')
+
+        with self.assertRaises(DomainException):
+            self.table_service.delete_tables([1, 2])
+        self.assertEqual(TableModel.objects.count(), 2)
+
+        self.assertTrue(self.table_service.delete_tables([9]).is_failure())
+        self.assertEqual(self.table_service.delete_tables([1]).get_data(), 1)
+
+
+class TableGroupTest(TestCase):
+    def setUp(self):
+        self.tables = [TableModel.objects.create(number=number, capacity=4) for number in (1, 2, 3)]
+        self.evening = timezone.make_aware(datetime.now().replace(hour=20, minute=0, second=0, microsecond=0) + timedelta(days=3))
+        self.addCleanup(cache.clear)
+
+        self.table_service = TableService(TableRepository(), OrderRepository(), WaitlistRepository(), ReservationRepository())
+        self.waitlist_service = WaitlistService(WaitlistRepository(), self.table_service, OrderRepository(), ReservationRepository())
+        self.order_service = OrderService(OrderRepository(), self.table_service, None, self.waitlist_service)
+
+    def _merge(self, numbers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.table_service.merge_tables(numbers)
+
+    def test_merged_tables_seat_a_large_party(self):
+        reservation = Reservation(
+            name="Team", email="team@example.com", phone_number="556", customer_number=8, reservation_date=self.evening
+        )
+        with self.assertRaises(DomainException):
+            ReservationService().create(reservation)
+
+        group = self._merge([2, 1]).get_data()
+        self.assertEqual((group.lead.number, group.capacity, group.table_numbers), (1, 8, [1, 2]))
+        self.assertEqual([(table.number, table.capacity) for table in self.table_service.get_all_tables()], [(1, 8), (3, 4)])
+
+        created = ReservationService().create(reservation)
+        self.assertEqual(created.table.id, self.tables[0].id)
+
+    def test_order_on_a_member_holds_the_whole_group(self):
+        self._merge([1, 2])
+
+        table = self.table_service.get_table_by_number(2)
+        self.assertEqual((table.number, table.capacity), (1, 8))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.order_service.init_order(table)
+        self.assertEqual(order.table.id, self.tables[0].id)
+        self.assertEqual(list(TableModel.objects.filter(is_available=False).values_list('number', flat=True).order_by('number')), [1, 2])
+        self.assertEqual(self.table_service.get_floor_state().get(2).open_order_id, order.id)
+
+        self.assertTrue(self.table_service.split_group(table.group_id).is_failure())
+
+    def test_split_gives_the_tables_back(self):
+        group = self._merge([1, 2, 3]).get_data()
+        self.assertTrue(self._merge([3, 2]).is_failure())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            split = self.table_service.split_group(group.id)
+
+        self.assertEqual(split.get_data().table_numbers, [1, 2, 3])
+        self.assertEqual([(table.number, table.capacity, table.group_id) for table in self.table_service.get_all_tables()], [(1, 4, None), (2, 4, None), (3, 4, None)])
+
+    def test_booking_in_flight_on_the_lead_blocks_the_split(self):
+        group = self._merge([1, 2]).get_data()
+
+        with ReservationRepository().try_lock_table(self.tables[0].id):
+            with self.assertRaises(DomainException):
+                self.table_service.split_group(group.id)
+            ReservationModel.objects.create(
+                name="Team", email="team@example.com", phone_number="556", customer_number=8,
+                table=self.tables[0], reservation_date=self.evening, status='BOOKED'
+            )
+
+        self.assertEqual(self.table_service.split_group(group.id).get_error_msg(), f"{group} has a reservation for 8 people")
+        self.assertEqual(TableModel.objects.filter(group_id=group.id).count(), 2)
+
+    def test_capacity_updates_respect_groups_and_bookings(self):
+        self._merge([1, 2])
+        ReservationModel.objects.create(
+            name="Guest", email="guest@example.com", phone_number="555", customer_number=4,
+            table=self.tables[2], reservation_date=self.evening, status='BOOKED'
+        )
+
+        self.assertEqual(
+            self.table_service.update_capacities([{'number': 2, 'capacity': 6}]).get_error_msg(),
+            "Tables with numbers [2] are merged, split them first"
+        )
+        self.assertEqual(
+            self.table_service.update_capacities([{'number': 3, 'capacity': 2}]).get_error_msg(),
+            "Tables with numbers [3] have reservations larger than the new capacity"
+        )
+        self.assertEqual(self.table_service.update_capacities([{'number': 3, 'capacity': 6}]).get_data(), 1)
+
+    def test_members_with_bookings_cannot_be_merged(self):
+        ReservationModel.objects.create(
+            name="Guest", email="guest@example.com", phone_number="555", customer_number=2,
+            table=self.tables[1], reservation_date=self.evening, status='BOOKED'
+        )
+        self.assertEqual(self._merge([1, 2]).get_error_msg(), "Tables with numbers [2] have upcoming reservations")
+        self.assertTrue(self._merge([2, 3]).is_success())
+
+    def test_member_being_booked_blocks_the_merge(self):
+        with ReservationRepository().try_lock_table(self.tables[1].id) as acquired:
+            self.assertTrue(acquired)
+            with self.assertRaises(DomainException):
+                self._merge([1, 2])
+
+        self.assertTrue(all(table.group_id is None for table in self.table_service.get_all_tables()))
+        self.assertTrue(self._merge([1, 2]).is_success())
+
+
+class TableAnalyticsTest(TestCase):
+    def setUp(self):
+        self.two_top = TableModel.objects.create(number=1, capacity=2)
+        self.four_top = TableModel.objects.create(number=2, capacity=4)
+        self.day = timezone.localdate() - timedelta(days=5)
+        self.addCleanup(cache.clear)
+
+        table_service = TableService(TableRepository(), OrderRepository(), WaitlistRepository(), ReservationRepository())
+        self.analytics_service = TableAnalyticsService(OrderRepository(), table_service)
+
+        self._order(self.four_top, self.day, time(13), 90, paid='1000.00')
+        self._order(self.four_top, self.day, time(19), 60, paid='500.00')
+        self._order(self.two_top, self.day, time(18), 45)
+
+    def _order(self, table, day, start, minutes, paid=None):
+        created_at = timezone.make_aware(datetime.combine(day, start))
+        order = OrderModel.objects.create(table=table, status='COMPLETED', created_at=created_at, end_at=created_at + timedelta(minutes=minutes))
+        if paid:
+            PaymentModel.objects.create(
+                order=order, payment_status='COMPLETED', sub_total=paid, disccount=0, vat_rate=0, vat=0, currency_type='MXN', total=paid
+            )
+
+    def test_turnover_and_revenue_per_seat_hour(self):
+        analytics = self.analytics_service.get_table_analytics(self.day, self.day)
+
+        self.assertEqual(analytics.average_seat_minutes, 65.0)
+        self.assertEqual(analytics.revenue, 1500.0)
+        self.assertEqual(analytics.revenue_per_seat_hour, 25.0)
+        self.assertEqual(analytics.turns_per_shift, {'LUNCH': 0.5, 'DINNER': 1.0})
+
+        two_top, four_top = analytics.tables
+        self.assertEqual((four_top.turns, four_top.turns_per_shift), (2, {'LUNCH': 1.0, 'DINNER': 1.0}))
+        self.assertEqual((four_top.average_seat_minutes, four_top.revenue_per_seat_hour), (75.0, 37.5))
+        self.assertEqual((two_top.turns, two_top.revenue), (1, 0.0))
+
+    def test_closed_days_are_not_recomputed(self):
+        self.analytics_service.get_table_analytics(self.day, self.day)
+        self._order(self.two_top, self.day, time(20), 30)
+
+        with self.assertNumQueries(0):
+            analytics = self.analytics_service.get_table_analytics(self.day, self.day)
+        self.assertEqual(analytics.tables[0].turns, 1)
+
+    def test_open_days_are_recomputed(self):
+        today = timezone.localdate()
+        self.analytics_service.get_table_analytics(self.day, today)
+        self._order(self.two_top, today, time(0), 30)
+
+        analytics = self.analytics_service.get_table_analytics(self.day, today)
+        self.assertEqual(analytics.tables[0].turns, 2)
+        self.assertEqual(analytics.turns_per_shift['LUNCH'], round(2 / (6 * 2), 2))
+
+    def test_range_validation(self):
+        self.assertTrue(self.analytics_service.validate_range(self.day, self.day - timedelta(days=1)).is_failure())
+        self.assertTrue(self.analytics_service.validate_range(self.day, self.day + timedelta(days=400)).is_failure())
@@ -0,0 +1,128 @@
+from decimal import Decimal
+import gzip
+import json
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from restaurant.repository.models.models import MenuItemModel
+
+
+class MenuCatalogViewTest(TestCase):
+    def setUp(self):
+        MenuItemModel.objects.create(name="Tacos", price=Decimal("80.00"), category="MEALS", description="Three tacos")
+        MenuItemModel.objects.create(name="Flan", price=Decimal("45.00"), category="DESSERTS", description="Vanilla flan")
+        self.client = APIClient()
+        self.addCleanup(cache.clear)
+
+    def test_current_etag_gets_not_modified_without_queries(self):
+        response = self.client.get('/v1/api/menu_items/all')
+        etag = response['ETag']
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/v1/api/menu_items/all', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_menu_write_changes_the_version(self):
+        etag = self.client.get('/v1/api/menu_items/all')['ETag']
+        category_etag = self.client.get('/v1/api/menu_items/category?category=meals')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/v1/api/menu_items', {
+                'name': "Pozole", 'price': "120.00", 'category': "MEALS", 'description': "Red pozole"
+            }, format='json')
+
+        response = self.client.get('/v1/api/menu_items/all', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['message']), 3)
+
+        response = self.client.get('/v1/api/menu_items/category?category=MEALS', HTTP_IF_NONE_MATCH=category_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['name'] for item in response.json()['data']], ["Tacos", "Pozole"])
+
+    def test_unknown_category_is_rejected(self):
+        response = self.client.get('/v1/api/menu_items/category?category=snacks')
+        self.assertEqual(response.status_code, 400)
+
+    def test_listing_is_rendered_once_per_version(self):
+        first = self.client.get('/v1/api/menu_items/category?category=MEALS')
+        self.assertEqual(first['Content-Type'], 'application/json')
+        self.assertEqual([item['name'] for item in first.json()['data']], ["Tacos"])
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/v1/api/menu_items/category?category=MEALS')
+        self.assertEqual(second.content, first.content)
+
+    def test_gzip_variant_is_served_when_accepted(self):
+        plain = self.client.get('/v1/api/menu_items/all')
+        compressed = self.client.get('/v1/api/menu_items/all', HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertEqual(compressed['ETag'], plain['ETag'])
+        self.assertEqual(json.loads(gzip.decompress(compressed.content)), plain.json())
+        self.assertTrue(plain['ETag'].startswith('W/"menu-'))
+
+        for accept_encoding in ('gzip;q=0', 'gzip;q=0, identity', '*;q=0', 'br'):
+            response = self.client.get('/v1/api/menu_items/all', HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertNotIn('Content-Encoding', response, accept_encoding)
+        for accept_encoding in ('GZIP;q=0.5', '*', 'br, *;q=0.1'):
+            response = self.client.get('/v1/api/menu_items/all', HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertEqual(response['Content-Encoding'], 'gzip', accept_encoding)
+
+    def test_empty_category_is_not_found(self):
+        response = self.client.get('/v1/api/menu_items/category?category=DRINKS')
+        self.assertEqual(response.status_code, 404)
+
+    def test_search_requires_a_term(self):
+        self.assertEqual(self.client.get('/v1/api/menu_items/search?q=').status_code, 400)
+
+        response = self.client.get('/v1/api/menu_items/search?q=tac')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['name'] for item in response.data['message']], ["Tacos"])
+
+    def test_bulk_upsert_moves_the_version_once(self):
+        etag = self.client.get('/v1/api/menu_items/all')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/v1/api/menu_items/bulk', {'items': [
+                {'name': "Tacos", 'price': "85.00", 'category': "MEALS", 'description': "Three tacos"},
+                {'name': "Agua de jamaica", 'price': "30.00", 'category': "DRINKS"},
+            ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['message']['created']), 1)
+        self.assertEqual(response.data['message']['updated'][0]['price'], "85.00")
+
+        listing = self.client.get('/v1/api/menu_items/all')
+        self.assertNotEqual(listing['ETag'], etag)
+        self.assertEqual(len(listing.json()['message']), 3)
+
+    def test_extras_are_listed_per_item(self):
+        tacos_id = MenuItemModel.objects.get(name="Tacos").id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/v1/api/menu_extras', {'name': "Cheese", 'price': "15.00", 'menu_item_ids': [tacos_id]}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(f'/v1/api/menu_items/{tacos_id}/extras')
+        self.assertEqual([(extra['name'], extra['price']) for extra in response.data['data']], [("Cheese", "15.00")])
+
+        response = self.client.post('/v1/api/menu_extras', {'name': "Salsa", 'price': "5.00", 'menu_item_ids': [999]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class StockViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_invalid_as_of_date_is_a_bad_request(self):
+        for ts in ('yesterday', '2024-02-30T10:00'):
+            response = self.client.get('/v1/api/stocks/as-of', {'ts': ts})
+            self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.client.get('/v1/api/stocks/as-of', {'ts': '2024-02-28T10:00'}).status_code, 200)
@@ -0,0 +1,54 @@
+import hashlib
+import time
+from typing import Iterable, List
+from django.core.cache import cache
+
+
+class CacheGenerations:
+    """
+    Tag-based invalidation on top of the shared cache. Every cache key embeds
+    the current generation of the tags it depends on, so bumping a tag makes
+    all of its keys unreachable (they expire on their own) while keys built on
+    other tags stay warm.
+
+    Generations start from time.time_ns(), so a counter that was evicted and
+    recreated never repeats a value an old key was built with.
+    """
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+
+    def key(self, name: str, *parts, tags: Iterable[str] = ()) -> str:
+        """Memcached-safe key for name/parts, bound to the current generation of every tag."""
+        generations = self.current(*tags)
+        digest = hashlib.sha1(repr((parts, generations)).encode()).hexdigest()
+        return f'{self.namespace}_{name}_{digest}'
+
+
+    def current(self, *tags: str) -> List[int]:
+        if not tags:
+            return []
+
+        counter_keys = [self._counter_key(tag) for tag in tags]
+        found = cache.get_many(counter_keys)
+
+        for counter_key in counter_keys:
+            if counter_key not in found:
+                cache.add(counter_key, time.time_ns(), timeout=None)
+                found[counter_key] = cache.get(counter_key)
+
+        return [found[counter_key] for counter_key in counter_keys]
+
+
+    def bump(self, *tags: str):
+        for tag in set(tags):
+            counter_key = self._counter_key(tag)
+            try:
+                cache.incr(counter_key)
+            except ValueError:
+                cache.set(counter_key, time.time_ns(), timeout=None)
+
+
+    def _counter_key(self, tag: str) -> str:
+        digest = hashlib.sha1(tag.encode()).hexdigest()
+        return f'{self.namespace}_generation_{digest}'
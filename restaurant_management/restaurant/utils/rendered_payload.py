@@ -0,0 +1,20 @@
+import gzip
+from rest_framework.renderers import JSONRenderer
+
+
+class RenderedPayload:
+    """
+    A response body rendered to JSON once, with its gzip variant, so it can be
+    cached and sent as-is without running serializers or the renderer again.
+    """
+    CONTENT_TYPE = 'application/json'
+
+    def __init__(self, body: bytes):
+        self.body = body
+        # mtime=0 keeps the compressed bytes identical for the same body
+        self.gzipped = gzip.compress(body, mtime=0)
+
+
+    @classmethod
+    def render(cls, data) -> "RenderedPayload":
+        return cls(JSONRenderer().render(data))
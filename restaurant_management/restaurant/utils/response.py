@@ -4,6 +4,29 @@ from django.shortcuts import render
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from restaurant.utils.rendered_payload import RenderedPayload
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether gzip has a non-zero q-value in Accept-Encoding, named or through '*'."""
+    qualities = {}
+    for coding in accept_encoding.split(','):
+        name, *params = [part.strip() for part in coding.split(';')]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.lower()] = quality
+
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
 
 class ApiResponse:
 
@@ -41,6 +64,24 @@ class ApiResponse:
         }, status=status.HTTP_409_CONFLICT)
 
 
+    @staticmethod
+    def not_modified(etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+
+
+    @staticmethod
+    def prerendered(request, payload: RenderedPayload):
+        use_gzip = accepts_gzip(request.headers.get('Accept-Encoding', ''))
+
+        response = HttpResponse(payload.gzipped if use_gzip else payload.body, content_type=RenderedPayload.CONTENT_TYPE)
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+
     @staticmethod
     def ok(message, data=None):
         return Response({
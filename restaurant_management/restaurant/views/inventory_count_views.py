@@ -0,0 +1,77 @@
+from rest_framework.viewsets import ViewSet
+from restaurant.services.inventory_count_service import InventoryCountService
+from restaurant.utils.response import ApiResponse
+from restaurant.serializers import InventoryCountInsertSerializer, InventoryCountLinesInsertSerializer, InventoryCountSerializer
+from restaurant.injector.app_module import AppModule
+from injector import Injector
+
+container = Injector([AppModule()])
+
+class InventoryCountViews(ViewSet):
+    def get_count_service(self):
+        return container.get(InventoryCountService)
+
+
+    def get_all_counts(self, request):
+        count_service = self.get_count_service()
+
+        counts = count_service.get_all_counts()
+        counts_serialized = InventoryCountSerializer(counts, many=True).data
+        return ApiResponse.ok(counts_serialized, 'Inventory Counts Successfully Fetched')
+
+
+    def get_count_by_id(self, request, count_id):
+        count_service = self.get_count_service()
+
+        count = count_service.get_count_by_id(count_id)
+        if count is None:
+            return ApiResponse.not_found('Inventory Count', 'ID', count_id)
+
+        count_serialized = InventoryCountSerializer(count).data
+        return ApiResponse.found(count_serialized, 'Inventory Count', 'ID', count_id)
+
+
+    def open_count(self, request):
+        count_service = self.get_count_service()
+
+        serializer = InventoryCountInsertSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        count = count_service.open_count(serializer.validated_data.get('employee_name'))
+        count_serialized = InventoryCountSerializer(count).data
+
+        return ApiResponse.created(count_serialized, 'Inventory Count successfully opened')
+
+
+    def submit_count_lines(self, request, count_id):
+        count_service = self.get_count_service()
+
+        serializer = InventoryCountLinesInsertSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        count = count_service.get_count_by_id(count_id)
+        if count is None:
+            return ApiResponse.not_found('Inventory Count', 'ID', count_id)
+
+        lines_data = serializer.validated_data.get('lines')
+        validation_result = count_service.validate_lines(lines_data)
+        if validation_result.is_failure():
+            return ApiResponse.bad_request(validation_result.get_error_msg())
+
+        count = count_service.submit_lines(count, lines_data)
+        count_serialized = InventoryCountSerializer(count).data
+
+        return ApiResponse.ok(count_serialized, 'Counted stocks successfully submitted')
+
+
+    def post_count(self, request, count_id):
+        count_service = self.get_count_service()
+
+        count = count_service.post_count(count_id)
+        if count is None:
+            return ApiResponse.not_found('Inventory Count', 'ID', count_id)
+
+        count_serialized = InventoryCountSerializer(count).data
+        return ApiResponse.ok(count_serialized, 'Inventory Count successfully posted')
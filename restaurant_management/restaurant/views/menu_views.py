@@ -1,7 +1,10 @@
 from rest_framework.viewsets import ViewSet
 from restaurant.services.menu_service import MenuItemService
-from restaurant.serializers import MenuItemSerializer, MenuInsertItemSerializer
+from restaurant.serializers import MenuItemSerializer, MenuInsertItemSerializer, MenuBulkUpsertSerializer, MenuChangeSetSerializer, MenuExtraSerializer, MenuExtraInsertSerializer, MenuItemPriceSerializer
+from restaurant.mappers.menu_extra_mappers import MenuExtraMapper
+from restaurant.mappers.menu_item_mappers import MenuItemMapper
 from restaurant.utils.response import ApiResponse
+from restaurant.services.domain.menu_item import CategoryEnum
 from restaurant.injector.app_module import AppModule
 from injector import Injector
 
@@ -23,23 +26,70 @@ class MenuViews(ViewSet):
         return ApiResponse.found(menu_data, 'Menu', 'ID', menu_id)
 
 
-    def get_menus_items_by_category(self, request, category=None):
+    def get_menu_item_prices(self, request, menu_id=None):
         menu_service = self.get_menu_service()
 
-        menus = menu_service.get_menus_by_category(category)
-        if not menus:
+        if not menu_service.get_menu_by_id(menu_id):
+            return ApiResponse.not_found('Menu', 'ID', menu_id)
+
+        prices = menu_service.get_price_history(menu_id)
+        prices_data = MenuItemPriceSerializer(prices, many=True).data
+
+        return ApiResponse.found(prices_data, 'Menu Item Prices', 'menu item ID', menu_id)
+
+
+    def get_menus_items_by_category(self, request):
+        menu_service = self.get_menu_service()
+
+        category = request.GET.get('category', '').upper()
+        if category not in CategoryEnum.__members__:
+            return ApiResponse.bad_request(f"category must be one of: {', '.join(CategoryEnum.__members__)}")
+
+        version = menu_service.get_catalog_version()
+        etag = self._catalog_etag(version, category)
+        if self._is_not_modified(request, etag):
+            return ApiResponse.not_modified(etag)
+
+        if category not in menu_service.get_snapshot(version).items_by_category:
             return ApiResponse.not_found('Category', 'name', category)
 
+        payload = menu_service.get_rendered_payload(
+            f'category_{category}', version,
+            lambda snapshot: ApiResponse.found(snapshot.serialized_by_category[category], 'Menu Items', 'category', category).data
+        )
+        response = ApiResponse.prerendered(request, payload)
+        response['ETag'] = etag
+        return response
+
+
+    def search_menu_items(self, request):
+        menu_service = self.get_menu_service()
+
+        term = request.GET.get('q', '').strip()
+        if not term:
+            return ApiResponse.bad_request("q is required")
+
+        menus = menu_service.search_menu(term)
         menu_data = MenuItemSerializer(menus, many=True).data
-        return ApiResponse.found(menu_data, 'Menu Items', 'category', category)
+
+        return ApiResponse.ok(menu_data, f"Menu Items matching '{term}' successfully fetched")
 
 
     def get_all_menu_items(self, request):
         menu_service = self.get_menu_service()
 
-        menus = menu_service.get_all_menus()
-        menu_data = MenuItemSerializer(menus, many=True).data
-        return ApiResponse.ok(menu_data, 'Menus successfully fetched')
+        version = menu_service.get_catalog_version()
+        etag = self._catalog_etag(version)
+        if self._is_not_modified(request, etag):
+            return ApiResponse.not_modified(etag)
+
+        payload = menu_service.get_rendered_payload(
+            'all', version,
+            lambda snapshot: ApiResponse.ok(snapshot.serialized_items, 'Menus successfully fetched').data
+        )
+        response = ApiResponse.prerendered(request, payload)
+        response['ETag'] = etag
+        return response
 
 
     def create_menu_item(self, request):
@@ -55,6 +105,22 @@ class MenuViews(ViewSet):
         return ApiResponse.created(menu_item_data, 'Menu Item successfully created')
 
 
+    def upsert_menu_items(self, request):
+        menu_service = self.get_menu_service()
+
+        serializer = MenuBulkUpsertSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        menu_items = [MenuItemMapper.map_serializer_to_domain(item_data) for item_data in serializer.validated_data['items']]
+        upsert_result = menu_service.upsert_menus(menu_items)
+        if upsert_result.is_failure():
+            return ApiResponse.bad_request(upsert_result.get_error_msg())
+
+        changes_data = MenuChangeSetSerializer(upsert_result.get_data()).data
+        return ApiResponse.ok(changes_data, 'Menu Items successfully upserted')
+
+
     def delete_menu_item_by_id(self, request, menu_id=None):
         menu_service = self.get_menu_service()
 
@@ -63,3 +129,69 @@ class MenuViews(ViewSet):
             return ApiResponse.not_found('Menu', 'ID', menu_id)
 
         return ApiResponse.deleted('Menu Item')
+
+
+    def _catalog_etag(self, version, *parts) -> str:
+        # Weak: the gzip and identity bodies are different representations of the same listing
+        return 'W/"' + '-'.join(['menu', str(version), *parts]) + '"'
+
+
+    def _is_not_modified(self, request, etag) -> bool:
+        """If-None-Match uses the weak comparison, so W/ prefixes are ignored on both sides."""
+        if_none_match = request.headers.get('If-None-Match', '')
+        candidates = [candidate.strip().removeprefix('W/') for candidate in if_none_match.split(',')]
+        return etag.removeprefix('W/') in candidates or '*' in candidates
+
+
+class MenuExtraViews(ViewSet):
+    def get_menu_service(self):
+        return container.get(MenuItemService)
+
+
+    def get_all_extras(self, request):
+        menu_service = self.get_menu_service()
+
+        extras = menu_service.get_all_extras()
+        extras_data = MenuExtraSerializer(extras, many=True).data
+
+        return ApiResponse.ok(extras_data, 'Menu Extras successfully fetched')
+
+
+    def get_extras_by_menu_item(self, request, menu_id=None):
+        menu_service = self.get_menu_service()
+
+        if not menu_service.get_menu_by_id(menu_id):
+            return ApiResponse.not_found('Menu', 'ID', menu_id)
+
+        extras = menu_service.get_extras_for_item(menu_id)
+        extras_data = MenuExtraSerializer(extras, many=True).data
+
+        return ApiResponse.found(extras_data, 'Menu Extras', 'menu item ID', menu_id)
+
+
+    def create_extra(self, request):
+        menu_service = self.get_menu_service()
+
+        serializer = MenuExtraInsertSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        menu_extra = MenuExtraMapper.map_serializer_to_domain(serializer.validated_data)
+        validation_result = menu_service.validate_extra(menu_extra)
+        if validation_result.is_failure():
+            return ApiResponse.bad_request(validation_result.get_error_msg())
+
+        created_extra = menu_service.create_extra(menu_extra)
+        extra_data = MenuExtraSerializer(created_extra).data
+
+        return ApiResponse.created(extra_data, 'Menu Extra successfully created')
+
+
+    def delete_extra_by_id(self, request, extra_id=None):
+        menu_service = self.get_menu_service()
+
+        is_deleted = menu_service.delete_extra_by_id(extra_id)
+        if not is_deleted:
+            return ApiResponse.not_found('Menu Extra', 'ID', extra_id)
+
+        return ApiResponse.deleted('Menu Extra')
@@ -101,7 +101,7 @@ class OrderViews(ViewSet):
     
     def end_order(self, request, id):
         order_service = self.get_order_service()
-        payment_service = self.get_pa()
+        payment_service = self.get_payment_service()
 
         order = order_service.get_order_by_id(id)
         if order is None:
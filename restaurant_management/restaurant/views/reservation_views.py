@@ -1,8 +1,10 @@
-from restaurant.serializers import ReservationInsertSerializer, ReservationSerializer
+from restaurant.serializers import ReservationInsertSerializer, ReservationSerializer, AvailabilitySlotSerializer, ReservationImportSerializer, ReservationImportRowSerializer
+from restaurant.services.domain.reservation_import import ReservationImportRow
 from restaurant.services.reservation_service import ReservationService
 from restaurant.utils.response import ApiResponse
 from rest_framework.viewsets import ViewSet
 from datetime import datetime
+from django.utils import timezone
 from restaurant.mappers.reservation_mappers import ReservationMapper
 from restaurant.injector.app_module import AppModule
 from injector import Injector
@@ -46,14 +48,42 @@ class ReservationViews(ViewSet):
     def get_today_reservation(self, request):
         reservation_service = self.get_reservation_service()
 
-        today = datetime.now()
-        start = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        end = today.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-        reservations = reservation_service.get_by_time_range(start,end)
+        reservations = reservation_service.get_today()
         reservations_serialized = ReservationSerializer(reservations, many=True).data
 
-        return ApiResponse.ok(reservations_serialized, f"Today's reservation successfully fetched. Today Date: {today.date()}")
+        return ApiResponse.ok(reservations_serialized, f"Today's reservation successfully fetched. Today Date: {timezone.localdate()}")
+
+
+    def search_guests(self, request):
+        reservation_service = self.get_reservation_service()
+
+        term = request.GET.get('q', '').strip()
+        if len(term) < 2:
+            return ApiResponse.bad_request("q must have at least 2 characters")
+
+        reservations = reservation_service.search_guests(term)
+        reservations_data = ReservationSerializer(reservations, many=True).data
+
+        return ApiResponse.ok(reservations_data, f"Guests matching '{term}' successfully fetched")
+
+
+    def get_availability(self, request):
+        reservation_service = self.get_reservation_service()
+
+        try:
+            day = datetime.strptime(request.GET.get('date', ''), "%Y-%m-%d").date()
+            party_size = int(request.GET.get('party', ''))
+        except ValueError:
+            return ApiResponse.bad_request("date (YYYY-MM-DD) and party are required")
+
+        validation_result = reservation_service.validate_availability_query(day, party_size)
+        if validation_result.is_failure():
+            return ApiResponse.bad_request(validation_result.get_error_msg())
+
+        slots = reservation_service.get_availability(day, party_size)
+        slots_serialized = AvailabilitySlotSerializer(slots, many=True).data
+
+        return ApiResponse.ok(slots_serialized, f"Availability for {party_size} customers on {day} successfully fetched")
 
 
     def get_reservation_by_date_range(self, request):
@@ -99,6 +129,35 @@ class ReservationViews(ViewSet):
         return ApiResponse.created(reservation_serialized, 'Reservation succesfully created')
 
 
+    def import_reservations(self, request):
+        reservation_service = self.get_reservation_service()
+
+        serializer = ReservationImportSerializer(data=request.data)
+        if serializer.is_valid() is False:
+            return ApiResponse.bad_request(f'Validation failed:{serializer.errors}')
+
+        rows = []
+        for index, row_data in enumerate(serializer.validated_data['reservations']):
+            row_serializer = ReservationInsertSerializer(data=row_data)
+            if row_serializer.is_valid() is False:
+                rows.append(ReservationImportRow.rejected(index, f'Validation failed:{row_serializer.errors}'))
+                continue
+
+            try:
+                reservation = ReservationMapper.serializer_to_domain(row_serializer.data)
+            except ValueError as e:
+                rows.append(ReservationImportRow.rejected(index, str(e)))
+                continue
+
+            rows.append(ReservationImportRow(row=index, reservation=reservation))
+
+        rows = reservation_service.import_reservations(rows)
+        rows_serialized = ReservationImportRowSerializer(rows, many=True).data
+
+        created = sum(1 for row in rows if row.status == ReservationImportRow.Status.CREATED)
+        return ApiResponse.ok(rows_serialized, f'{created} of {len(rows)} reservations imported')
+
+
     def delete_reservation_by_id(self, request, reservation_id):
         reservation_service = self.get_reservation_service()
 
@@ -1,10 +1,13 @@
 from rest_framework.viewsets import ViewSet
 from restaurant.services.stock_service import StockService
 from restaurant.services.ingredient_service import IngredientService
+from restaurant.services.forecast_service import ForecastService
 from restaurant.utils.response import ApiResponse
 from restaurant.mappers.stock_mappers import StockTransactionMappers
-from restaurant.serializers import StockInsertSerializer, StockSerializer, StockTransactionInsertSerializer
+from restaurant.serializers import StockInsertSerializer, StockSerializer, StockTransactionInsertSerializer, StockLotSerializer, LowStockAlertSerializer, StockForecastSerializer, StockSnapshotSerializer
 from restaurant.injector.app_module import AppModule
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from injector import Injector
 
 container = Injector([AppModule()])
@@ -16,6 +19,9 @@ class StockViews(ViewSet):
     def get_stock_service(self):
         return container.get(StockService)
 
+    def get_forecast_service(self):
+        return container.get(ForecastService)
+
     def get_all_stocks_sort_by_last_transaction(self, request):
         stock_service = self.get_stock_service()
 
@@ -24,6 +30,51 @@ class StockViews(ViewSet):
         return ApiResponse.ok(stock_list_serialized, 'Stock List Successfully Fetched')
 
 
+    def get_stocks_as_of(self, request):
+        stock_service = self.get_stock_service()
+
+        try:
+            as_of = parse_datetime(request.GET.get('ts', ''))
+        except ValueError:
+            as_of = None
+        if as_of is None:
+            return ApiResponse.bad_request('ts must be an ISO 8601 datetime')
+        if timezone.is_naive(as_of):
+            as_of = timezone.make_aware(as_of)
+
+        snapshots = stock_service.get_stocks_as_of(as_of)
+        snapshots_serialized = StockSnapshotSerializer(snapshots, many=True).data
+        return ApiResponse.ok(snapshots_serialized, f'Stocks as of {as_of} successfully fetched')
+
+
+    def get_stock_forecasts(self, request):
+        forecast_service = self.get_forecast_service()
+
+        forecasts = forecast_service.get_stock_forecasts()
+        forecasts_serialized = StockForecastSerializer(forecasts, many=True).data
+        return ApiResponse.ok(forecasts_serialized, 'Stock Forecasts Successfully Fetched')
+
+
+    def get_low_stocks(self, request):
+        stock_service = self.get_stock_service()
+
+        alerts = stock_service.get_low_stock_alerts()
+        alerts_serialized = LowStockAlertSerializer(alerts, many=True).data
+        return ApiResponse.ok(alerts_serialized, 'Low Stocks Successfully Fetched')
+
+
+    def get_expiring_lots(self, request):
+        stock_service = self.get_stock_service()
+
+        days = request.GET.get('days', '0')
+        if not days.isdigit():
+            return ApiResponse.bad_request('days must be a non-negative integer')
+
+        lots = stock_service.get_expiring_lots(int(days))
+        lots_serialized = StockLotSerializer(lots, many=True).data
+        return ApiResponse.ok(lots_serialized, f'Lots expiring within {days} days successfully fetched')
+
+
     def get_stock_by_id(self, request, stock_id):
         stock_service = self.get_stock_service()
 
@@ -1,7 +1,12 @@
 from restaurant.utils.response import ApiResponse
-from restaurant.serializers import TableSerializer, TableInsertSerializer
+from restaurant.serializers import (
+    TableSerializer, TableInsertSerializer, FloorStateSerializer, TableAnalyticsSerializer,
+    TableBatchSerializer, TableNumbersSerializer, TableGroupSerializer
+)
 from rest_framework.viewsets import ViewSet
 from restaurant.services.table_service import TableService
+from restaurant.services.table_analytics_service import TableAnalyticsService
+from datetime import datetime
 from restaurant.injector.app_module import AppModule
 from injector import Injector
 
@@ -11,6 +16,9 @@ class TableViews(ViewSet):
     def get_table_service(self):
         return container.get(TableService)
 
+    def get_table_analytics_service(self):
+        return container.get(TableAnalyticsService)
+
     def get_table_by_number(self, request, number):
         table_service = self.get_table_service()
 
@@ -31,6 +39,34 @@ class TableViews(ViewSet):
         return ApiResponse.ok(table_data, 'All tables succesfully fetched')
 
 
+    def get_floor_state(self, request):
+        table_service = self.get_table_service()
+
+        floor = table_service.get_floor_state()
+        floor_data = FloorStateSerializer(floor).data
+
+        return ApiResponse.ok(floor_data, 'Floor state succesfully fetched')
+
+
+    def get_table_analytics(self, request):
+        analytics_service = self.get_table_analytics_service()
+
+        try:
+            start_date = datetime.strptime(request.GET.get('start', ''), "%Y-%m-%d").date()
+            end_date = datetime.strptime(request.GET.get('end', ''), "%Y-%m-%d").date()
+        except ValueError:
+            return ApiResponse.bad_request("start and end (YYYY-MM-DD) are required")
+
+        range_result = analytics_service.validate_range(start_date, end_date)
+        if range_result.is_failure():
+            return ApiResponse.bad_request(range_result.get_error_msg())
+
+        analytics = analytics_service.get_table_analytics(start_date, end_date)
+        analytics_data = TableAnalyticsSerializer(analytics).data
+
+        return ApiResponse.ok(analytics_data, 'Table analytics succesfully fetched')
+
+
     def create_table(self, request):
         table_service = self.get_table_service()
 
@@ -57,3 +93,83 @@ class TableViews(ViewSet):
             return ApiResponse.not_found(f'table', 'number', number)
         
         return ApiResponse.deleted('Table')
+
+
+    def create_tables(self, request):
+        table_service = self.get_table_service()
+
+        serializer = TableBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        tables_data = serializer.validated_data['tables']
+        batch_result = table_service.validate_batch_create(tables_data)
+        if batch_result.is_failure():
+            return ApiResponse.bad_request(batch_result.get_error_msg())
+
+        tables = table_service.create_tables(tables_data)
+        table_data = TableSerializer(tables, many=True).data
+
+        return ApiResponse.created(table_data, f"{len(tables)} tables successfully created")
+
+
+    def update_tables(self, request):
+        table_service = self.get_table_service()
+
+        serializer = TableBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        tables_data = serializer.validated_data['tables']
+        batch_result = table_service.validate_batch_update(tables_data)
+        if batch_result.is_failure():
+            return ApiResponse.bad_request(batch_result.get_error_msg())
+
+        update_result = table_service.update_capacities(tables_data)
+        if update_result.is_failure():
+            return ApiResponse.bad_request(update_result.get_error_msg())
+
+        updated = update_result.get_data()
+        return ApiResponse.ok({'updated': updated}, f"{updated} tables successfully updated")
+
+
+    def delete_tables(self, request):
+        table_service = self.get_table_service()
+
+        serializer = TableNumbersSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        delete_result = table_service.delete_tables(serializer.validated_data['numbers'])
+        if delete_result.is_failure():
+            return ApiResponse.bad_request(delete_result.get_error_msg())
+
+        return ApiResponse.deleted('Tables')
+
+
+    def merge_tables(self, request):
+        table_service = self.get_table_service()
+
+        serializer = TableNumbersSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        merge_result = table_service.merge_tables(serializer.validated_data['numbers'])
+        if merge_result.is_failure():
+            return ApiResponse.bad_request(merge_result.get_error_msg())
+
+        group_data = TableGroupSerializer(merge_result.get_data()).data
+
+        return ApiResponse.created(group_data, "Tables successfully merged")
+
+
+    def split_table_group(self, request, group_id):
+        table_service = self.get_table_service()
+
+        split_result = table_service.split_group(group_id)
+        if split_result.is_failure():
+            return ApiResponse.bad_request(split_result.get_error_msg())
+
+        group_data = TableGroupSerializer(split_result.get_data()).data
+
+        return ApiResponse.ok(group_data, "Table group successfully split")
@@ -0,0 +1,90 @@
+from rest_framework.viewsets import ViewSet
+from restaurant.services.waitlist_service import WaitlistService
+from restaurant.services.table_service import TableService
+from restaurant.utils.response import ApiResponse
+from restaurant.serializers import WaitlistInsertSerializer, WaitlistSeatSerializer, WaitlistEntrySerializer
+from restaurant.injector.app_module import AppModule
+from injector import Injector
+
+container = Injector([AppModule()])
+
+class WaitlistViews(ViewSet):
+    def get_waitlist_service(self):
+        return container.get(WaitlistService)
+
+    def get_table_service(self):
+        return container.get(TableService)
+
+
+    def get_waitlist(self, request):
+        waitlist_service = self.get_waitlist_service()
+
+        entries = waitlist_service.get_waiting()
+        entries_serialized = WaitlistEntrySerializer(entries, many=True).data
+        return ApiResponse.ok(entries_serialized, 'Waitlist Successfully Fetched')
+
+
+    def add_party(self, request):
+        waitlist_service = self.get_waitlist_service()
+
+        serializer = WaitlistInsertSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        entry = waitlist_service.add_party(serializer.validated_data)
+        entry_serialized = WaitlistEntrySerializer(entry).data
+        return ApiResponse.created(entry_serialized, 'Party Successfully Added To The Waitlist')
+
+
+    def get_suggestion(self, request, table_number):
+        waitlist_service = self.get_waitlist_service()
+        table_service = self.get_table_service()
+
+        table = table_service.get_table_by_number(table_number)
+        if table is None:
+            return ApiResponse.not_found('Table', 'number', table_number)
+
+        entry = waitlist_service.suggest_for_table(table)
+        if entry is None:
+            return ApiResponse.not_found('Waiting party', 'table', table_number)
+
+        entry_serialized = WaitlistEntrySerializer(entry).data
+        return ApiResponse.ok(entry_serialized, f'Suggested party for table {table_number}')
+
+
+    def seat_party(self, request, entry_id):
+        waitlist_service = self.get_waitlist_service()
+        table_service = self.get_table_service()
+
+        serializer = WaitlistSeatSerializer(data=request.data)
+        if not serializer.is_valid():
+            return ApiResponse.bad_request(serializer.errors)
+
+        entry = waitlist_service.get_entry_by_id(entry_id)
+        if entry is None:
+            return ApiResponse.not_found('Waitlist entry', 'ID', entry_id)
+
+        table_number = serializer.validated_data['table_number']
+        table = table_service.get_table_by_number(table_number)
+        if table is None:
+            return ApiResponse.not_found('Table', 'number', table_number)
+
+        seating_result = waitlist_service.validate_seating(entry, table)
+        if seating_result.is_failure():
+            return ApiResponse.conflict(seating_result.get_error_msg())
+
+        entry = waitlist_service.seat(entry, table)
+        entry_serialized = WaitlistEntrySerializer(entry).data
+        return ApiResponse.ok(entry_serialized, 'Party Successfully Seated')
+
+
+    def cancel_party(self, request, entry_id):
+        waitlist_service = self.get_waitlist_service()
+
+        entry = waitlist_service.get_entry_by_id(entry_id)
+        if entry is None:
+            return ApiResponse.not_found('Waitlist entry', 'ID', entry_id)
+
+        entry = waitlist_service.cancel(entry)
+        entry_serialized = WaitlistEntrySerializer(entry).data
+        return ApiResponse.ok(entry_serialized, 'Party Successfully Removed From The Waitlist')
@@ -1,16 +1,23 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from restaurant.views.table_views import TableViews
-from restaurant.views.menu_views import MenuViews
+from restaurant.views.menu_views import MenuViews, MenuExtraViews
 from restaurant.views.reservation_views import ReservationViews
 from restaurant.views.order_views import OrderViews
 from restaurant.views.stock_views import StockViews
 from restaurant.views.payment_views import PaymentViews
 from restaurant.views.ingredient_views import IngredientViews
+from restaurant.views.inventory_count_views import InventoryCountViews
+from restaurant.views.waitlist_views import WaitlistViews
 
 urlpatterns = [
     # Tables
     path('v1/api/tables/<int:number>', TableViews.as_view({'get': 'get_table_by_number', 'delete': 'delete_table_by_number'}), name='table-detail'),
+    path('v1/api/tables/batch', TableViews.as_view({'post': 'create_tables', 'put': 'update_tables', 'delete': 'delete_tables'}), name='tables-batch'),
+    path('v1/api/tables/groups/<int:group_id>', TableViews.as_view({'delete': 'split_table_group'}), name='table-group-detail'),
+    path('v1/api/tables/groups', TableViews.as_view({'post': 'merge_tables'}), name='table-groups'),
+    path('v1/api/tables/analytics', TableViews.as_view({'get': 'get_table_analytics'}), name='get_table_analytics'),
+    path('v1/api/tables/floor', TableViews.as_view({'get': 'get_floor_state'}), name='get_floor_state'),
     path('v1/api/tables/all', TableViews.as_view({'get': 'get_all_tables'}), name='get_all_tables'),
     path('v1/api/tables', TableViews.as_view({'post': 'create_table'}), name='get_all_tables'),
 
@@ -23,12 +30,29 @@ urlpatterns = [
     path('v1/api/stocks/<int:stock_id>', StockViews.as_view({'get': 'get_stock_by_id', 'delete': 'delete_stock_by_id'}), name='stock-detail'),
     path('v1/api/stocks/ingredient/<int:ingredient_id>', StockViews.as_view({'get': 'get_stock_by_ingredient_id'}), name='get_stock_by_ingredient_id'),
     path('v1/api/stocks/all', StockViews.as_view({'get': 'get_all_stocks_sort_by_last_transaction'}), name='stock-detail'),
+    path('v1/api/stocks/as-of', StockViews.as_view({'get': 'get_stocks_as_of'}), name='get_stocks_as_of'),
+    path('v1/api/stocks/forecast', StockViews.as_view({'get': 'get_stock_forecasts'}), name='get_stock_forecasts'),
+    path('v1/api/stocks/low', StockViews.as_view({'get': 'get_low_stocks'}), name='get_low_stocks'),
+    path('v1/api/stocks/expiring', StockViews.as_view({'get': 'get_expiring_lots'}), name='get_expiring_lots'),
     path('v1/api/stocks', StockViews.as_view({'post': 'init_stock'}), name='init_stock'),
     path('v1/api/stocks/transaction', StockViews.as_view({'put': 'add_transaction'}), name='stock-by-ingredient'),
 
+    # Inventory Counts
+    path('v1/api/stocks/counts/<int:count_id>', InventoryCountViews.as_view({'get': 'get_count_by_id'}), name='count-detail'),
+    path('v1/api/stocks/counts/<int:count_id>/lines', InventoryCountViews.as_view({'put': 'submit_count_lines'}), name='submit_count_lines'),
+    path('v1/api/stocks/counts/<int:count_id>/post', InventoryCountViews.as_view({'put': 'post_count'}), name='post_count'),
+    path('v1/api/stocks/counts/all', InventoryCountViews.as_view({'get': 'get_all_counts'}), name='get_all_counts'),
+    path('v1/api/stocks/counts', InventoryCountViews.as_view({'post': 'open_count'}), name='open_count'),
+
     # Menu view
     path('v1/api/menu_items/<int:menu_id>', MenuViews.as_view({'get': 'get_menu_item_by_id', 'delete': 'delete_menu_item_by_id'}), name='menu_item-detail'),
     path('v1/api/menu_items/all', MenuViews.as_view({'get': 'get_all_menu_items'}), name='get_all_menu_items'),
+    path('v1/api/menu_items/<int:menu_id>/prices', MenuViews.as_view({'get': 'get_menu_item_prices'}), name='get_menu_item_prices'),
+    path('v1/api/menu_items/<int:menu_id>/extras', MenuExtraViews.as_view({'get': 'get_extras_by_menu_item'}), name='get_extras_by_menu_item'),
+    path('v1/api/menu_extras/<int:extra_id>', MenuExtraViews.as_view({'delete': 'delete_extra_by_id'}), name='menu_extra-detail'),
+    path('v1/api/menu_extras', MenuExtraViews.as_view({'get': 'get_all_extras', 'post': 'create_extra'}), name='menu_extras'),
+    path('v1/api/menu_items/bulk', MenuViews.as_view({'put': 'upsert_menu_items'}), name='upsert_menu_items'),
+    path('v1/api/menu_items/search', MenuViews.as_view({'get': 'search_menu_items'}), name='search_menu_items'),
     path('v1/api/menu_items/category', MenuViews.as_view({'get': 'get_menus_items_by_category'}), name='get_menus_items_by_category'),
     path('v1/api/menu_items', MenuViews.as_view({'post': 'create_menu_item'}), name='create_menu_item'),
 
@@ -36,10 +60,19 @@ urlpatterns = [
     path('v1/api/reservations/<int:reservation_id>', ReservationViews.as_view({'get': 'get_reservation_by_id', 'delete': 'delete_reservation_by_id'}), name='reservation-detail'),
     path('v1/api/reservations/today', ReservationViews.as_view({'get': 'get_today_reservation'}), name='today-reservations'),
     path('v1/api/reservations/date-range', ReservationViews.as_view({'get': 'get_reservation_by_date_range'}), name='reservations-dateRange'),
+    path('v1/api/reservations/import', ReservationViews.as_view({'post': 'import_reservations'}), name='reservations-import'),
+    path('v1/api/reservations/search', ReservationViews.as_view({'get': 'search_guests'}), name='reservations-search'),
+    path('v1/api/reservations/availability', ReservationViews.as_view({'get': 'get_availability'}), name='reservations-availability'),
     path('v1/api/reservations/by', ReservationViews.as_view({'get': 'get_reservations_by_filter'}), name='reservations-by-filter'),
 
     path('v1/api/reservations', ReservationViews.as_view({'post': 'create_reservation'}), name='create_reservation'),
 
+    # Waitlist
+    path('v1/api/waitlist/<int:entry_id>', WaitlistViews.as_view({'delete': 'cancel_party'}), name='waitlist-entry'),
+    path('v1/api/waitlist/<int:entry_id>/seat', WaitlistViews.as_view({'put': 'seat_party'}), name='seat-party'),
+    path('v1/api/waitlist/suggestion/<int:table_number>', WaitlistViews.as_view({'get': 'get_suggestion'}), name='waitlist-suggestion'),
+    path('v1/api/waitlist', WaitlistViews.as_view({'get': 'get_waitlist', 'post': 'add_party'}), name='waitlist'),
+
     # Orders
     path('v1/api/orders/<int:id>', OrderViews.as_view({'get': 'get_order_by_id', 'delete': 'delete_order'}), name='order-by-id'),
     path('v1/api/orders/by-status/<str:status>', OrderViews.as_view({'get': 'get_orders_by_status'}), name='orders-by-status'),